@@ -0,0 +1,217 @@
+"""
+Headless benchmark for DungeonMap generation and rendering.
+
+Sweeps map size, room chance and extra connection chance, and for every
+phase (__init__, generate, buildRooms, regenerate, printMap) records wall
+time, peak traced memory and the number of memory blocks the phase
+allocated that are still alive when it returns (its result included).
+Results are written as JSON so runs from different commits can be
+compared:
+
+    python code/benchmark.py --sizes 101 301 1001 --out before.json
+    python code/benchmark.py --sizes 101 301 1001 --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+from mapClass import DungeonMap
+from gridClass import TileGrid
+from mazeAlgorithms import ALGORITHMS
+from playerClass import PlayerClass
+from roomClass import HOME
+
+# Phases measured for every parameter combination, in order
+PHASES = ("init", "generate", "buildRooms", "regenerate", "printMap", "printMap_cached")
+
+
+def _phaseRunners(size: int, room_chance: float, extra_chance: float,
+                  algorithm: str, seed: int) -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    Build a (setup, run) pair of zero-argument callables per phase. Setup
+    prepares fresh state outside the measured time, so every phase can be
+    measured on its own.
+    """
+    state = {}
+
+    def setUp():
+        # A full map (and player) to run the later phases against
+        state["map"] = DungeonMap(size, room_chance, extra_chance, seed=seed, algorithm=algorithm)
+        PlayerClass(state["map"])
+
+    def resetGrid():
+        # Same starting state regenerate() builds before generate()
+        dungeon_map = state["map"]
+        dungeon_map.grid = TileGrid(dungeon_map.size)
+        dungeon_map.grid.setCode(dungeon_map.home[1], dungeon_map.home[0], HOME)
+        dungeon_map.rng = random.Random(seed)
+
+    # Every runner returns what it built, so measure() can count it while alive
+    def runInit():
+        return DungeonMap(size, room_chance, extra_chance, seed=seed, algorithm=algorithm)
+
+    def runGenerate():
+        state["map"].generate()
+        return state["map"]
+
+    def runBuildRooms():
+        return state["map"].buildRooms()
+
+    def runRegenerate():
+        state["map"].regenerate(seed=seed)
+        return state["map"]
+
+    def runPrintMap():
+        return state["map"].printMap()
+
+    return {
+        "init": (None, runInit),
+        "generate": (lambda: (setUp(), resetGrid()), runGenerate),
+        "buildRooms": (lambda: (setUp(), resetGrid(), state["map"].generate()), runBuildRooms),
+        "regenerate": (setUp, runRegenerate),
+        # Cold render: fresh map, no cached rows yet
+        "printMap": (setUp, runPrintMap),
+        # Warm render: cache already built, one row invalidated like a hard-mode step
+        "printMap_cached": (
+            lambda: (setUp(), runPrintMap(),
+                     state["map"].setTile(0, 0, state["map"].grid.code(0, 0))),
+            runPrintMap
+        ),
+    }
+
+
+def measure(setup: Callable[[], None], run: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """
+    Time `run` (best of `repeats`) and then measure it once more under
+    tracemalloc for peak memory and the blocks it allocated that are still
+    alive on return. The snapshot is taken while run()'s result is still
+    referenced, so a phase that builds a map is charged for that map.
+    Tracing slows Python down a lot, so it is never active while timing.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+        # Only allocations made since start() are traced: what run() kept
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del result
+
+    return {"seconds": best, "peak_bytes": peak, "blocks": blocks}
+
+
+def runBenchmark(sizes: List[int], room_chances: List[float], extra_chances: List[float],
+                 algorithm: str = "dfs", repeats: int = 3, seed: int = 1) -> Dict:
+    """
+    Run every phase for every parameter combination and return the results
+    in the JSON-ready form written by main().
+    """
+    results = []
+    for size in sizes:
+        for room_chance in room_chances:
+            for extra_chance in extra_chances:
+                runners = _phaseRunners(size, room_chance, extra_chance, algorithm, seed)
+                for phase in PHASES:
+                    setup, run = runners[phase]
+                    row = {
+                        "size": size,
+                        "room_chance": room_chance,
+                        "extra_connection_chance": extra_chance,
+                        "algorithm": algorithm,
+                        "phase": phase,
+                    }
+                    row.update(measure(setup, run, repeats))
+                    results.append(row)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeats": repeats,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _key(row: Dict) -> tuple:
+    return (row["size"], row["room_chance"], row["extra_connection_chance"],
+            row.get("algorithm", "dfs"), row["phase"])
+
+
+def compare(old: Dict, new: Dict, threshold: float = 1.2) -> List[str]:
+    """
+    Compare two benchmark results and return a line per matching entry.
+    Entries whose time or peak memory grew by more than `threshold` times
+    are marked as regressions.
+    """
+    previous = {_key(row): row for row in old["results"]}
+    lines = []
+    for row in new["results"]:
+        before = previous.get(_key(row))
+        if before is None:
+            continue
+        time_ratio = row["seconds"] / before["seconds"] if before["seconds"] else 1.0
+        mem_ratio = row["peak_bytes"] / before["peak_bytes"] if before["peak_bytes"] else 1.0
+        flag = "REGRESSION" if max(time_ratio, mem_ratio) > threshold else ""
+        lines.append(
+            f"{row['size']:>6} {row['room_chance']:>5} {row['extra_connection_chance']:>5} "
+            f"{row['phase']:<16} time x{time_ratio:5.2f}  mem x{mem_ratio:5.2f}  {flag}"
+        )
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DungeonMap generation and rendering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[31, 101, 301])
+    parser.add_argument("--room-chances", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--extra-chances", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="dfs")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against an earlier JSON result file")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="slowdown factor reported as a regression (default 1.2)")
+    args = parser.parse_args(argv)
+
+    results = runBenchmark(args.sizes, args.room_chances, args.extra_chances,
+                           args.algorithm, args.repeats, args.seed)
+
+    for row in results["results"]:
+        print(f"{row['size']:>6} {row['room_chance']:>5} {row['extra_connection_chance']:>5} "
+              f"{row['phase']:<16} {row['seconds']:9.4f}s {row['peak_bytes'] / 1e6:9.2f} MB "
+              f"{row['blocks']:>9} blocks")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        lines = compare(old, results, args.threshold)
+        print("\n".join(lines))
+        if any(line.endswith("REGRESSION") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
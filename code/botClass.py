@@ -0,0 +1,161 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from distanceField import DistanceField
+
+# Directions in clockwise order with their (dx, dy); turning right is +1
+_CLOCKWISE = (("up", 0, -1), ("right", 1, 0), ("down", 0, 1), ("left", -1, 0))
+
+
+class Bot(ABC):
+    """
+    Base class for programmatic players. A bot drives a GameSession the same
+    way the keyboard does: play() asks nextMove() for a direction and passes
+    it to session.move(), so PlayerClass rules (walls, hard mode) and the
+    session's objective apply unchanged.
+
+    Subclasses override nextMove() and, if they keep per-run state, reset().
+    """
+
+    # Label used in harness reports
+    name = "bot"
+
+    def reset(self, session):
+        """Called once before a run starts on `session`."""
+
+    @abstractmethod
+    def nextMove(self, session) -> Optional[str]:
+        """
+        The direction to try next ('up', 'down', 'left' or 'right'), or None
+        to give up on the run.
+        """
+
+    def play(self, session, max_steps: int) -> int:
+        """
+        Play until the run completes (or hard mode makes it unwinnable), the
+        bot gives up or `max_steps` moves have been tried. Returns the number of moves tried (session.ticks).
+        """
+        self.reset(session)
+        while not (session.completed or session.stuck) and session.ticks < max_steps:
+            direction = self.nextMove(session)
+            if direction is None:
+                break
+            old_location = session.player.location
+            self.afterMove(session, old_location, session.move(direction))
+        return session.ticks
+
+    def afterMove(self, session, old_location, moved: bool):
+        """Called after every move with the tile the player tried to leave."""
+
+    @staticmethod
+    def openDirections(session):
+        """The (name, dx, dy) steps the player can take from its tile."""
+        x, y = session.player.location
+        can_move = session.map.canMove
+        return [step for step in _CLOCKWISE if can_move((x + step[1], y + step[2]))]
+
+
+class RandomWalkBot(Bot):
+    """
+    Steps to a uniformly random open neighbour every move. Seeded from the
+    map seed, so a run is reproducible for a given map.
+    """
+
+    name = "random"
+
+    def reset(self, session):
+        self.rng = random.Random(session.map.seed)
+
+    def nextMove(self, session) -> Optional[str]:
+        steps = self.openDirections(session)
+        if not steps:
+            return None
+        return self.rng.choice(steps)[0]
+
+
+class WallFollowerBot(Bot):
+    """
+    Keeps one hand on the wall: turn towards that hand if possible,
+    otherwise go straight, turn away, or finally turn back. Solves perfect
+    mazes without any map knowledge; extra connections can make it circle a
+    loop forever, which the harness reports as unsolved.
+    """
+
+    name = "wall"
+
+    def __init__(self, hand: str = "right"):
+        if hand not in ("left", "right"):
+            raise ValueError("Hand must be 'left' or 'right'.")
+        self.hand = hand
+        # Turn order relative to the heading, as offsets in _CLOCKWISE
+        self._turns = (1, 0, 3, 2) if hand == "right" else (3, 0, 1, 2)
+        self.heading = 0
+
+    def reset(self, session):
+        self.heading = 0
+
+    def nextMove(self, session) -> Optional[str]:
+        x, y = session.player.location
+        can_move = session.map.canMove
+        for turn in self._turns:
+            heading = (self.heading + turn) % 4
+            name, dx, dy = _CLOCKWISE[heading]
+            if can_move((x + dx, y + dy)):
+                self.heading = heading
+                return name
+        return None
+
+
+class FunctionBot(Bot):
+    """
+    Wraps a user-supplied function `choose(session) -> direction or None`
+    as a bot. For the process-pool harness the function must be picklable
+    (defined at module level).
+    """
+
+    def __init__(self, choose: Callable, name: str = None):
+        self.choose = choose
+        self.name = name or getattr(choose, "__name__", "function")
+
+    def nextMove(self, session) -> Optional[str]:
+        return self.choose(session)
+
+
+class BfsBot(Bot):
+    """
+    Follows shortest paths from a DistanceField. On "any" maps that is the
+    map's own field (optimal). On "ordered" maps the field leads to the next
+    checkpoint; on "all" maps it leads to every remaining room at once, so
+    each step heads for the room nearest by path length (a greedy tour).
+    Either field is rebuilt only when a room counts, so the bot never
+    switches targets half-way. In hard mode the field is repaired after
+    each move, since the tile left behind is gone.
+    """
+
+    name = "bfs"
+
+    def reset(self, session):
+        self.field: DistanceField = None
+        # Rooms reached when the field was built
+        self.reached = -1
+
+    def nextMove(self, session) -> Optional[str]:
+        dungeon_map = session.map
+        if dungeon_map.objective == "any":
+            # Kept up to date by DungeonMap.setTile in hard mode
+            field = dungeon_map.distanceField()
+        else:
+            if self.field is None or session.roomsReached() != self.reached:
+                self.reached = session.roomsReached()
+                if dungeon_map.objective == "ordered":
+                    targets = [session.nextRoom()]
+                else:
+                    targets = list(session.remaining)
+                self.field = DistanceField(dungeon_map, targets=targets)
+            field = self.field
+        return field.nextStep(*session.player.location)
+
+    def afterMove(self, session, old_location, moved: bool):
+        # The map's own field is repaired by setTile; ours must be too
+        if moved and self.field is not None and session.player.hardMode:
+            self.field.removeCell(*old_location)
@@ -0,0 +1,249 @@
+"""
+Headless self-play for tuning map presets.
+
+Runs every bot on every map of a seeded batch across a process pool and
+reports steps-to-goal distributions per bot, so room_chance /
+extra_connection_chance presets can be compared without anyone playing:
+
+    python code/botHarness.py --size 31 --room-chance 0.4 1.0 --extra 0 0.1
+    python code/botHarness.py --bots wall random --count 500 --hard
+
+Bots are given by name (see BOTS) or as any picklable zero-argument
+factory returning a Bot, e.g. functools.partial(FunctionBot, myChooser).
+"""
+import argparse
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+from botClass import BfsBot, Bot, RandomWalkBot, WallFollowerBot
+from distanceField import DistanceField
+from mapBatch import mapSeeds
+from mapClass import DungeonMap
+from playerClass import PlayerClass
+from sessionClass import GameSession
+
+# Built-in bots by name
+BOTS: Dict[str, Callable[[], Bot]] = {
+    "bfs": BfsBot,
+    "wall": WallFollowerBot,
+    "random": RandomWalkBot,
+}
+
+BotSpec = Union[str, Callable[[], Bot]]
+
+
+class BotRun(NamedTuple):
+    """Outcome of one bot on one map."""
+    bot: str
+    seed: int
+    completed: bool
+    # Moves tried, including blocked ones (session.ticks)
+    steps: int
+    # Shortest route for the map's objective (see parSteps), -1 if unreachable
+    par: int
+
+
+class BotStats(NamedTuple):
+    """Steps-to-goal distribution of one bot over a batch (solved runs only)."""
+    bot: str
+    runs: int
+    solved: int
+    mean: float
+    median: float
+    p10: float
+    p90: float
+    worst: int
+    # Mean of steps / par over solved runs with a positive par
+    par_ratio: float
+
+
+def parSteps(dungeon_map: DungeonMap) -> int:
+    """
+    Reference route length from home: the shortest path to any room on
+    "any" maps, the sum of the shortest legs between checkpoints on
+    "ordered" maps, and a greedy nearest-room tour on "all" maps (an upper
+    bound; the exact tour is a travelling-salesman problem). -1 if a
+    needed room is unreachable.
+    """
+    if dungeon_map.objective == "any":
+        return dungeon_map.distanceField().pathLength()
+
+    total = 0
+    position = dungeon_map.home
+    remaining = list(dungeon_map.rooms)
+    while remaining:
+        if dungeon_map.objective == "ordered":
+            target = remaining[0]
+            field = DistanceField(dungeon_map, targets=[target])
+            steps = field.distanceAt(*position)
+        else:
+            # One field from the current position reaches every room
+            field = DistanceField(dungeon_map, targets=[position])
+            reachable = [(field.distanceAt(*room), room) for room in remaining
+                         if field.distanceAt(*room) >= 0]
+            if not reachable:
+                return -1
+            steps, target = min(reachable)
+        if steps < 0:
+            return -1
+        total += steps
+        position = target
+        remaining.remove(target)
+    return total
+
+
+def _botFactory(spec: BotSpec) -> Callable[[], Bot]:
+    if isinstance(spec, str):
+        if spec not in BOTS:
+            raise ValueError(f"Unknown bot '{spec}'. Choose from: {', '.join(BOTS)}.")
+        return BOTS[spec]
+    return spec
+
+
+def _playChunk(specs: Sequence[BotSpec], settings: tuple, seeds: List[int],
+               max_steps: int, hard_mode: bool) -> List[BotRun]:
+    """
+    Worker task: play every bot on the maps for `seeds`. Each map is
+    generated once and shared by the bots, except in hard mode where a bot
+    changes the map and every later bot gets a fresh copy.
+    """
+    factories = [_botFactory(spec) for spec in specs]
+    results = []
+    for seed in seeds:
+        dungeon_map = DungeonMap(*settings[:3], seed=seed, algorithm=settings[3],
+                                 room_count=settings[4], objective=settings[5])
+        par = parSteps(dungeon_map)
+        for i, factory in enumerate(factories):
+            bot = factory()
+            if hard_mode and i > 0:
+                dungeon_map = DungeonMap(*settings[:3], seed=seed, algorithm=settings[3],
+                                         room_count=settings[4], objective=settings[5])
+            player = PlayerClass(dungeon_map)
+            player.hardMode = hard_mode
+            session = GameSession(dungeon_map, player)
+            steps = bot.play(session, max_steps)
+            results.append(BotRun(bot.name, seed, session.completed, steps, par))
+    return results
+
+
+def runBots(
+    bots: Iterable[BotSpec],
+    count: int,
+    size: int,
+    room_chance: float = 0.4,
+    extra_connection_chance: float = 0.05,
+    seed: int = 0,
+    algorithm: str = "dfs",
+    room_count: int = 1,
+    objective: str = "any",
+    hard_mode: bool = False,
+    max_steps: int = None,
+    workers: int = None,
+    chunksize: int = None
+) -> Iterator[BotRun]:
+    """
+    Play each bot on `count` maps (seeds from mapBatch.mapSeeds(seed, count))
+    in a process pool and yield one BotRun per (map, bot), in map order.
+    Runs that take more than `max_steps` moves (default 4 * size²) count as
+    unsolved, which keeps loop-circling bots from hanging the batch.
+    """
+    if count < 0:
+        raise ValueError("Map count cannot be negative.")
+    specs = list(bots)
+    for spec in specs:
+        _botFactory(spec)
+    max_steps = max_steps if max_steps is not None else 4 * size * size
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(32, count // (workers * 4)))
+    settings = (size, room_chance, extra_connection_chance, algorithm, room_count, objective)
+
+    seeds = list(mapSeeds(seed, count))
+    chunks = [seeds[i:i + chunksize] for i in range(0, count, chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = executor.map(
+            _playChunk,
+            [specs] * len(chunks), [settings] * len(chunks), chunks,
+            [max_steps] * len(chunks), [hard_mode] * len(chunks)
+        )
+        for chunk_results in futures:
+            yield from chunk_results
+
+
+def summarize(runs: Iterable[BotRun]) -> Dict[str, BotStats]:
+    """Group runs by bot and compute the steps distribution of solved runs."""
+    grouped: Dict[str, List[BotRun]] = {}
+    for run in runs:
+        grouped.setdefault(run.bot, []).append(run)
+
+    stats = {}
+    for name, bot_runs in grouped.items():
+        steps = sorted(run.steps for run in bot_runs if run.completed)
+        ratios = [run.steps / run.par for run in bot_runs if run.completed and run.par > 0]
+        if steps:
+            # Deciles need two points; a single solved run is its own decile
+            if len(steps) > 1:
+                deciles = statistics.quantiles(steps, n=10, method="inclusive")
+            else:
+                deciles = [steps[0]] * 9
+            stats[name] = BotStats(
+                name, len(bot_runs), len(steps), statistics.fmean(steps),
+                statistics.median(steps), deciles[0], deciles[-1], steps[-1],
+                statistics.fmean(ratios) if ratios else float("nan")
+            )
+        else:
+            nan = float("nan")
+            stats[name] = BotStats(name, len(bot_runs), 0, nan, nan, nan, nan, 0, nan)
+    return stats
+
+
+def evaluate(bots: Iterable[BotSpec], count: int, size: int, **options) -> Dict[str, BotStats]:
+    """runBots() followed by summarize(); options are passed to runBots."""
+    return summarize(runBots(bots, count, size, **options))
+
+
+def formatStats(stats: Dict[str, BotStats]) -> str:
+    """A plain-text table of summarize() output."""
+    lines = [f"{'bot':<10}{'solved':>12}{'mean':>10}{'median':>10}{'p10':>10}{'p90':>10}"
+             f"{'worst':>10}{'x par':>8}"]
+    for s in stats.values():
+        lines.append(
+            f"{s.bot:<10}{f'{s.solved}/{s.runs}':>12}{s.mean:>10.1f}{s.median:>10.1f}"
+            f"{s.p10:>10.1f}{s.p90:>10.1f}{s.worst:>10}{s.par_ratio:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bot self-play over seeded map batches")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS), choices=list(BOTS))
+    parser.add_argument("--count", type=int, default=200, help="maps per preset")
+    parser.add_argument("--size", type=int, default=31)
+    parser.add_argument("--room-chance", type=float, nargs="+", default=[0.4])
+    parser.add_argument("--extra", type=float, nargs="+", default=[0.05],
+                        help="extra connection chances")
+    parser.add_argument("--algorithm", default="dfs")
+    parser.add_argument("--rooms", type=int, default=1, help="goal rooms per map")
+    parser.add_argument("--objective", default="any")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    # One table per preset in the room_chance x extra grid
+    for room_chance in args.room_chance:
+        for extra in args.extra:
+            stats = evaluate(
+                args.bots, args.count, args.size,
+                room_chance=room_chance, extra_connection_chance=extra, seed=args.seed,
+                algorithm=args.algorithm, room_count=args.rooms, objective=args.objective,
+                hard_mode=args.hard, max_steps=args.max_steps, workers=args.workers
+            )
+            print(f"\nsize={args.size} room_chance={room_chance} extra={extra}")
+            print(formatStats(stats))
+
+
+if __name__ == "__main__":
+    main()
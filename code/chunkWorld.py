@@ -0,0 +1,296 @@
+import hashlib
+import random
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from roomClass import EMPTY, HOME, HALLWAY, ROOM
+from gridClass import packCells, unpackCells
+from mapClass import PLAYER_SYMBOL, OTHER_SYMBOL, VISIBLE_SYMBOLS
+from mazeAlgorithms import ALGORITHMS
+from metrics import metrics
+
+# Cells along each side of a chunk; even, so every chunk has the same layout
+CHUNK_SIZE = 32
+
+# Salts that keep the per-chunk random streams independent
+_SALT_CHUNK = 0
+_SALT_WEST_EDGE = 1
+_SALT_NORTH_EDGE = 2
+
+
+def _mix(seed: int, cx: int, cy: int, salt: int) -> int:
+    """
+    Stable 64-bit hash of (seed, chunk x, chunk y, salt). Unlike hash() it
+    is the same in every process and Python version.
+    """
+    digest = hashlib.blake2b(struct.pack("<qqqB", seed, cx, cy, salt), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class ChunkWorld:
+    """
+    Endless dungeon made of CHUNK_SIZE x CHUNK_SIZE chunks in every
+    direction. It offers the parts of the DungeonMap interface used by
+    PlayerClass, GameSession and the renderers (canMove, setTile, grid.code,
+    printWindow, ...); `size` is None to mark the map as unbounded.
+
+    Chunk (cx, cy) covers cells x in [cx * C, cx * C + C) and likewise for y,
+    with C = chunkSize. Inside a chunk, cells with odd local x and y are maze
+    nodes carved by the usual algorithms, so each chunk is a perfect maze on
+    its own. Local row 0 and column 0 are the chunk's north and west borders;
+    which border cells are open is decided by a hash of (seed, cx, cy, side)
+    alone, so both neighbours agree on every opening without either being
+    generated. Each border has at least one opening, which keeps the whole
+    world connected.
+
+    Chunks are generated from (seed, cx, cy) the first time a cell in them is
+    read, i.e. only when the player (or the view around them) gets close.
+    At most `max_chunks` are kept, least recently used first out; evicted
+    chunks that were never changed are dropped and regenerated on demand,
+    changed ones (hard mode) are kept 2-bit packed, at most `max_packed`.
+    """
+
+    def __init__(
+        self,
+        room_chance: float = 0.4,
+        extra_connection_chance: float = 0.05,
+        seed: int = None,
+        algorithm: str = "dfs",
+        chunkSize: int = CHUNK_SIZE,
+        door_chance: float = 0.15,
+        max_chunks: int = 64,
+        max_packed: int = 1024
+    ):
+        if not (0.0 <= room_chance <= 1.0):
+            raise ValueError("Room chance must be between 0 and 1.")
+        if not (0.0 <= extra_connection_chance <= 1.0):
+            raise ValueError("Extra connection chance must be between 0 and 1.")
+        if not (0.0 <= door_chance <= 1.0):
+            raise ValueError("Door chance must be between 0 and 1.")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown maze algorithm: {algorithm}.")
+        if chunkSize < 4 or chunkSize % 2:
+            raise ValueError("Chunk size must be an even number of at least 4.")
+        if max_chunks < 1:
+            raise ValueError("The chunk cache must hold at least one chunk.")
+
+        # Unbounded: renderers and the window check for None
+        self.size = None
+        self.chunkSize = chunkSize
+        # Probabilities for rooms at dead ends and extra corridors, per chunk
+        self.room_chance = room_chance
+        self.extra_connection_chance = extra_connection_chance
+        # Chance that each further border cell between two chunks is open
+        self.door_chance = door_chance
+        self.algorithm = algorithm
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.use_numpy = False
+
+        # DungeonMap attributes the session and window read. There is no
+        # goal in endless mode: R rooms are landmarks, the run never ends.
+        self.home = (1, 1)
+        self.rooms: List[Tuple[int, int]] = []
+        self.room = None
+        self.room_count = 0
+        self.objective = "any"
+        self.fogRadius: int = None
+        self.explored = None
+        self.player = None
+        self.others: Dict[int, Tuple[int, int]] = {}
+
+        # Chunk cache: live cells by (cx, cy), least recently used first
+        self.max_chunks = max_chunks
+        self.max_packed = max_packed
+        self._chunks: "OrderedDict[Tuple[int, int], bytearray]" = OrderedDict()
+        # Chunks changed since generation, and evicted changed chunks (packed)
+        self._edited = set()
+        self._packed: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+
+    @property
+    def grid(self) -> "ChunkWorld":
+        """Renderers read tiles through map.grid.code(x, y); the world answers itself."""
+        return self
+
+    # ─── Chunk Generation ────────────────────────────────────────────────────
+
+    def _doors(self, cx: int, cy: int, salt: int) -> List[int]:
+        """
+        Node indices (0 .. C/2 - 1) whose border cell is open on one side of
+        chunk (cx, cy). Always at least one; depends only on the arguments.
+        """
+        nodes = self.chunkSize // 2
+        rng = random.Random(_mix(self.seed, cx, cy, salt))
+        doors = {rng.randrange(nodes)}
+        doors.update(i for i in range(nodes) if rng.random() < self.door_chance)
+        return sorted(doors)
+
+    def _generateChunk(self, cx: int, cy: int) -> bytearray:
+        """Tile codes of chunk (cx, cy), row-major with local (x, y) at y * C + x."""
+        C = self.chunkSize
+        rng = random.Random(_mix(self.seed, cx, cy, _SALT_CHUNK))
+
+        # Carve a perfect maze over the nodes at odd local coordinates: an
+        # (C - 1)-sized sub-grid whose (row, col) (0, 0) is local (1, 1)
+        n = C - 1
+        inner = bytearray(n * n)
+        inner[0] = HALLWAY
+        ALGORITHMS[self.algorithm](inner, n, (0, 0), rng)
+
+        # Dead ends become rooms, then a few extra corridors open loops
+        dead_ends = []
+        for k in range(0, n * n):
+            if inner[k] != HALLWAY:
+                continue
+            r, c = divmod(k, n)
+            open_sides = ((r > 0 and inner[k - n] != EMPTY) + (r < n - 1 and inner[k + n] != EMPTY)
+                          + (c > 0 and inner[k - 1] != EMPTY) + (c < n - 1 and inner[k + 1] != EMPTY))
+            if open_sides == 1:
+                dead_ends.append(k)
+        for k in dead_ends:
+            if rng.random() < self.room_chance:
+                inner[k] = ROOM
+        for r in range(n):
+            # Walls between two nodes have exactly one odd sub-grid coordinate
+            for c in range((r + 1) % 2, n, 2):
+                if inner[r * n + c] == EMPTY and rng.random() < self.extra_connection_chance:
+                    inner[r * n + c] = HALLWAY
+
+        cells = bytearray(C * C)
+        for r in range(n):
+            start = (r + 1) * C + 1
+            cells[start:start + n] = inner[r * n:(r + 1) * n]
+
+        # Open this chunk's own west and north borders; the east and south
+        # ones belong to the neighbours and are decided by the same hashes
+        for i in self._doors(cx, cy, _SALT_WEST_EDGE):
+            cells[(2 * i + 1) * C] = HALLWAY
+        for i in self._doors(cx, cy, _SALT_NORTH_EDGE):
+            cells[2 * i + 1] = HALLWAY
+
+        if (cx, cy) == (0, 0):
+            cells[self.home[1] * C + self.home[0]] = HOME
+        return cells
+
+    def _chunk(self, cx: int, cy: int) -> bytearray:
+        """The cells of chunk (cx, cy), loading or generating it if needed."""
+        key = (cx, cy)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            self._chunks.move_to_end(key)
+            return cells
+
+        data = self._packed.pop(key, None)
+        if data is not None:
+            cells = unpackCells(data, self.chunkSize * self.chunkSize)
+            self._edited.add(key)
+        else:
+            with metrics.timed("chunk_generation"):
+                cells = self._generateChunk(cx, cy)
+        self._chunks[key] = cells
+        self._evict()
+        return cells
+
+    def _evict(self):
+        """Drop least recently used chunks until `max_chunks` remain."""
+        while len(self._chunks) > self.max_chunks:
+            key, cells = self._chunks.popitem(last=False)
+            if key in self._edited:
+                # Changed by hard mode: keep the edits, 4 cells per byte
+                self._edited.discard(key)
+                self._packed[key] = packCells(cells)
+                while len(self._packed) > self.max_packed:
+                    self._packed.popitem(last=False)
+
+    def chunkCount(self) -> Tuple[int, int]:
+        """(live chunks, packed edited chunks) currently held."""
+        return len(self._chunks), len(self._packed)
+
+    # ─── Tiles ───────────────────────────────────────────────────────────────
+
+    def code(self, x: int, y: int) -> int:
+        """Tile code at world cell (x, y); any integers are valid."""
+        C = self.chunkSize
+        cx, lx = divmod(x, C)
+        cy, ly = divmod(y, C)
+        return self._chunk(cx, cy)[ly * C + lx]
+
+    def setTile(self, x: int, y: int, code: int):
+        """Replace the tile at world cell (x, y) (e.g. hard mode wiping it)."""
+        C = self.chunkSize
+        cx, lx = divmod(x, C)
+        cy, ly = divmod(y, C)
+        self._chunk(cx, cy)[ly * C + lx] = code
+        self._edited.add((cx, cy))
+
+    def rowCodes(self, y: int, start: int, stop: int) -> bytes:
+        """Tile codes of row y for columns start .. stop - 1, chunk by chunk."""
+        C = self.chunkSize
+        cy, ly = divmod(y, C)
+        row = bytearray()
+        x = start
+        while x < stop:
+            cx, lx = divmod(x, C)
+            take = min(C - lx, stop - x)
+            offset = ly * C + lx
+            row += self._chunk(cx, cy)[offset:offset + take]
+            x += take
+        return bytes(row)
+
+    def canMove(self, new_location: Tuple[int, int]) -> bool:
+        """Whether the player may step onto new_location (anything but Empty)."""
+        return self.code(*new_location) != EMPTY
+
+    def isRoom(self, x: int, y: int) -> bool:
+        return self.code(x, y) == ROOM
+
+    def isExplored(self, x: int, y: int) -> bool:
+        """No fog of war in endless mode."""
+        return True
+
+    # ─── Player & Runs ───────────────────────────────────────────────────────
+
+    def assignPlayer(self, player):
+        """Place the player on the home cell."""
+        self.player = player
+        self.player.location = self.home
+
+    def regenerate(self, seed: int = None):
+        """Start a different world: new seed, every chunk dropped."""
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self._chunks.clear()
+        self._packed.clear()
+        self._edited.clear()
+
+    def enableFog(self, radius: int = 5):
+        raise ValueError("Fog of war is not available in endless mode.")
+
+    def disableFog(self):
+        pass
+
+    # ─── Rendering ───────────────────────────────────────────────────────────
+
+    def printWindow(self, x0: int, y0: int, width: int, height: int) -> str:
+        """
+        ASCII render of the width x height block whose top-left cell is
+        (x0, y0), with the same symbols and borders as DungeonMap.printMap.
+        Touches only the chunks overlapping the block.
+        """
+        glyphs = {}
+        for (px, py), symbol in self._playerGlyphs():
+            if x0 <= px < x0 + width and y0 <= py < y0 + height:
+                glyphs.setdefault(py, []).append((px, symbol))
+        border = '─' * (2 * width)
+        lines = ['┌' + border + '┐']
+        for y in range(y0, y0 + height):
+            symbols = [VISIBLE_SYMBOLS[code] for code in self.rowCodes(y, x0, x0 + width)]
+            for px, symbol in glyphs.get(y, ()):
+                symbols[px - x0] = symbol
+            lines.append('│' + ''.join(symbols) + '│')
+        lines.append('└' + border + '┘')
+        return '\n'.join(lines) + '\n'
+
+    def _playerGlyphs(self) -> List[Tuple[Tuple[int, int], str]]:
+        """(location, symbol) for other players, then this world's player on top."""
+        glyphs = [(location, OTHER_SYMBOL) for location in self.others.values()]
+        glyphs.append((self.player.location, PLAYER_SYMBOL))
+        return glyphs
@@ -0,0 +1,174 @@
+from collections import deque
+from typing import Iterable, List, Optional, Set, Tuple
+from roomClass import EMPTY
+from gridClass import BitGrid, flatCells
+
+
+class ConnectivityTracker:
+    """
+    Keeps track, in hard mode, of which cells the player can still reach
+    as tiles behind them turn Empty. Removing a cell can only split the
+    component it was in, and only between its (at most four) open
+    neighbours, so removeCell() runs one breadth-first search from each of
+    those neighbours in lockstep:
+      - searches that meet are still connected and stop early;
+      - a search that runs out of cells without meeting the others has
+        walked around a closed-off component.
+    As soon as at most one group of searches is still running, the split is
+    fully known. The work is bounded by the number of searches times the
+    smaller side of the split (or the distance the searches need to meet),
+    not by the whole map as with a flood fill per move.
+
+    Cut-off cells are recorded in a BitGrid (`dead`). When the player
+    themselves ends up on the closed-off side, their whole component is
+    known and kept instead (`confined`), and everything outside it is dead.
+    Only removals are supported, which is all hard mode does.
+    """
+
+    def __init__(self, dungeon_map):
+        # Map being watched, and its tile codes one byte per cell (a private
+        # copy for packed grids, kept in step by removeCell)
+        self.map = dungeon_map
+        self.size = dungeon_map.size
+        self.cells = flatCells(dungeon_map.grid)
+        # Cells cut off from the player for good
+        self.dead = BitGrid(self.size)
+        # The player's exact component once it is known (flat indices), else None
+        self.confined: Optional[Set[int]] = None
+
+    def isReachable(self, x: int, y: int) -> bool:
+        """Whether the player can still walk to (x, y)."""
+        if self.cells[y * self.size + x] == EMPTY:
+            return False
+        if self.confined is not None:
+            return y * self.size + x in self.confined
+        return not self.dead.get(x, y)
+
+    def canFinish(self, remaining: Iterable[Tuple[int, int]], objective: str) -> bool:
+        """
+        Whether the objective can still be met with `remaining` goal rooms
+        left: one reachable room is enough for "any", every one is needed
+        for "all" and "ordered".
+        """
+        reachable = [self.isReachable(x, y) for x, y in remaining]
+        if objective == "any":
+            return any(reachable)
+        return all(reachable)
+
+    def removeCell(self, x: int, y: int, player: Tuple[int, int]) -> bool:
+        """
+        Update reachability after (x, y) became Empty with the player now at
+        `player`. Returns True if this removal cut any cells off from the
+        player (usually it does not).
+        """
+        n = self.size
+        k = y * n + x
+        self.cells[k] = EMPTY
+        if self.confined is not None:
+            self.confined.discard(k)
+        starts = [v for v in self._neighbors(k) if self._alive(v)]
+        if len(starts) < 2:
+            # A dead end (or nothing) was removed: nothing can split
+            return False
+
+        closed = self._split(starts)
+        player_k = player[1] * n + player[0]
+        for component in closed:
+            if player_k in component:
+                # The player is on the closed-off side: everything else is gone
+                self.confined = component
+                break
+        for component in closed:
+            if self.confined is not component:
+                self._bury(component)
+        return bool(closed)
+
+    def _alive(self, k: int) -> bool:
+        """Open and not already known to be cut off."""
+        if self.cells[k] == EMPTY:
+            return False
+        if self.confined is not None:
+            return k in self.confined
+        return not self.dead.get(k % self.size, k // self.size)
+
+    def _bury(self, component: Iterable[int]):
+        """Mark cut-off cells dead (or drop them from the confined set)."""
+        if self.confined is not None:
+            self.confined.difference_update(component)
+            return
+        n = self.size
+        for v in component:
+            self.dead.set(v % n, v // n)
+
+    def _split(self, starts: List[int]) -> List[Set[int]]:
+        """
+        Lockstep BFS from every start cell. Returns the components that were
+        closed off (explored to the end without meeting the remaining
+        searches); the last group still running is not explored further.
+        """
+        count = len(starts)
+        # owner[v] = search that visited v; searches that meet are merged
+        # with union-find over their indices
+        owner = {start: i for i, start in enumerate(starts)}
+        parent = list(range(count))
+        queues = [deque([start]) for start in starts]
+        visited = [[start] for start in starts]
+        retired = set()
+        closed = []
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        while True:
+            groups = {}
+            for i in range(count):
+                if i not in retired:
+                    groups.setdefault(find(i), []).append(i)
+            if len(groups) <= 1:
+                # Every search met the others: nothing was split off
+                return closed
+            running = len(groups)
+            for members in groups.values():
+                if not any(queues[i] for i in members):
+                    # Nothing left to expand without meeting anyone: closed off
+                    closed.append({v for i in members for v in visited[i]})
+                    retired.update(members)
+                    running -= 1
+            if running <= 1:
+                return closed
+
+            # One expansion per search that is still going
+            for i in range(count):
+                queue = queues[i]
+                if i in retired or not queue:
+                    continue
+                for v in self._neighbors(queue.popleft()):
+                    if not self._alive(v):
+                        continue
+                    other = owner.get(v)
+                    if other is None:
+                        owner[v] = i
+                        queue.append(v)
+                        visited[i].append(v)
+                    else:
+                        a, b = find(other), find(i)
+                        if a != b:
+                            parent[a] = b
+
+    def _neighbors(self, k: int) -> List[int]:
+        """Flat indices of the in-bounds orthogonal neighbours of cell k."""
+        n = self.size
+        x = k % n
+        result = []
+        if k >= n:
+            result.append(k - n)
+        if k < n * (n - 1):
+            result.append(k + n)
+        if x > 0:
+            result.append(k - 1)
+        if x < n - 1:
+            result.append(k + 1)
+        return result
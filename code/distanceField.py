@@ -0,0 +1,186 @@
+import heapq
+from array import array
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+from roomClass import EMPTY
+from gridClass import flatCells
+
+# Direction names in the order neighbours are tried, with their (dx, dy)
+_STEPS = (("up", 0, -1), ("down", 0, 1), ("left", -1, 0), ("right", 1, 0))
+
+
+class DistanceField:
+    """
+    Breadth-first distances from every walkable cell to the nearest target
+    (by default the map's Rooms), stored in a flat array('i') with -1 for
+    cells that cannot reach a target. Built once per map; lookups are O(1)
+    and following decreasing distances gives a shortest path. Loops from
+    extra connections are handled naturally by BFS. When hard mode removes
+    a tile, removeCell repairs only the cells whose distance depended on it
+    instead of re-running the whole search.
+    """
+
+    UNREACHABLE = -1
+
+    def __init__(self, dungeon_map, targets: Iterable[Tuple[int, int]] = None):
+        # Map being measured, and its tile codes one byte per cell (a private
+        # copy for packed grids, kept in step by removeCell)
+        self.map = dungeon_map
+        self.size = dungeon_map.size
+        self.cells = flatCells(dungeon_map.grid)
+        # Target cells (x, y) that have distance 0 (default: every goal room)
+        self.targets = list(targets) if targets is not None else list(dungeon_map.rooms)
+        # Distance per cell, row-major like the grid
+        self.dist = array('i', [self.UNREACHABLE]) * (self.size * self.size)
+        self._build()
+
+    def _neighbors(self, k: int) -> List[int]:
+        """Flat indices of the in-bounds orthogonal neighbours of cell k."""
+        n = self.size
+        x = k % n
+        result = []
+        if k >= n:
+            result.append(k - n)
+        if k < n * (n - 1):
+            result.append(k + n)
+        if x > 0:
+            result.append(k - 1)
+        if x < n - 1:
+            result.append(k + 1)
+        return result
+
+    def _build(self):
+        """Multi-source BFS from all targets over non-Empty cells."""
+        n = self.size
+        cells, dist = self.cells, self.dist
+        queue = deque()
+        for x, y in self.targets:
+            k = y * n + x
+            if cells[k] != EMPTY:
+                dist[k] = 0
+                queue.append(k)
+
+        last_row = n * (n - 1)
+        while queue:
+            k = queue.popleft()
+            d = dist[k] + 1
+            x = k % n
+            # Inline neighbour checks: this loop visits every walkable cell
+            if k >= n and dist[k - n] < 0 and cells[k - n] != EMPTY:
+                dist[k - n] = d
+                queue.append(k - n)
+            if k < last_row and dist[k + n] < 0 and cells[k + n] != EMPTY:
+                dist[k + n] = d
+                queue.append(k + n)
+            if x > 0 and dist[k - 1] < 0 and cells[k - 1] != EMPTY:
+                dist[k - 1] = d
+                queue.append(k - 1)
+            if x < n - 1 and dist[k + 1] < 0 and cells[k + 1] != EMPTY:
+                dist[k + 1] = d
+                queue.append(k + 1)
+
+    def distanceAt(self, x: int, y: int) -> int:
+        """Moves from (x, y) to the nearest target, or -1 if unreachable."""
+        return self.dist[y * self.size + x]
+
+    def pathLength(self) -> int:
+        """Shortest number of moves from home to the nearest target (par)."""
+        x, y = self.map.home
+        return self.distanceAt(x, y)
+
+    def nextStep(self, x: int, y: int) -> Optional[str]:
+        """
+        Direction ('up', 'down', 'left', 'right') of a move that gets one
+        step closer to a target, or None at a target or if unreachable.
+        """
+        d = self.distanceAt(x, y)
+        if d <= 0:
+            return None
+        n = self.size
+        for name, dx, dy in _STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < n and 0 <= ny < n and self.dist[ny * n + nx] == d - 1:
+                return name
+        return None
+
+    def path(self, start: Tuple[int, int] = None) -> List[Tuple[int, int]]:
+        """
+        Shortest path from `start` (default: home) to the nearest target as a
+        list of (x, y) cells including both ends; empty if unreachable.
+        """
+        x, y = start if start is not None else self.map.home
+        if self.distanceAt(x, y) < 0:
+            return []
+        path = [(x, y)]
+        step = self.nextStep(x, y)
+        while step is not None:
+            for name, dx, dy in _STEPS:
+                if name == step:
+                    x, y = x + dx, y + dy
+                    break
+            path.append((x, y))
+            step = self.nextStep(x, y)
+        return path
+
+    def removeCell(self, x: int, y: int):
+        """
+        Update distances after the cell (x, y) became Empty.
+        1) Find the cells that lost every shortest-path parent, walking
+           outwards from the removed cell in order of distance.
+        2) Re-settle just those cells, starting from their best unaffected
+           neighbour, with a small Dijkstra over the affected region.
+        Cost is proportional to the affected region, not the whole map.
+        """
+        n = self.size
+        dist, cells = self.dist, self.cells
+        k = y * n + x
+        cells[k] = EMPTY
+        d = dist[k]
+        dist[k] = self.UNREACHABLE
+        if d < 0:
+            return  # nothing could have depended on an unreachable cell
+
+        # ─── Phase 1: collect affected cells ─────────────────────────────────
+        affected = set()
+        safe = set()
+        queue = deque(v for v in self._neighbors(k) if dist[v] == d + 1)
+        while queue:
+            u = queue.popleft()
+            if u in affected or u in safe:
+                continue
+            du = dist[u]
+            # Still fine if any walkable, unaffected neighbour is one step closer
+            if any(
+                dist[w] == du - 1 and w not in affected and cells[w] != EMPTY
+                for w in self._neighbors(u)
+            ):
+                safe.add(u)
+                continue
+            affected.add(u)
+            queue.extend(v for v in self._neighbors(u) if dist[v] == du + 1)
+
+        if not affected:
+            return
+
+        # ─── Phase 2: re-settle affected cells ───────────────────────────────
+        heap = []
+        for a in affected:
+            dist[a] = self.UNREACHABLE
+        for a in affected:
+            best = min(
+                (dist[w] + 1 for w in self._neighbors(a)
+                 if w not in affected and dist[w] >= 0 and cells[w] != EMPTY),
+                default=None
+            )
+            if best is not None:
+                heap.append((best, a))
+        heapq.heapify(heap)
+
+        while heap:
+            d, a = heapq.heappop(heap)
+            if dist[a] >= 0:
+                continue
+            dist[a] = d
+            for b in self._neighbors(a):
+                if b in affected and dist[b] < 0:
+                    heapq.heappush(heap, (d + 1, b))
@@ -0,0 +1,177 @@
+import random
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import Dict
+from mapClass import DungeonMap
+from mapPrefetcher import MapSettings, generatePacked
+from mapStorage import dumpMap, loadsMap
+
+
+def levelSeed(seed: int, depth: int) -> int:
+    """
+    Seed of the level at `depth` in a stack started from `seed`. Depends
+    only on (seed, depth), so any level can be rebuilt on its own.
+    """
+    return random.Random(seed * 1000003 + depth).getrandbits(32)
+
+
+class DungeonStack:
+    """
+    A descending run: level 0, 1, 2, ... each a DungeonMap with the same
+    settings and its own seed from levelSeed(). Reaching a level's goal
+    leads down to the next one.
+
+    Levels are generated lazily the first time they are needed; the level
+    below the current one is generated ahead in `executor` when one is
+    given. Memory stays bounded however deep a run goes:
+      - at most `budget` levels are kept as live DungeonMaps, least recently
+        used first out;
+      - an evicted level that was never changed (no hard-mode wipes) is
+        dropped entirely, since levelSeed() rebuilds it exactly;
+      - a changed level is kept in its packed mapStorage form (about
+        size² / 4 bytes), at most `max_packed` of them, again LRU. Past
+        that a changed level reverts to its generated layout.
+    """
+
+    def __init__(self, settings: MapSettings, seed: int = None, budget: int = 3,
+                 max_packed: int = 64, executor: Executor = None):
+        if budget < 1:
+            raise ValueError("Level budget must be at least 1.")
+        if max_packed < 0:
+            raise ValueError("Packed level budget cannot be negative.")
+        # (size, room_chance, extra_connection_chance, algorithm, use_numpy,
+        # room_count, objective), as returned by mapPrefetcher.settingsOf
+        self.settings = tuple(settings)
+        self.budget = budget
+        self.max_packed = max_packed
+        # Optional pool used to generate the next level ahead of time
+        self.executor = executor
+
+        # Run seed every level seed is derived from
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        # Level the player is on
+        self.depth = 0
+        # Live maps by depth, least recently used first
+        self._live: "OrderedDict[int, DungeonMap]" = OrderedDict()
+        # Changed, evicted levels in packed form, least recently used first
+        self._packed: "OrderedDict[int, bytes]" = OrderedDict()
+        # CRC of each live level's tiles as generated, to spot changed levels
+        self._checksums: Dict[int, int] = {}
+        # Background generations by depth
+        self._pending: Dict[int, Future] = {}
+
+    # ─── Levels ──────────────────────────────────────────────────────────────
+
+    def level(self, depth: int) -> DungeonMap:
+        """
+        The map of level `depth`, in the state it was left in. Loaded from
+        the live set, the packed store, a finished prefetch, or generated
+        here, in that order of preference.
+        """
+        if depth < 0:
+            raise ValueError("Level depth cannot be negative.")
+        dungeon_map = self._live.get(depth)
+        if dungeon_map is not None:
+            self._live.move_to_end(depth)
+            return dungeon_map
+
+        data = self._packed.pop(depth, None)
+        future = self._pending.pop(depth, None)
+        if data is not None:
+            # A changed level: no checksum, so eviction always packs it again
+            dungeon_map = loadsMap(data)
+            checksum = None
+        else:
+            if future is not None and not future.cancelled():
+                dungeon_map = loadsMap(future.result())
+            else:
+                dungeon_map = self._generate(depth)
+            checksum = zlib.crc32(dungeon_map.grid.cells)
+
+        self._live[depth] = dungeon_map
+        self._checksums[depth] = checksum
+        self._evict()
+        return dungeon_map
+
+    def current(self) -> DungeonMap:
+        """The map of the level the player is on."""
+        return self.level(self.depth)
+
+    def descend(self) -> DungeonMap:
+        """Go down one level and return its map; the next one starts generating."""
+        self.depth += 1
+        dungeon_map = self.level(self.depth)
+        self.prefetch(self.depth + 1)
+        return dungeon_map
+
+    def restart(self, settings: MapSettings = None, seed: int = None) -> DungeonMap:
+        """
+        Start a new run at level 0, optionally with new settings; every kept
+        and queued level is dropped. Returns the first level's map.
+        """
+        if settings is not None:
+            self.settings = tuple(settings)
+        self._cancelPending()
+        self._live.clear()
+        self._packed.clear()
+        self._checksums.clear()
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.depth = 0
+        dungeon_map = self.level(0)
+        self.prefetch(1)
+        return dungeon_map
+
+    def prefetch(self, depth: int):
+        """Start generating level `depth` in the executor, if there is one."""
+        if (self.executor is None or depth in self._live or depth in self._packed
+                or depth in self._pending):
+            return
+        self._pending[depth] = self.executor.submit(
+            generatePacked, levelSeed(self.seed, depth), *self.settings
+        )
+
+    def shutdown(self):
+        """Cancel queued generations (the executor itself belongs to the caller)."""
+        self._cancelPending()
+
+    # ─── Memory Budget ───────────────────────────────────────────────────────
+
+    def _generate(self, depth: int) -> DungeonMap:
+        size, room_chance, extra, algorithm, use_numpy, room_count, objective = self.settings
+        return DungeonMap(
+            size,
+            room_chance=room_chance,
+            extra_connection_chance=extra,
+            seed=levelSeed(self.seed, depth),
+            use_numpy=use_numpy,
+            algorithm=algorithm,
+            room_count=room_count,
+            objective=objective
+        )
+
+    def _evict(self):
+        """Move least recently used live levels out until `budget` remain."""
+        while len(self._live) > self.budget:
+            depth, dungeon_map = self._live.popitem(last=False)
+            checksum = self._checksums.pop(depth)
+            if checksum is not None and zlib.crc32(dungeon_map.grid.cells) == checksum:
+                continue  # unchanged: levelSeed() rebuilds it exactly
+            self._packed[depth] = dumpMap(dungeon_map)
+            while len(self._packed) > self.max_packed:
+                self._packed.popitem(last=False)
+
+    def _cancelPending(self):
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Current depth and how many levels are live, packed and queued."""
+        return {
+            "depth": self.depth,
+            "live": len(self._live),
+            "packed": len(self._packed),
+            "packed_bytes": sum(len(data) for data in self._packed.values()),
+            "pending": len(self._pending),
+        }
@@ -1,4 +1,11 @@
 import tkinter as tk
+from mapRenderer import RENDERERS
+from mazeAlgorithms import ALGORITHMS
+from mapClass import OBJECTIVES
+from metrics import metrics
+
+# View radius (tiles) used when fog of war is switched on
+FOG_RADIUS = 5
 
 
 class SettingsApp:
@@ -12,7 +19,7 @@ class SettingsApp:
 
         # Configure the settings window title and size
         self.root.title("Game Settings")
-        self.root.geometry("400x175")
+        self.root.geometry("400x315")
 
         # Build all widgets (labels, entries, checkbox, button)
         self._create_widgets()
@@ -43,7 +50,9 @@ class SettingsApp:
             validatecommand=val_int
         )
         # Initialize entry with the current map size from the GameWindow
-        self.map_size_var.set(str(self.gamewindow.mapSize))
+        # Endless worlds have no size to edit
+        mapSize = self.gamewindow.mapSize
+        self.map_size_var.set("endless" if mapSize is None else str(mapSize))
         self.map_size_entry.grid(
             row=0, column=1,
             padx=10, pady=(10, 5)
@@ -88,11 +97,131 @@ class SettingsApp:
         ).grid(
             row=2,
             column=0,
-            columnspan=2,
             padx=10, pady=5,
             sticky="w"
         )
 
+        # ─── Fog of War Checkbox ─────────────────────────────────────────────
+        # BooleanVar to track whether unexplored tiles are hidden
+        self.fog_var = tk.BooleanVar()
+        # Initialize checkbox from the GameWindow's current fog radius
+        self.fog_var.set(self.gamewindow.fogRadius is not None)
+        tk.Checkbutton(
+            self.root,
+            text="Fog of War",
+            variable=self.fog_var
+        ).grid(
+            row=2,
+            column=1,
+            padx=10, pady=5,
+            sticky="w"
+        )
+
+        # ─── Renderer Choice ─────────────────────────────────────────────────
+        # Label and drop-down to pick the ASCII label or the tile canvas
+        tk.Label(
+            self.root,
+            text="Renderer:",
+            anchor="w"
+        ).grid(
+            row=3, column=0,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # StringVar holding the selected renderer name
+        self.renderer_var = tk.StringVar()
+        # Initialize drop-down from the GameWindow's current renderer
+        self.renderer_var.set(self.gamewindow.rendererName)
+        tk.OptionMenu(
+            self.root,
+            self.renderer_var,
+            *RENDERERS
+        ).grid(
+            row=3, column=1,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # ─── Maze Algorithm Choice ───────────────────────────────────────────
+        # Label and drop-down to pick the maze carving algorithm
+        tk.Label(
+            self.root,
+            text="Maze Algorithm:",
+            anchor="w"
+        ).grid(
+            row=4, column=0,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # StringVar holding the selected algorithm name
+        self.algorithm_var = tk.StringVar()
+        # Initialize drop-down from the GameWindow's current algorithm
+        self.algorithm_var.set(self.gamewindow.algorithm)
+        tk.OptionMenu(
+            self.root,
+            self.algorithm_var,
+            *ALGORITHMS
+        ).grid(
+            row=4, column=1,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # ─── Goal Rooms Input ────────────────────────────────────────────────
+        # Label prompting for the number of goal rooms
+        tk.Label(
+            self.root,
+            text="Goal Rooms (integer):",
+            anchor="w"
+        ).grid(
+            row=5, column=0,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # Entry widget tied to a StringVar; only allows integer text
+        self.room_count_var = tk.StringVar()
+        self.room_count_entry = tk.Entry(
+            self.root,
+            textvariable=self.room_count_var,
+            validate="key",
+            validatecommand=val_int
+        )
+        # Initialize entry with the GameWindow's current room count
+        self.room_count_var.set(str(self.gamewindow.roomCount))
+        self.room_count_entry.grid(
+            row=5, column=1,
+            padx=10, pady=5
+        )
+
+        # ─── Objective Choice ────────────────────────────────────────────────
+        # Label and drop-down to pick how the goal rooms must be visited
+        tk.Label(
+            self.root,
+            text="Objective:",
+            anchor="w"
+        ).grid(
+            row=6, column=0,
+            sticky="w",
+            padx=10, pady=5
+        )
+
+        # StringVar holding the selected objective ("any", "all" or "ordered")
+        self.objective_var = tk.StringVar()
+        # Initialize drop-down from the GameWindow's current objective
+        self.objective_var.set(self.gamewindow.objective)
+        tk.OptionMenu(
+            self.root,
+            self.objective_var,
+            *OBJECTIVES
+        ).grid(
+            row=6, column=1,
+            sticky="w",
+            padx=10, pady=5
+        )
+
         # ─── Save Button ─────────────────────────────────────────────────────
         # When clicked, _on_save will read values and update the GameWindow
         self.save_button = tk.Button(
@@ -101,7 +230,7 @@ class SettingsApp:
             command=self._on_save
         )
         self.save_button.grid(
-            row=3, column=0,
+            row=7, column=0,
             columnspan=2,
             pady=(15, 10)
         )
@@ -134,28 +263,49 @@ class SettingsApp:
     def _on_save(self):
         """
         When the Save button is clicked, read the input values:
-        - Update the GameWindow's mapSize, connectionChance, and hardMode.
+        - Update the GameWindow's mapSize, connectionChance, hardMode, fog of
+          war, renderer, algorithm, goal room count and objective.
         - Call updateSettings on the GameWindow to apply changes.
-        - Print new settings to console for debugging.
+        - Report the new settings as a metrics event.
         - Close the settings window.
         """
         # Retrieve text from entry widgets
         map_size = self.map_size_var.get()
         hallway_chance = self.hallway_chance_var.get()
         hard_mode = self.hard_mode_var.get()
+        fog = self.fog_var.get()
+        renderer = self.renderer_var.get()
+        algorithm = self.algorithm_var.get()
+        room_count = self.room_count_var.get()
+        objective = self.objective_var.get()
 
         # Update the GameWindow's attributes
-        self.gamewindow.mapSize = int(map_size)
+        if self.gamewindow.mapSize is not None:
+            self.gamewindow.mapSize = int(map_size)
         self.gamewindow.connectionChance = float(hallway_chance)
         self.gamewindow.hardMode = bool(hard_mode)
+        self.gamewindow.fogRadius = FOG_RADIUS if fog else None
+        self.gamewindow.rendererName = renderer
+        self.gamewindow.algorithm = algorithm
+        # An empty or zero entry falls back to a single room
+        self.gamewindow.roomCount = max(1, int(room_count or 1))
+        self.gamewindow.objective = objective
 
         # Trigger the GameWindow to apply and regenerate with new settings
         self.gamewindow.updateSettings()
 
-        # Debug output to console
-        print(f"Map Size: {map_size}")
-        print(f"Connecting Hallways Chance: {hallway_chance}")
-        print(f"Hard Mode: {hard_mode}")
+        # Record the new settings (dropped unless a metrics sink is installed)
+        metrics.event(
+            "settings",
+            map_size=map_size,
+            hallway_chance=hallway_chance,
+            hard_mode=bool(hard_mode),
+            fog=bool(fog),
+            renderer=renderer,
+            algorithm=algorithm,
+            room_count=room_count,
+            objective=objective
+        )
 
         # Close the settings window
         self.root.destroy()
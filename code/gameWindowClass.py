@@ -1,40 +1,117 @@
 import tkinter as tk
+from collections import deque
 from gameSettingsWindow import SettingsApp
+from mapRenderer import RENDERERS
+from mapPrefetcher import settingsOf
+from botHarness import parSteps
+from leaderboard import RunRecord
+from sessionClass import SessionObserver
+from metrics import metrics
 
 
-class GameWindow:
+class GameWindow(SessionObserver):
     """
     Main window for the dungeon game. Displays:
       - A header text area (tileInfo) at the top
-      - The dungeon map (label) in the center
+      - The dungeon map (ASCII label or canvas renderer) in the center
       - Two buttons (“New Map” and “Settings”) centered at the bottom
     Handles window resizing when a new map is generated, and binds arrow keys
-    for player movement.
+    for player movement. Game rules live in the GameSession; this window only
+    forwards input to it and reacts to its events as an observer.
+
+    Key presses are queued rather than applied on the spot. Once per frame
+    (at most every FRAME_MS) all queued moves are applied in one pass and the
+    map is drawn once, so held keys cannot make the display fall behind.
+
+    With a DungeonStack the game is a descending run: reaching the goal
+    loads the next level instead of ending, and the timer keeps running
+    across levels. "New Map" starts a new run from level 0.
+
+    With a Leaderboard, every completed single-map run is recorded and a
+    side panel lists the best times on the current map and the player's
+    personal best for each map size.
     """
 
-    def __init__(self, map, root, timer):
-        # Reference to the dungeon map model (DungeonMap instance)
-        self.map = map
+    # Milliseconds between frames while input or redraws are pending
+    FRAME_MS = 16
+    # Most moves kept waiting for the next frame; keys pressed once the
+    # queue is full are ignored (the queued ones still play, in order) so
+    # key repeat cannot build up a backlog
+    MAX_QUEUED_MOVES = 8
+
+    # Runs listed on the leaderboard panel for the current map
+    LEADERBOARD_ROWS = 10
+
+    def __init__(self, session, root, timer, renderer: str = "label", prefetcher=None,
+                 stack=None, leaderboard=None):
+        # Headless game engine (GameSession) that owns the map and player
+        self.session = session
+        self.session.addObserver(self)
         # The root Tk window for the game display
         self.window = root
         # TimerApp instance used to start/stop the game timer
         self.timer = timer
+        # Optional MapPrefetcher that generates upcoming maps in the background
+        self.prefetcher = prefetcher
+        # Optional DungeonStack for descending-levels mode (None: single map)
+        self.stack = stack
+        # Set while the session moves down a level, so onReset keeps the timer
+        self._descending = False
+        # Optional Leaderboard that completed runs are recorded to; not used
+        # in descending mode, where the clock runs across levels
+        self.leaderboard = leaderboard if stack is None else None
+        # Shortest route for the current map's objective, worked out at the
+        # start of each run (see _cacheParSteps); -1 when not needed
+        self._parSteps = -1
 
         # Holds a reference to the settings window (Toplevel) when open
         self.settingsWindow = None
-        # Flag indicating whether the player has reached the Room (game over)
-        self.completed = False
         # Hard mode flag: if True, walking wipes out corridors behind the player
         self.hardMode = False
         # Default map size and connection chance reflect the current map model
         self.mapSize = self.map.size
         self.connectionChance = self.map.extra_connection_chance
+        # Name of the maze carving algorithm; see mazeAlgorithms.ALGORITHMS
+        self.algorithm = self.map.algorithm
+        # Number of goal rooms and how they must be visited; see mapClass.OBJECTIVES
+        self.roomCount = self.map.room_count
+        self.objective = self.map.objective
+        # Name of the map renderer ("label" or "canvas"); see mapRenderer.RENDERERS
+        self.rendererName = renderer
+        # Fog of war view radius in tiles, or None to show the whole map
+        self.fogRadius = self.map.fogRadius
+
+        # Moves waiting for the next frame, oldest first
+        self._pendingMoves = deque()
+        # Map cells changed since the last frame was drawn
+        self._dirtyCells = []
+        # Id of the scheduled frame callback, or None when idle
+        self._frameId = None
 
         # Initialize and lay out the Tk window
         self._setup_window()
         self._create_widgets()
         self._bind_events()
 
+        self._cacheParSteps()
+        self._refreshLeaderboard()
+
+        # Start generating the next maps while the first one is played
+        if self.stack is not None:
+            self.stack.prefetch(self.stack.depth + 1)
+        elif self.prefetcher is not None:
+            self.prefetcher.configure(*settingsOf(self.map))
+
+    @property
+    def map(self):
+        """The DungeonMap currently being played (owned by the session)."""
+        return self.session.map
+
+    @property
+    def completed(self) -> bool:
+        """Whether the player has reached the Room (game over)."""
+        return self.session.completed
+
     def _setup_window(self):
         """Configure window title and initial geometry."""
         self.window.title("Game Window")
@@ -45,7 +122,7 @@ class GameWindow:
         """
         Create and pack three main frames:
           1) top_frame: holds the tileInfo label (instructions/status)
-          2) middle_frame: holds the map display label
+          2) middle_frame: holds the map renderer widget
           3) bottom_frame: holds the “New Map” and “Settings” buttons, centered
         """
         # ─── Top Frame: Tile Info Label ───────────────────────────────────────
@@ -55,24 +132,31 @@ class GameWindow:
         # Label showing instructions or "Game Completed!" status
         self.tileInfo = tk.Label(
             top_frame,
-            text="Make your way to R as fast as possible to win!",
+            text=self._objectiveText(),
             font="TkFixedFont"
         )
         self.tileInfo.pack(pady=10)
 
+        # ─── Side Panel: Leaderboard ─────────────────────────────────────────
+        # Best times on this map and personal bests (only with a leaderboard)
+        self.leaderboardPanel = None
+        if self.leaderboard is not None:
+            self.leaderboardPanel = tk.Label(
+                self.window,
+                text="",
+                font="TkFixedFont",
+                justify=tk.LEFT,
+                anchor="n"
+            )
+            self.leaderboardPanel.pack(side=tk.RIGHT, fill=tk.Y, padx=10)
+
         # ─── Middle Frame: Map Display ───────────────────────────────────────
-        middle_frame = tk.Frame(self.window)
+        self.mapFrame = tk.Frame(self.window)
         # Expand in both directions to fill the available space
-        middle_frame.pack(expand=True, fill=tk.BOTH)
+        self.mapFrame.pack(expand=True, fill=tk.BOTH)
 
-        # Label that holds the ASCII representation of the map
-        self.label = tk.Label(
-            middle_frame,
-            text=self.map.printMap(),
-            font="TkFixedFont"
-        )
-        # Let this label expand to occupy middle_frame fully
-        self.label.pack(expand=True)
+        # Renderer that draws the map (ASCII label or tile canvas)
+        self.renderer = RENDERERS[self.rendererName](self.mapFrame, self.map)
 
         # ─── Bottom Frame: Centered Buttons ─────────────────────────────────
         bottom_frame = tk.Frame(self.window)
@@ -87,7 +171,9 @@ class GameWindow:
             bottom_frame,
             text="New Map",
             font="TkFixedFont",
-            command=self._regenerate
+            command=self._regenerate,
+            # A multiplayer server owns the map: nothing to regenerate or configure
+            state=tk.NORMAL if self.session.ownsMap else tk.DISABLED
         )
         self.regenerate.pack(side=tk.LEFT)
 
@@ -99,7 +185,8 @@ class GameWindow:
             bottom_frame,
             text="Settings",
             font="TkFixedFont",
-            command=self.toggleSettingsWindow
+            command=self.toggleSettingsWindow,
+            state=tk.NORMAL if self.session.ownsMap else tk.DISABLED
         )
         self.toggleSettings.pack(side=tk.LEFT)
 
@@ -109,73 +196,253 @@ class GameWindow:
 
     def _bind_events(self):
         """
-        Bind arrow keys to the player's move() method.
-        Passes self (GameWindow) as context so the player can call window.updateMap().
+        Bind arrow keys to queueMove(); moves reach the session on the next frame.
+        The session notifies this window (onMove/onComplete) to redraw.
         """
-        self.window.bind("<Up>",    lambda event: self.map.player.move(self, "up"))
-        self.window.bind("<Down>",  lambda event: self.map.player.move(self, "down"))
-        self.window.bind("<Left>",  lambda event: self.map.player.move(self, "left"))
-        self.window.bind("<Right>", lambda event: self.map.player.move(self, "right"))
+        self.window.bind("<Up>",    lambda event: self.queueMove("up"))
+        self.window.bind("<Down>",  lambda event: self.queueMove("down"))
+        self.window.bind("<Left>",  lambda event: self.queueMove("left"))
+        self.window.bind("<Right>", lambda event: self.queueMove("right"))
+        # Enter offers a new map once hard mode has made the run unwinnable
+        self.window.bind("<Return>", lambda event: self._regenerate() if self.session.stuck else None)
+        # Stop background map generation when the window is closed
+        self.window.protocol("WM_DELETE_WINDOW", self._onClose)
 
     def _regenerate(self):
         """
         Called when “New Map” is clicked or settings change.
-        1) Rebuild the map data (DungeonMap.regenerate())
-        2) Reassign the player to the new home location
-        3) Reset timer and completion flags
-        4) Update the ASCII map label and tileInfo text
-        5) Force a window resize to fit the new map dimensions
-        """
-        # Regenerate internal maze and room layout
-        self.map.regenerate()
-        # Place player at the new home in the new grid
-        self.map.assignPlayer(self.map.player)
-
-        # Reset timer state and completion flag
-        self.timer.seconds = 0
-        self.timer.timer_running = False
-        self.completed = False
-        # Update the timer display (e.g., show 00:00)
-        self.timer.update_timer()
-        # Mark that the player has not yet moved
-        self.map.player.hasMoved = False
-
-        # Refresh the map ASCII text and the instruction label
-        self.label.config(text=self.map.printMap())
-        self.tileInfo.config(text="Make your way to R as fast as possible to win!")
-
-        # Force geometry recalculation and resize window to fit content
+        Restarts the session (new map, player back home); the UI is refreshed
+        in onReset. With a prefetcher the new map is usually already generated,
+        so this only swaps it in; the prefetcher first drops its queue if the
+        settings changed.
+        """
+        if not self.session.ownsMap:
+            return
+        if self.stack is not None:
+            self.session.reset(self.stack.restart(settingsOf(self.map)))
+            return
+        if self.prefetcher is None:
+            self.session.reset()
+            return
+        self.prefetcher.configure(*settingsOf(self.map))
+        self.session.reset(self.prefetcher.take())
+
+    def _onClose(self):
+        """Stop the frame loop and prefetch workers, then close the game."""
+        if self._frameId is not None:
+            self.window.after_cancel(self._frameId)
+            self._frameId = None
+        if self.stack is not None:
+            self.stack.shutdown()
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        self.window.destroy()
+
+    # ─── Input Queue & Frames ────────────────────────────────────────────────
+
+    def queueMove(self, direction: str):
+        """
+        Queue a move for the next frame (called from the key bindings). The
+        move is ignored if MAX_QUEUED_MOVES are already waiting.
+        """
+        if len(self._pendingMoves) >= self.MAX_QUEUED_MOVES:
+            return
+        self._pendingMoves.append(direction)
+        self._scheduleFrame()
+
+    def _scheduleFrame(self):
+        """Make sure exactly one frame callback is pending."""
+        if self._frameId is None:
+            self._frameId = self.window.after(self.FRAME_MS, self._frame)
+
+    def _frame(self):
+        """
+        Apply every queued move, then draw all cells they changed at once.
+        Nothing is rescheduled, so an idle game runs no callbacks.
+        """
+        self._frameId = None
+        pending = self._pendingMoves
+        while pending:
+            self.session.move(pending.popleft())
+
+        if self._dirtyCells:
+            # Each cell once, in the order it changed
+            cells = list(dict.fromkeys(self._dirtyCells))
+            self._dirtyCells.clear()
+            self.updateMap(cells)
+
+    # ─── Session Observer Hooks ──────────────────────────────────────────────
+
+    def onStart(self, session):
+        """Start the timer on the first move of a run."""
+        self.timer.start_timer()
+
+    def onMove(self, session, old_location, new_location):
+        """
+        Mark the cells the player left and entered, plus any cells the move
+        revealed from the fog, for the next frame.
+        """
+        self._dirtyCells.append(old_location)
+        self._dirtyCells.append(new_location)
+        self._dirtyCells.extend(session.revealed)
+        self._scheduleFrame()
+
+    def onRoom(self, session, location):
+        """A goal room counted: show progress on multi-room maps."""
+        total = len(self.map.rooms)
+        if total > 1 and not session.completed:
+            self.tileInfo.config(text=f"Rooms reached: {session.roomsReached()}/{total}")
+
+    def onComplete(self, session):
+        """
+        Player reached the Room: stop the timer and announce it, or in
+        descending mode head down to the next level.
+        """
+        # Moves still queued can no longer be applied
+        self._pendingMoves.clear()
+        if self.stack is not None:
+            # Swap maps once the current move has finished
+            self.window.after(0, self._descend)
+            return
+        self.timer.stop_timer()
+        self.tileInfo.config(text="Game Completed!")
+        self._recordRun()
+
+    def onStuck(self, session):
+        """
+        Hard mode cut the player off from the goal: end the run right away
+        instead of leaving them to find out, and offer a new map.
+        """
+        self._pendingMoves.clear()
+        self.timer.stop_timer()
+        self.tileInfo.config(text="Cut off from the Room! Press Enter or New Map to try again.")
+
+    def _descend(self):
+        """Descending mode: continue the run on the next level of the stack."""
+        self._descending = True
+        try:
+            self.session.reset(self.stack.descend())
+        finally:
+            self._descending = False
+
+    def onReset(self, session):
+        """
+        After the session restarted on a new map:
+        1) Reset the timer (unless descending to the next level)
+        2) Redraw the map and reset the tileInfo text
+        3) Force a window resize to fit the new map dimensions
+        """
+        # Stop the timer and clear it back to 00:00.0; a descent keeps it running
+        if not self._descending:
+            self.timer.reset()
+        # Input and changes queued for the old map no longer apply
+        self._pendingMoves.clear()
+        self._dirtyCells.clear()
+        # Apply the fog setting (a changed one, or a pre-generated map that
+        # arrives without it)
+        if self.map.fogRadius != self.fogRadius:
+            if self.fogRadius is None:
+                self.map.disableFog()
+            else:
+                self.map.enableFog(self.fogRadius)
+
+        # Point the renderer at the (possibly new) map, redraw it whole and
+        # refresh the instruction label
+        self.renderer.map = self.map
+        with metrics.timed("render"):
+            self.renderer.redraw()
+        self.tileInfo.config(text=self._objectiveText())
+        self._cacheParSteps()
+        self._refreshLeaderboard()
+
+        # Resize the window to fit the new map dimensions
+        self._fitWindow()
+
+    def _objectiveText(self) -> str:
+        """Instruction line for the current map's objective."""
+        if self.map.size is None:
+            return "Endless mode: explore as far as you like!"
+        total = len(self.map.rooms)
+        if total <= 1 or self.map.objective == "any":
+            text = "Make your way to R as fast as possible to win!"
+        elif self.map.objective == "all":
+            text = f"Visit all {total} R rooms as fast as possible to win!"
+        else:
+            text = f"Visit the {total} R rooms in order as fast as possible to win!"
+        if self.stack is not None:
+            text = f"Level {self.stack.depth + 1}: " + text.replace("to win!", "to go down!")
+        return text
+
+    # ─── Leaderboard ─────────────────────────────────────────────────────────
+
+    def _recordRun(self):
+        """Queue the run just completed for the leaderboard and show it."""
+        if self.leaderboard is None or self.map.size is None:
+            return
+        run = RunRecord.fromSession(self.session, self.timer.elapsed(), self._parSteps)
+        self.leaderboard.record(run)
+        self._refreshLeaderboard()
+
+    def _cacheParSteps(self):
+        """
+        Work out the par for the leaderboard while the map is untouched:
+        hard mode wipes the route as it is walked, and rebuilding the map
+        when the run ends would stall the UI on large maps.
+        """
+        self._parSteps = -1
+        if self.leaderboard is not None and self.map.size is not None:
+            self._parSteps = parSteps(self.map)
+
+    def _refreshLeaderboard(self):
+        """Redraw the panel: top times on this map, then personal bests by size."""
+        if self.leaderboardPanel is None:
+            return
+        if self.map.size is None:
+            self.leaderboardPanel.config(text="")
+            return
+        current = RunRecord.fromSession(self.session, 0.0)
+        mode = " (hard)" if current.hard_mode else ""
+        lines = [f"Best on this map{mode}"]
+        top = self.leaderboard.topRuns(current, self.LEADERBOARD_ROWS)
+        for rank, run in enumerate(top, 1):
+            lines.append(f"{rank:>2}. {self.timer.format(run.time_ms / 1000)}"
+                         f" {run.player[:10]:<10} {run.moves:>5} moves")
+        if not top:
+            lines.append("    no runs yet")
+        lines.append("")
+        lines.append(f"Personal bests{mode}")
+        bests = self.leaderboard.personalBests(current.player, current.hard_mode)
+        for run in bests:
+            lines.append(f"{run.size:>4}x{run.size:<4} {self.timer.format(run.time_ms / 1000)}")
+        if not bests:
+            lines.append("    none yet")
+        self.leaderboardPanel.config(text="\n".join(lines))
+
+    def _fitWindow(self):
+        """Force geometry recalculation and resize the window to fit its content."""
         self.window.update_idletasks()
         req_w = self.window.winfo_reqwidth()
         req_h = self.window.winfo_reqheight()
         self.window.geometry(f"{req_w}x{req_h}")
 
-    def updateMap(self):
+    def updateMap(self, cells=()):
         """
-        Refresh the map label each time the player moves.
-        Checks if the current tile is a Room; if so, marks game as completed,
-        stops the timer, and updates the tileInfo to “Game Completed!”.
+        Refresh the map display after the player moves.
+        Only the given cells (every position the player left or entered this
+        frame) are redrawn; in hard mode the cells left are also the ones that
+        were wiped. Tk paints the result once the frame callback returns.
         """
-        # Update ASCII representation
-        self.label.config(text=self.map.printMap())
-
-        # Check the tile where the player now stands
-        x, y = self.map.player.location
-        current_tile = self.map.grid[y][x]
-        if current_tile.type == "Room":
-            # Player reached the target room
-            self.completed = True
-            self.timer.stop_timer()
-            self.tileInfo.config(text="Game Completed!")
-
-        # Ensure any pending UI changes are drawn
-        self.window.update_idletasks()
+        with metrics.timed("render"):
+            self.renderer.updateCells(cells)
 
     def toggleSettingsWindow(self):
         """
         Open or close the settings dialog (Toplevel).
         When opening, pass a reference to self so settings can modify mapSize, etc.
+        Not available when the map belongs to a multiplayer server.
         """
+        if not self.session.ownsMap:
+            return
         if self.settingsWindow is None or not self.settingsWindow.winfo_exists():
             # Create a new Toplevel window for settings
             self.settingsWindow = tk.Toplevel(self.window)
@@ -193,13 +460,43 @@ class GameWindow:
         Apply new settings from the SettingsApp:
           - Resize the DungeonMap (map.size)
           - Change the hallway-connection probability
+          - Switch the maze carving algorithm
+          - Change the number of goal rooms and the objective
           - Enable or disable hardMode on the player
+          - Turn fog of war on or off (applied in onReset)
+          - Swap the map renderer if a different one was chosen
         Then regenerate the map so changes take effect immediately.
         """
-        # Update map parameters from the SettingsApp variables
-        self.map.size = int(self.mapSize)
+        if not self.session.ownsMap:
+            return
+        # An endless world has no size or goals; only the player options apply
+        if self.map.size is None:
+            self.session.player.hardMode = self.hardMode
+            self.fogRadius = None
+            self._regenerate()
+            self._swapRenderer()
+            return
+
+        # Update map parameters from the SettingsApp variables; even sizes are
+        # rounded down once here, so the settings show the size actually played
+        size = int(self.mapSize)
+        if size % 2 == 0:
+            size -= 1
+        self.mapSize = size
+        self.map.size = size
         self.map.extra_connection_chance = float(self.connectionChance)
-        self.map.player.hardMode = self.hardMode
+        self.map.algorithm = self.algorithm
+        self.map.room_count = int(self.roomCount)
+        self.map.objective = self.objective
+        self.session.player.hardMode = self.hardMode
 
         # Recreate the map with new size/chance and player placement
         self._regenerate()
+        self._swapRenderer()
+
+    def _swapRenderer(self):
+        """Replace the renderer widget if the renderer choice changed."""
+        if not isinstance(self.renderer, RENDERERS[self.rendererName]):
+            self.renderer.destroy()
+            self.renderer = RENDERERS[self.rendererName](self.mapFrame, self.map)
+            self._fitWindow()
@@ -0,0 +1,256 @@
+from typing import Iterator, Union
+from roomClass import tile, TILE_FOR_CODE, CODE_FOR_TYPE
+
+# Translation tables that pull cell k (0-3) out of every 2-bit packed byte
+_PLANES = [bytes((b >> (2 * k)) & 3 for b in range(256)) for k in range(4)]
+# Translation tables that pull bit k (0-7) out of every byte of a bitset
+_BIT_PLANES = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+
+def packCells(cells: bytearray) -> bytes:
+    """
+    Pack one-byte tile codes (0-3) into 2 bits per cell, 4 cells per byte
+    with the first cell in the low bits. Works on whole buffers with
+    int/bytes operations that run in C.
+    """
+    padded = bytes(cells) + bytes(-len(cells) % 4)
+    length = len(padded) // 4
+    packed = 0
+    for k in range(4):
+        # Every byte of a plane is at most 3, so shifting the whole plane
+        # left by 2k bits never carries into the neighbouring byte
+        packed |= int.from_bytes(padded[k::4], "little") << (2 * k)
+    return packed.to_bytes(length, "little")
+
+
+def unpackCells(data: bytes, count: int) -> bytearray:
+    """
+    Expand 2-bit packed tile codes back into one byte per cell.
+    Returns the first `count` cells.
+    """
+    cells = bytearray(4 * len(data))
+    for k in range(4):
+        cells[k::4] = data.translate(_PLANES[k])
+    del cells[count:]
+    return cells
+
+
+def flatCells(grid) -> bytearray:
+    """
+    One byte per cell, row-major, for code that scans the whole grid. A
+    TileGrid hands out its own buffer, so later setCode() calls show up in
+    it; a PackedGrid is decoded into a copy that callers must keep in step
+    themselves.
+    """
+    if isinstance(grid, TileGrid):
+        return grid.cells
+    return unpackCells(bytes(grid.buffer[grid.offset:grid.offset + (grid.size * grid.size + 3) // 4]),
+                       grid.size * grid.size)
+
+
+class TileGrid:
+    """
+    Compact square grid of tile codes backed by a single bytearray.
+    Cells are stored row-major, so cell (x, y) lives at index y * size + x.
+    Indexing as grid[y][x] returns the shared flyweight tile for that cell,
+    which keeps code written against per-cell tile objects working.
+    """
+
+    def __init__(self, size: int, cells: bytearray = None):
+        # Width/height of the square grid
+        self.size = size
+        # One byte per cell holding an EMPTY/HOME/HALLWAY/ROOM code
+        self.cells = cells if cells is not None else bytearray(size * size)
+        if len(self.cells) != size * size:
+            raise ValueError("Cell buffer does not match the grid size.")
+
+    def code(self, x: int, y: int) -> int:
+        """
+        Return the integer tile code stored at column x, row y.
+        """
+        return self.cells[y * self.size + x]
+
+    def setCode(self, x: int, y: int, code: int):
+        """
+        Store an integer tile code at column x, row y.
+        """
+        self.cells[y * self.size + x] = code
+
+    def tileAt(self, x: int, y: int) -> tile:
+        """
+        Return the flyweight tile object for column x, row y.
+        """
+        return TILE_FOR_CODE[self.cells[y * self.size + x]]
+
+    def rowCodes(self, y: int, start: int = 0, stop: int = None) -> bytes:
+        """
+        Return the tile codes of row y between columns start and stop.
+        """
+        base = y * self.size
+        stop = self.size if stop is None else stop
+        return bytes(self.cells[base + start:base + stop])
+
+    def __getitem__(self, y: int) -> "_GridRow":
+        if not 0 <= y < self.size:
+            raise IndexError("Grid row out of range.")
+        return _GridRow(self, y)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator["_GridRow"]:
+        for y in range(self.size):
+            yield _GridRow(self, y)
+
+
+class PackedGrid:
+    """
+    Read/write view of tile codes stored 2 bits per cell in an external
+    buffer, typically a memory-mapped map file (see mapStorage.loadMap).
+    Cells are decoded on demand, so only the parts of the map that are
+    actually looked at are ever paged in. Offers the same access methods
+    as TileGrid, but has no one-byte-per-cell `cells` buffer.
+    """
+
+    def __init__(self, size: int, buffer, offset: int = 0):
+        # Width/height of the square grid
+        self.size = size
+        # Buffer holding the packed cells (bytearray, mmap, ...)
+        self.buffer = buffer
+        # Byte offset of the first packed cell inside the buffer
+        self.offset = offset
+        if len(buffer) - offset < (size * size + 3) // 4:
+            raise ValueError("Cell buffer does not match the grid size.")
+
+    def code(self, x: int, y: int) -> int:
+        """
+        Return the integer tile code stored at column x, row y.
+        """
+        k = y * self.size + x
+        return (self.buffer[self.offset + (k >> 2)] >> ((k & 3) << 1)) & 3
+
+    def setCode(self, x: int, y: int, code: int):
+        """
+        Store an integer tile code at column x, row y.
+        """
+        k = y * self.size + x
+        i = self.offset + (k >> 2)
+        shift = (k & 3) << 1
+        self.buffer[i] = (self.buffer[i] & ~(3 << shift) & 0xFF) | (code << shift)
+
+    def tileAt(self, x: int, y: int) -> tile:
+        """
+        Return the flyweight tile object for column x, row y.
+        """
+        return TILE_FOR_CODE[self.code(x, y)]
+
+    def rowCodes(self, y: int, start: int = 0, stop: int = None) -> bytes:
+        """
+        Return the tile codes of row y between columns start and stop,
+        decoding only the packed bytes that cover that range.
+        """
+        stop = self.size if stop is None else stop
+        first = y * self.size + start
+        last = y * self.size + stop
+        lo, hi = first >> 2, (last + 3) >> 2
+        packed = bytes(self.buffer[self.offset + lo:self.offset + hi])
+        skip = first - 4 * lo
+        return bytes(unpackCells(packed, skip + stop - start)[skip:])
+
+    def __getitem__(self, y: int) -> "_GridRow":
+        if not 0 <= y < self.size:
+            raise IndexError("Grid row out of range.")
+        return _GridRow(self, y)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator["_GridRow"]:
+        for y in range(self.size):
+            yield _GridRow(self, y)
+
+
+class BitGrid:
+    """
+    One bit per cell of a square grid, e.g. the cells a player has explored.
+    Every row starts on a byte boundary (`stride` bytes per row, lowest bit
+    first), so whole rows can be expanded with bytes.translate.
+    """
+
+    def __init__(self, size: int):
+        # Width/height of the square grid
+        self.size = size
+        # Bytes per row
+        self.stride = (size + 7) // 8
+        # The bits themselves, all clear
+        self.bits = bytearray(self.stride * size)
+
+    def get(self, x: int, y: int) -> bool:
+        """
+        Return whether the bit for column x, row y is set.
+        """
+        return bool(self.bits[y * self.stride + (x >> 3)] & (1 << (x & 7)))
+
+    def set(self, x: int, y: int) -> bool:
+        """
+        Set the bit for column x, row y. Returns True if it was clear before.
+        """
+        i = y * self.stride + (x >> 3)
+        mask = 1 << (x & 7)
+        if self.bits[i] & mask:
+            return False
+        self.bits[i] |= mask
+        return True
+
+    def clear(self):
+        """
+        Clear every bit.
+        """
+        self.bits = bytearray(len(self.bits))
+
+    def rowBits(self, y: int, start: int = 0, stop: int = None) -> bytes:
+        """
+        Return the bits of row y between columns start and stop as one byte
+        (0 or 1) per cell.
+        """
+        stop = self.size if stop is None else stop
+        base = y * self.stride
+        data = bytes(self.bits[base + (start >> 3):base + ((stop + 7) >> 3)])
+        cells = bytearray(8 * len(data))
+        for k in range(8):
+            cells[k::8] = data.translate(_BIT_PLANES[k])
+        skip = start & 7
+        return bytes(cells[skip:skip + stop - start])
+
+
+class _GridRow:
+    """
+    Lightweight view of one grid row, created on demand by grid[y].
+    Reading a cell returns a flyweight tile; writing accepts a tile or a code.
+    """
+
+    __slots__ = ("grid", "y")
+
+    def __init__(self, grid, y: int):
+        self.grid = grid
+        self.y = y
+
+    def __getitem__(self, x: int) -> tile:
+        if not 0 <= x < self.grid.size:
+            raise IndexError("Grid column out of range.")
+        return TILE_FOR_CODE[self.grid.code(x, self.y)]
+
+    def __setitem__(self, x: int, value: Union[tile, int]):
+        if not 0 <= x < self.grid.size:
+            raise IndexError("Grid column out of range.")
+        # Accept either a tile instance or a raw tile code
+        if isinstance(value, tile):
+            value = CODE_FOR_TYPE[value.type]
+        self.grid.setCode(x, self.y, value)
+
+    def __len__(self) -> int:
+        return self.grid.size
+
+    def __iter__(self) -> Iterator[tile]:
+        for code in self.grid.rowCodes(self.y):
+            yield TILE_FOR_CODE[code]
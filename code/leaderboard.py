@@ -0,0 +1,246 @@
+import getpass
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, NamedTuple, Optional
+from metrics import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    room_chance REAL NOT NULL,
+    extra_connection_chance REAL NOT NULL,
+    algorithm TEXT NOT NULL,
+    room_count INTEGER NOT NULL,
+    objective TEXT NOT NULL,
+    hard_mode INTEGER NOT NULL,
+    time_ms INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    optimal INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+-- "Top N on this seed": equality on the first three columns, then the
+-- rows come out already sorted by time, so LIMIT stops after N
+CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed, size, hard_mode, time_ms);
+-- "Personal best per size": one index seek per (player, mode, size)
+CREATE INDEX IF NOT EXISTS runs_by_player_mode ON runs (player, hard_mode, size, time_ms);
+"""
+
+_COLUMNS = ("player, seed, size, room_chance, extra_connection_chance, algorithm, room_count, "
+            "objective, hard_mode, time_ms, moves, optimal, finished_at")
+
+
+class RunRecord(NamedTuple):
+    """One finished run, as stored in the leaderboard."""
+    player: str
+    seed: int
+    size: int
+    room_chance: float
+    extra_connection_chance: float
+    algorithm: str
+    room_count: int
+    objective: str
+    hard_mode: bool
+    # Time on the clock in milliseconds
+    time_ms: int
+    # Moves tried, including blocked ones (session.ticks)
+    moves: int
+    # Shortest route for the map's objective (botHarness.parSteps), -1 if unknown
+    optimal: int
+    # Unix time the run finished
+    finished_at: float
+
+    @classmethod
+    def fromSession(cls, session, seconds: float, optimal: int = -1,
+                    player: str = None) -> "RunRecord":
+        """Record for the run `session` just completed in `seconds`."""
+        dungeon_map = session.map
+        return cls(
+            player or defaultPlayer(), dungeon_map.seed, dungeon_map.size,
+            dungeon_map.room_chance, dungeon_map.extra_connection_chance,
+            dungeon_map.algorithm, dungeon_map.room_count, dungeon_map.objective,
+            bool(session.player.hardMode), round(seconds * 1000), session.ticks,
+            optimal, time.time()
+        )
+
+    def sameMap(self, other: "RunRecord") -> bool:
+        """Whether both runs were played on the same map in the same mode."""
+        return (self.seed, self.size, self.room_chance, self.extra_connection_chance,
+                self.algorithm, self.room_count, self.objective, self.hard_mode) == (
+                other.seed, other.size, other.room_chance, other.extra_connection_chance,
+                other.algorithm, other.room_count, other.objective, other.hard_mode)
+
+
+def defaultPlayer() -> str:
+    """Name runs are stored under when none is given: the login name."""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "player"
+
+
+class Leaderboard:
+    """
+    Finished runs persisted to a local SQLite database.
+
+    record() never touches the disk on the caller's thread: runs are queued
+    and a background writer commits them in batches (up to `batch_size` per
+    transaction, at most `flush_interval` seconds after they were queued).
+    Queries see queued runs straight away, so a run shows up on the board
+    as soon as it is recorded: the writer commits a batch and drops it from
+    the queued runs under the same lock queries hold, so no run is seen
+    twice or missed. The two indexes in _SCHEMA keep both queries
+    down to index seeks, so they stay in milliseconds however many runs are
+    stored. Queries are meant for one thread (the UI); record() may be
+    called from any.
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 1.0):
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # Connection used for queries; WAL lets them run while the writer commits
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+        # Runs queued but not yet committed, oldest first (read by queries)
+        self._unwritten: List[RunRecord] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[RunRecord]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writeLoop, name="leaderboard-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    # ─── Writing ─────────────────────────────────────────────────────────────
+
+    def record(self, run: RunRecord):
+        """Queue a finished run for the background writer."""
+        if self._queue is None:
+            raise ValueError("The leaderboard is closed.")
+        # No lock needed (so no waiting for a commit): list.append is atomic,
+        # and the writer only ever removes committed runs from the front
+        self._unwritten.append(run)
+        self._queue.put(run)
+
+    def flush(self):
+        """Block until every queued run is committed."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self):
+        """Commit what is queued, stop the writer and close the database."""
+        if self._queue is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._queue = None
+        self._db.close()
+
+    def _writeLoop(self):
+        """Writer thread: gather runs into batches and commit each in one transaction."""
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA synchronous=NORMAL")
+        insert = f"INSERT INTO runs ({_COLUMNS}) VALUES ({', '.join('?' * 13)})"
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                closing = True
+                runs = batch[:-1]
+            else:
+                runs = batch
+            if runs:
+                with metrics.timed("leaderboard_write"), self._lock:
+                    with db:
+                        db.executemany(insert, runs)
+                    del self._unwritten[:len(runs)]
+            for _ in batch:
+                self._queue.task_done()
+        db.close()
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def topRuns(self, like: RunRecord, limit: int = 10) -> List[RunRecord]:
+        """
+        The `limit` fastest runs on the map `like` was played on (same seed,
+        settings and mode), fastest first.
+        """
+        with metrics.timed("leaderboard_query"), self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM runs"
+                " WHERE seed = ? AND size = ? AND hard_mode = ?"
+                " AND room_chance = ? AND extra_connection_chance = ? AND algorithm = ?"
+                " AND room_count = ? AND objective = ?"
+                " ORDER BY time_ms, id LIMIT ?",
+                (like.seed, like.size, int(like.hard_mode), like.room_chance,
+                 like.extra_connection_chance, like.algorithm, like.room_count,
+                 like.objective, limit)
+            ).fetchall()
+            runs = [self._fromRow(row) for row in rows]
+            runs.extend(run for run in self._unwritten if run.sameMap(like))
+        runs.sort(key=lambda run: run.time_ms)
+        return runs[:limit]
+
+    def personalBests(self, player: str = None, hard_mode: bool = False) -> List[RunRecord]:
+        """
+        `player`'s fastest run on each map size they have finished in the
+        given mode, by size (hard-mode times are not comparable with normal
+        ones). Sizes are found by skipping through the player index (one
+        seek per size) rather than grouping every run.
+        """
+        player = player or defaultPlayer()
+        hard_mode = bool(hard_mode)
+        with metrics.timed("leaderboard_query"), self._lock:
+            rows = self._db.execute(
+                "WITH RECURSIVE sizes(size) AS ("
+                "  SELECT MIN(size) FROM runs WHERE player = ?1 AND hard_mode = ?2"
+                "  UNION ALL"
+                "  SELECT (SELECT MIN(size) FROM runs"
+                "          WHERE player = ?1 AND hard_mode = ?2 AND size > sizes.size)"
+                "  FROM sizes WHERE sizes.size IS NOT NULL"
+                ")"
+                f" SELECT {_COLUMNS} FROM runs WHERE id IN ("
+                "  SELECT (SELECT id FROM runs"
+                "          WHERE player = ?1 AND hard_mode = ?2 AND size = sizes.size"
+                "          ORDER BY time_ms, id LIMIT 1)"
+                "  FROM sizes WHERE sizes.size IS NOT NULL"
+                ")",
+                (player, int(hard_mode))
+            ).fetchall()
+            best = {}
+            for run in [self._fromRow(row) for row in rows]:
+                best[run.size] = run
+            for run in self._unwritten:
+                if (run.player == player and run.hard_mode == hard_mode
+                        and (run.size not in best or run.time_ms < best[run.size].time_ms)):
+                    best[run.size] = run
+        return [best[size] for size in sorted(best)]
+
+    def count(self) -> int:
+        """Number of stored runs (queued ones included)."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] + len(self._unwritten)
+
+    @staticmethod
+    def _fromRow(row) -> RunRecord:
+        values = list(row)
+        values[8] = bool(values[8])
+        return RunRecord(*values)
@@ -0,0 +1,112 @@
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Tuple
+from mapPrefetcher import generatePacked
+
+
+def mapSeeds(seed: int, count: int) -> Iterator[int]:
+    """
+    Per-map seeds for a batch: the same base seed always yields the same
+    sequence, so map i of a batch can be regenerated on its own from
+    (settings, seeds[i]).
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.getrandbits(32)
+
+
+def _generateChunk(settings: tuple, first: int, seeds: List[int]) -> List[Tuple[int, int, bytes]]:
+    """
+    Worker task: generate a run of consecutive maps and return
+    (index, seed, packed map) for each. Chunking keeps inter-process
+    overhead low for small, fast maps.
+    """
+    return [(first + i, seed, generatePacked(seed, *settings)) for i, seed in enumerate(seeds)]
+
+
+def generate_many(
+    count: int,
+    size: int,
+    room_chance: float = 0.4,
+    extra_connection_chance: float = 0.05,
+    seed: int = None,
+    algorithm: str = "dfs",
+    use_numpy: bool = False,
+    room_count: int = 1,
+    objective: str = "any",
+    workers: int = None,
+    chunksize: int = None,
+    ordered: bool = False
+) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Generate `count` maps across a process pool and yield them one by one as
+    (index, seed, packed map) tuples. Packed maps are in the mapStorage
+    format; use mapStorage.loadsMap to turn one back into a DungeonMap.
+
+    Per-map seeds come from mapSeeds(seed, count), so a batch is fully
+    reproducible. Only about two tasks per worker are in flight at any time,
+    so memory use does not grow with `count`. Maps are yielded as soon as they
+    finish (ordered=False), or in index order (ordered=True, which may hold a
+    few finished maps back until earlier ones arrive).
+    """
+    if count < 0:
+        raise ValueError("Map count cannot be negative.")
+    seed = seed if seed is not None else random.getrandbits(32)
+    workers = workers or os.cpu_count() or 1
+    # Enough maps per task to hide process overhead, while still handing
+    # every worker several tasks
+    if chunksize is None:
+        chunksize = max(1, min(64, count // (workers * 8)))
+    settings = (size, room_chance, extra_connection_chance, algorithm, use_numpy, room_count, objective)
+    window = 2 * workers
+
+    seeds = mapSeeds(seed, count)
+    next_index = 0
+    # Finished results waiting for earlier indices (ordered mode only)
+    held: Dict[int, Tuple[int, int, bytes]] = {}
+    next_to_yield = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while pending or next_index < count:
+            # Top up the in-flight window
+            while next_index < count and len(pending) + len(held) // chunksize < window:
+                chunk = [next(seeds) for _ in range(min(chunksize, count - next_index))]
+                pending.add(executor.submit(_generateChunk, settings, next_index, chunk))
+                next_index += len(chunk)
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    if not ordered:
+                        yield result
+                    else:
+                        held[result[0]] = result
+            while next_to_yield in held:
+                yield held.pop(next_to_yield)
+                next_to_yield += 1
+
+
+def benchmarkBatch(count: int = 200, size: int = 101) -> Dict[int, float]:
+    """
+    Time generate_many for 1, 2, 4, ... workers up to the number of CPUs
+    and return maps per second for each worker count.
+    """
+    results = {}
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        for _ in generate_many(count, size, seed=1, workers=workers):
+            pass
+        results[workers] = count / (time.perf_counter() - start)
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(workers * 2, os.cpu_count() or 1)
+    return results
+
+
+if __name__ == "__main__":
+    for workers, rate in benchmarkBatch().items():
+        print(f"{workers:3} workers {rate:8.1f} maps/s")
@@ -1,6 +1,163 @@
 import random
-from typing import List, Tuple
-from roomClass import tile, Hallway, Empty, Home, Room 
+from functools import lru_cache
+from itertools import compress
+from typing import Dict, List, Set, Tuple
+from roomClass import EMPTY, HOME, HALLWAY, ROOM
+from gridClass import TileGrid, BitGrid
+from mazeAlgorithms import ALGORITHMS
+from distanceField import DistanceField
+from roomIndex import RoomIndex
+from metrics import metrics
+
+# NumPy is optional; it only powers the vectorized post-processing path
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ASCII symbol for each tile code, indexed by EMPTY/HOME/HALLWAY/ROOM
+CELL_SYMBOLS = ('  ', 'H ', '. ', 'R ')
+# Symbols for the player and for other players (multiplayer)
+PLAYER_SYMBOL = '█ '
+OTHER_SYMBOL = 'o '
+# Symbol for cells hidden by fog of war
+FOG_SYMBOL = '░ '
+# Symbols indexed by "visible code": tile code, plus 4 for unexplored cells
+VISIBLE_SYMBOLS = CELL_SYMBOLS + (FOG_SYMBOL,) * 4
+# Translation table from an explored bit (0/1) to the visible-code offset (4/0)
+_FOG_OFFSET = bytes([4, 0]) + bytes(254)
+# Goal modes for maps with several rooms: reach any one room, visit all of
+# them in any order, or visit them in order as checkpoints
+OBJECTIVES = ("any", "all", "ordered")
+# Translation table that turns leftover room candidates (3) back into walls (0)
+_CLEAR_CANDIDATES = bytes(EMPTY if code == ROOM else code for code in range(256))
+# translate() tables for the whole-grid passes in generate(): 1 where a cell
+# is open (Home/Hallway; or any non-Empty), is a Hallway, holds exactly 1,
+# or is Empty
+_OPEN_PASSAGE = bytes(1 if code in (HOME, HALLWAY) else 0 for code in range(256))
+_NOT_EMPTY = bytes(0 if code == EMPTY else 1 for code in range(256))
+_IS_HALLWAY = bytes(1 if code == HALLWAY else 0 for code in range(256))
+_IS_ONE = bytes(1 if value == 1 else 0 for value in range(256))
+_IS_EMPTY = bytes(1 if code == EMPTY else 0 for code in range(256))
+
+
+# ─── Whole-Grid Passes ──────────────────────────────────────────────────────
+# generate() finds dead ends and extra-connection candidates with big-int
+# arithmetic over the whole grid instead of a Python loop per cell. The grid
+# is first copied with one zero byte after every row (width n + 1), so
+# shifting by one byte never wraps a row into the next; shifting by a row
+# width moves every cell up or down. Per-byte sums stay at most 4, so adding
+# shifted grids never carries between cells.
+
+def _rowPadded(cells: bytearray, n: int) -> bytearray:
+    """Row-major copy of an n x n grid with a zero byte after every row."""
+    width = n + 1
+    padded = bytearray(width * n)
+    for r in range(n):
+        padded[r * width:r * width + n] = cells[r * n:(r + 1) * n]
+    return padded
+
+
+def _deadEndFlags(padded: bytearray, width: int) -> int:
+    """1 per Hallway byte with exactly one Home/Hallway neighbour."""
+    length = len(padded)
+    passages = int.from_bytes(padded.translate(_OPEN_PASSAGE), "little")
+    counts = ((passages << 8) + (passages >> 8)
+              + (passages << 8 * width) + (passages >> 8 * width)) & ((1 << 8 * length) - 1)
+    single = counts.to_bytes(length, "little").translate(_IS_ONE)
+    return int.from_bytes(single, "little") & int.from_bytes(padded.translate(_IS_HALLWAY), "little")
+
+
+def _extraCandidateFlags(padded: bytearray, width: int) -> int:
+    """1 per Empty byte whose east or south neighbour is not Empty."""
+    open_cells = int.from_bytes(padded.translate(_NOT_EMPTY), "little")
+    walls = int.from_bytes(padded.translate(_IS_EMPTY), "little")
+    return walls & ((open_cells >> 8) | (open_cells >> 8 * width))
+
+
+def _flagged(padded: bytearray, n: int, flags, interior: bool = False) -> List[int]:
+    """
+    Row-major indices into the unpadded n x n grid of the cells that
+    flags(padded, width) marks with 1; with interior=True the outer ring
+    of cells is left out.
+    """
+    width = n + 1
+    marks = bytearray(flags(padded, width).to_bytes(len(padded), "little"))
+    # Drop the padding byte after every row, back to n x n
+    del marks[n::width]
+    if interior:
+        marks[:n] = bytes(n)
+        marks[-n:] = bytes(n)
+        marks[::n] = bytes(n)
+        marks[n - 1::n] = bytes(n)
+    # compress() walks the marks in C and keeps the indices of non-zero bytes
+    return list(compress(range(n * n), marks))
+
+
+@lru_cache(maxsize=None)
+def _fogOffsets(radius: int) -> Tuple[Tuple[Tuple[int, int], ...], Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]]:
+    """
+    Offsets (dx, dy) of the disk of the given radius, plus, for each single
+    step, the offsets of the cells that enter the disk when its centre moves
+    by that step. Moving one tile therefore only looks at about 2r+1 cells.
+    """
+    disk = tuple(
+        (dx, dy)
+        for dy in range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1)
+        if dx * dx + dy * dy <= radius * radius
+    )
+    inside = set(disk)
+    entering = {
+        (sx, sy): tuple((dx, dy) for dx, dy in disk if (dx + sx, dy + sy) not in inside)
+        for sx, sy in ((0, -1), (0, 1), (-1, 0), (1, 0))
+    }
+    return disk, entering
+
+
+def reconnectCarvedCells(grid, carved: List[int], cleared: Set[int]):
+    """
+    An extra connection carved only between room candidates (common with
+    the algorithms that leave dead ends side by side) loses every open
+    neighbour when the unchosen candidates are walled up, leaving corridor
+    cells nobody can reach. For each such group of `carved` cells (flat
+    indices), one of the `cleared` candidates next to it is reopened as a
+    Hallway: its own neighbour in the maze is an original corridor, so that
+    reconnects the group. Only the carved cells are looked at, and maps
+    without such groups (e.g. every DFS map) are left exactly as they were.
+    Works on any grid with code()/setCode() (TileGrid or PackedGrid).
+    """
+    n = grid.size
+    members = set(carved)
+    seen = set()
+    for start in carved:
+        if start in seen:
+            continue
+        # Collect the group of carved cells around `start`, whether any
+        # open cell outside it touches it, and the cleared candidates it touches
+        group = [start]
+        seen.add(start)
+        attached = False
+        walled = []
+        for k in group:
+            row, col = divmod(k, n)
+            for v in ((k - n) if row > 0 else -1, (k + n) if row < n - 1 else -1,
+                      (k - 1) if col > 0 else -1, (k + 1) if col < n - 1 else -1):
+                if v < 0:
+                    continue
+                if v in members:
+                    if v not in seen:
+                        seen.add(v)
+                        group.append(v)
+                elif grid.code(v % n, v // n) != EMPTY:
+                    attached = True
+                elif v in cleared:
+                    walled.append(v)
+        if not attached and walled:
+            # Carving only joins open cells, so a cut-off group always
+            # touches a cleared candidate; reopening any one of them will do
+            cleared.discard(walled[0])
+            grid.setCode(walled[0] % n, walled[0] // n, HALLWAY)
 
 
 class DungeonMap:
@@ -13,7 +170,13 @@ class DungeonMap:
         self,
         size: int,
         room_chance: float = 0.4,
-        extra_connection_chance: float = 0.05
+        extra_connection_chance: float = 0.05,
+        seed: int = None,
+        grid: TileGrid = None,
+        use_numpy: bool = False,
+        algorithm: str = "dfs",
+        room_count: int = 1,
+        objective: str = "any"
     ):
         # Validate inputs
         if size < 5:
@@ -22,86 +185,120 @@ class DungeonMap:
             raise ValueError("Room chance must be between 0 and 1.")
         if not (0.0 <= extra_connection_chance <= 1.0):
             raise ValueError("Extra connection chance must be between 0 and 1.")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown maze algorithm: {algorithm}.")
+        if room_count < 1:
+            raise ValueError("A map needs at least one room.")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}.")
+        if use_numpy and np is None:
+            raise ImportError("use_numpy=True requires NumPy to be installed.")
 
         # Ensure size is odd so the maze algorithm works correctly
-        if size % 2 == 0:
+        # (a ready-made grid, e.g. from mapStorage, keeps its own size)
+        if grid is not None:
+            size = grid.size
+        elif size % 2 == 0:
             size -= 1
 
         # Placeholder for player; assigned later
         self.player = None
+        # Locations of other players sharing this map (multiplayer clients),
+        # keyed by player id; drawn but never moved by this process
+        self.others: Dict[int, Tuple[int, int]] = {}
+
+        # Cached ASCII render: one line per grid row plus the two borders.
+        # Rows listed in _dirtyRows are rebuilt on the next printMap call.
+        self._renderLines: List[str] = None
+        self._dirtyRows = set()
+        # BFS distances to the Room; built on first use by distanceField()
+        self._distanceField: DistanceField = None
+        # Flat indices of the corridors carved by the extra-connection pass
+        # of the latest generate(), checked by buildRooms
+        self._extraCells: List[int] = []
+        # Fog of war: view radius in tiles (None = whole map visible) and the
+        # cells the player has seen so far; see enableFog()
+        self.fogRadius: int = None
+        self.explored: BitGrid = None
 
         # Dimensions of the grid
         self.size = size
-        # grid will store integer codes for cell types during generation:
-        #   0 = unvisited/wall, 1 = home, 2 = corridor, 3 = potential room
-        self.grid: List[List[int]] = [[0] * size for _ in range(size)]
+        # Probabilities for placing rooms at dead-ends and adding extra corridor connections
+        self.room_chance = room_chance
+        self.extra_connection_chance = extra_connection_chance
+
+        # Seed of the per-map random generator; the same seed and settings
+        # always produce the same map. A fresh seed is drawn if none is given.
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        # If True, dead-end detection and extra connections run vectorized in
+        # NumPy (different random draws, so seeds only reproduce within a mode)
+        self.use_numpy = use_numpy
+        # Name of the maze carving algorithm (key of mazeAlgorithms.ALGORITHMS)
+        self.algorithm = algorithm
 
         # Define 'home' at the center of the grid
         self.home = (size // 2, size // 2)
+        # Number of goal rooms to place, and how they must be visited (OBJECTIVES)
+        self.room_count = room_count
+        self.objective = objective
+        # (x, y) of every goal room, in checkpoint order; set by buildRooms.
+        # `room` is the first one (the only one in a classic single-room map).
+        self.rooms: List[Tuple[int, int]] = []
+        self.room = None
+        # Spatial index over `rooms` for O(1) "is this a room" checks and
+        # nearest-room queries
+        self.roomIndex = RoomIndex()
+
+        if grid is not None:
+            # Use an already generated grid as-is (e.g. loaded from disk);
+            # the caller is responsible for setting home/room
+            self.grid = grid
+            return
+
+        # grid stores one byte per cell (see TileGrid). During generation the codes are:
+        #   0 = unvisited/wall, 1 = home, 2 = corridor, 3 = potential room
+        # After buildRooms only the chosen room keeps code 3.
+        self.grid = TileGrid(size)
         # Mark the home cell with integer code 1
-        self.grid[self.home[0]][self.home[1]] = 1
+        self.grid.setCode(self.home[1], self.home[0], HOME)
 
-        # Probabilities for placing rooms at dead-ends and adding extra corridor connections
-        self.room_chance = room_chance
-        self.extra_connection_chance = extra_connection_chance
+        with metrics.timed("generation"):
+            # Generate the maze and mark potential room locations
+            self.generate()
+            # Pick the final room and clear the remaining room candidates
+            self.grid = self.buildRooms()
 
-        # Generate the maze and mark potential room locations
-        self.generate()
-        # Convert the integer grid into tile objects (Empty, Home, Hallway, Room)
-        self.grid = self.buildRooms()
-
-    def generate(self) -> List[List[int]]:
-        """
-        Carve out a maze using a depth-first search (DFS) approach, starting from 'home'.
-        Walls are represented by 0, corridors by 2, and dead-end cells flagged for rooms by 3.
-        """
-        # Possible directions: two steps away in each cardinal direction
-        dirs = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-        # Use a stack for DFS; start from the home cell
-        stack: List[Tuple[int, int]] = [self.home]
-
-        while stack:
-            x, y = stack[-1]
-            neighbors: List[Tuple[int, int]] = []
-
-            # Check each direction for unvisited cells (value 0)
-            for dx, dy in dirs:
-                nx, ny = x + dx, y + dy
-                if self._inBounds(nx, ny) and self.grid[nx][ny] == 0:
-                    neighbors.append((nx, ny))
-
-            if neighbors:
-                # Choose a random neighbor to carve into
-                nx, ny = random.choice(neighbors)
-                # Carve through the wall one step between current and neighbor
-                wall_x, wall_y = (x + nx) // 2, (y + ny) // 2
-                self.grid[wall_x][wall_y] = 2  # Mark corridor
-                self.grid[nx][ny] = 2         # Mark corridor
-                # Push the neighbor onto the stack to continue carving
-                stack.append((nx, ny))
-            else:
-                # No unvisited neighbors: backtrack
-                stack.pop()
-
-        # After the maze is complete, identify dead-end cells
-        dead_ends: List[Tuple[int, int]] = []
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.grid[i][j] == 2:
-                    # Count adjacent passages or home to see if this cell is a dead-end
-                    count_adjacent_passages = 0
-                    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                        ni, nj = i + dx, j + dy
-                        if self._inBounds(ni, nj) and self.grid[ni][nj] in (1, 2):
-                            count_adjacent_passages += 1
-                    # Dead-end if exactly one adjacent corridor or home
-                    if count_adjacent_passages == 1:
-                        dead_ends.append((i, j))
+    def generate(self) -> TileGrid:
+        """
+        Carve out a maze with the configured algorithm (depth-first search by default),
+        starting from 'home'. Walls are represented by 0, corridors by 2, and dead-end
+        cells flagged for rooms by 3.
+        """
+        # Flat cell buffer: generation coordinate (x, y) lives at x * n + y
+        n = self.size
+        cells = self.grid.cells
+        rng = self.rng
+        self._extraCells = []
+
+        # Carve the maze with the selected algorithm (see mazeAlgorithms)
+        ALGORITHMS[self.algorithm](cells, n, self.home, rng)
+
+        if self.use_numpy:
+            # Same post-processing as below, done with whole-array operations
+            self._postProcessNumpy()
+            return self.grid
+
+        # After the maze is complete, identify dead-end cells: Hallways with
+        # exactly one neighbouring Hallway or Home, listed row by row
+        dead_ends = _flagged(_rowPadded(cells, n), n, _deadEndFlags)
 
         # Randomly convert some dead-ends into rooms based on room_chance
-        for (i, j) in dead_ends:
-            if random.random() < self.room_chance:
-                self.grid[i][j] = 3  # Mark as potential room
+        random = rng.random
+        room_chance = self.room_chance
+        for k in dead_ends:
+            if random() < room_chance:
+                cells[k] = ROOM  # Mark as potential room
 
         # Optionally add extra corridor connections to reduce linearity
         self._addExtraConnections()
@@ -111,33 +308,79 @@ class DungeonMap:
         """
         Iterate through interior cells and carve extra connections (corridors) between existing passages
         with probability extra_connection_chance, to create loops in the maze.
-        """
-        # Avoid boundary cells (start from 1 to size-2)
-        for i in range(1, self.size - 1):
-            for j in range(1, self.size - 1):
-                if self.grid[i][j] != 0:
-                    continue  # Only consider unvisited/wall cells
-
-                # Check vertical alignment: if north & south are passages/home/rooms
-                north = self.grid[i - 1][j]
-                south = self.grid[i + 1][j]
-                if north in (1, 2, 3) and south in (1, 2, 3):
-                    left = self.grid[i][j - 1]
-                    right = self.grid[i][j + 1]
-                    # If left & right are walls and random chance succeeds, carve corridor
-                    if left == 0 and right == 0 and random.random() < self.extra_connection_chance:
-                        self.grid[i][j] = 2
-                    continue
 
-                # Check horizontal alignment: if west & east are passages/home/rooms
-                west = self.grid[i][j - 1]
-                east = self.grid[i][j + 1]
-                if west in (1, 2, 3) and east in (1, 2, 3):
-                    up = self.grid[i - 1][j]
-                    down = self.grid[i + 1][j]
-                    # If up & down are walls and random chance succeeds, carve corridor
-                    if up == 0 and down == 0 and random.random() < self.extra_connection_chance:
-                        self.grid[i][j] = 2
+        Cells are visited in row-major order as before, but only those that
+        can pass a test: an Empty cell whose south or east neighbour is open.
+        Those two neighbours are still untouched when a cell is visited
+        (carving only ever changes the cell being visited), so every other
+        cell would fail both tests and draw nothing from the RNG.
+        """
+        n = self.size
+        cells = self.grid.cells
+        random = self.rng.random
+        chance = self.extra_connection_chance
+        carved = self._extraCells
+        for k in _flagged(_rowPadded(cells, n), n, _extraCandidateFlags, interior=True):
+            # Check vertical alignment: if north & south are passages/home/rooms
+            if cells[k - n] and cells[k + n]:
+                # If left & right are walls and random chance succeeds, carve corridor
+                if cells[k - 1] == EMPTY and cells[k + 1] == EMPTY and random() < chance:
+                    cells[k] = HALLWAY
+                    carved.append(k)
+                continue
+
+            # Check horizontal alignment: if west & east are passages/home/rooms
+            if cells[k - 1] and cells[k + 1]:
+                # If up & down are walls and random chance succeeds, carve corridor
+                if cells[k - n] == EMPTY and cells[k + n] == EMPTY and random() < chance:
+                    cells[k] = HALLWAY
+                    carved.append(k)
+
+    def _postProcessNumpy(self):
+        """
+        Vectorized version of the dead-end/room marking in generate() and of
+        _addExtraConnections. Neighbour counts come from shifted-array sums and
+        all probabilities for a pass are drawn as one random array. Works on a
+        NumPy view of the grid's bytearray, so no copy of the map is made.
+        """
+        n = self.size
+        # Derive the NumPy generator from the map's own RNG to stay seed-driven
+        nprng = np.random.default_rng(self.rng.getrandbits(64))
+        g = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(n, n)
+
+        # ─── Dead-ends and rooms ─────────────────────────────────────────────
+        # Count adjacent passages (home or corridor) for every cell at once
+        passage = ((g == HOME) | (g == HALLWAY)).astype(np.uint8)
+        count = np.zeros((n, n), dtype=np.uint8)
+        count[1:, :] += passage[:-1, :]
+        count[:-1, :] += passage[1:, :]
+        count[:, 1:] += passage[:, :-1]
+        count[:, :-1] += passage[:, 1:]
+        # Dead-end if a corridor has exactly one adjacent corridor or home
+        rows, cols = np.nonzero((g == HALLWAY) & (count == 1))
+        hits = nprng.random(rows.size) < self.room_chance
+        g[rows[hits], cols[hits]] = ROOM
+
+        # ─── Extra connections ───────────────────────────────────────────────
+        # Carving one wall can change its neighbours' eligibility, so eligible
+        # cells are handled in two passes: first the walls between maze cells,
+        # then the corner "pillars". Cells within one pass are never adjacent.
+        parity = (n // 2) % 2
+        odd_row = (np.arange(1, n - 1) % 2 != parity)[:, None]
+        odd_col = (np.arange(1, n - 1) % 2 != parity)[None, :]
+        pillars = odd_row & odd_col
+        inner = g[1:-1, 1:-1]
+        for phase in (~pillars, pillars):
+            north, south = g[:-2, 1:-1], g[2:, 1:-1]
+            west, east = g[1:-1, :-2], g[1:-1, 2:]
+            # Vertical: north & south open, left & right walls
+            vertical = (north != EMPTY) & (south != EMPTY) & (west == EMPTY) & (east == EMPTY)
+            # Horizontal: west & east open, up & down walls
+            horizontal = (west != EMPTY) & (east != EMPTY) & (north == EMPTY) & (south == EMPTY)
+            rows, cols = np.nonzero((inner == EMPTY) & (vertical | horizontal) & phase)
+            hits = nprng.random(rows.size) < self.extra_connection_chance
+            inner[rows[hits], cols[hits]] = HALLWAY
+            self._extraCells.extend(((rows[hits] + 1) * n + cols[hits] + 1).tolist())
 
     def _inBounds(self, x: int, y: int) -> bool:
         """
@@ -145,45 +388,44 @@ class DungeonMap:
         """
         return 0 <= x < self.size and 0 <= y < self.size
 
-    def buildRooms(self) -> List[List[tile]]:
+    def buildRooms(self) -> TileGrid:
         """
-        Convert the integer-coded grid into a grid of tile objects:
+        Finalize the tile codes in place:
           - 0 => Empty
           - 1 => Home
           - 2 => Hallway
-          - 3 => Potential Room candidate (only one chosen as actual Room)
-        A single room is chosen at random from the candidates.
+          - 3 => Potential Room candidate (room_count chosen as actual Rooms)
+        The rooms are chosen at random from the candidates (fewer if there are
+        not enough); the others become Empty, except where that would cut off
+        an extra connection (see reconnectCarvedCells).
         """
-        # Initialize an empty tile grid
-        tile_grid: List[List[tile]] = [[None] * self.size for _ in range(self.size)]
-        # Collect all cells marked as potential rooms (value 3)
+        n = self.size
+        cells = self.grid.cells
+        # Collect all cells marked as potential rooms (value 3); find() scans in C
         possibleRooms: List[Tuple[int, int]] = []
+        k = cells.find(ROOM)
+        while k != -1:
+            possibleRooms.append(divmod(k, n))
+            k = cells.find(ROOM, k + 1)
+
+        # Select the dead-end cells that become actual Rooms. A single room
+        # keeps the original choice() draw, so existing seeds give the same maps.
+        if self.room_count == 1:
+            finalRooms = [self.rng.choice(possibleRooms)]
+        else:
+            finalRooms = self.rng.sample(possibleRooms, min(self.room_count, len(possibleRooms)))
+        # Turn every candidate back into a wall, then restore the chosen ones
+        cells[:] = cells.translate(_CLEAR_CANDIDATES)
+        for row, col in finalRooms:
+            cells[row * n + col] = ROOM
+        if self._extraCells:
+            cleared = {row * n + col for row, col in possibleRooms}
+            cleared.difference_update(row * n + col for row, col in finalRooms)
+            reconnectCarvedCells(self.grid, self._extraCells, cleared)
+        self._extraCells = []
+        self.setRooms([(col, row) for row, col in finalRooms])
 
-        # First pass: assign Empty, Home, or Hallway tiles; record potential rooms
-        for i in range(self.size):
-            for j in range(self.size):
-                val = self.grid[i][j]
-                if val == 0:
-                    tile_grid[i][j] = Empty([i, j])
-                elif val == 1:
-                    tile_grid[i][j] = Home([i, j])
-                elif val == 2:
-                    tile_grid[i][j] = Hallway([i, j])
-                elif val == 3:
-                    # Temporarily skip assigning Room until we pick one
-                    possibleRooms.append((i, j))
-
-        # Select one dead-end cell from the candidates to become the actual Room
-        finalRoom = random.choice(possibleRooms)
-        for i in range(self.size):
-            for j in range(self.size):
-                if (i, j) == finalRoom:
-                    tile_grid[i][j] = Room([i, j])
-                elif tile_grid[i][j] is None:
-                    # Any remaining None cells are converted to Empty
-                    tile_grid[i][j] = Empty([i, j])
-
-        return tile_grid
+        return self.grid
 
     def printMap(self, dev: bool = False):
         """
@@ -194,50 +436,120 @@ class DungeonMap:
           - 'R ' for Room
           - '  ' for Empty
           - '█ ' for the player location
+          - '░ ' for cells not yet explored (fog of war only)
+        Row strings are cached between calls; only rows touched by setTile are
+        rebuilt, and the player glyph is spliced into its row on the fly, so a
+        single step costs O(size) string work plus the final join.
+        """
+        lines = self._renderLines
+        if lines is None:
+            # First render (or grid replaced): build every row once
+            n = self.size
+            border = '─' * (2 * n)
+            lines = ['┌' + border + '┐']
+            lines.extend(self._renderRow(y) for y in range(n))
+            lines.append('└' + border + '┘')
+            self._renderLines = lines
+            self._dirtyRows.clear()
+        elif self._dirtyRows:
+            # Rebuild only the rows whose tiles changed since the last render
+            for y in self._dirtyRows:
+                lines[y + 1] = self._renderRow(y)
+            self._dirtyRows.clear()
+
+        # Draw the players over their cells without touching the cached rows
+        lines = lines.copy()
+        for (px, py), symbol in self._playerGlyphs():
+            row = lines[py + 1]
+            start = 1 + 2 * px
+            lines[py + 1] = row[:start] + symbol + row[start + 2:]
+        return '\n'.join(lines) + '\n'
+
+    def _playerGlyphs(self) -> List[Tuple[Tuple[int, int], str]]:
+        """(location, symbol) for other players, then this map's player on top."""
+        glyphs = [(location, OTHER_SYMBOL) for location in self.others.values()]
+        glyphs.append((self.player.location, PLAYER_SYMBOL))
+        return glyphs
+
+    def _renderRow(self, y: int) -> str:
+        """
+        Build the bordered ASCII line for grid row y (without the player).
+        """
+        codes = self.visibleCodes(y)
+        return '│' + ''.join([VISIBLE_SYMBOLS[code] for code in codes]) + '│'
+
+    def visibleCodes(self, y: int, start: int = 0, stop: int = None) -> bytes:
         """
-        # Mapping of tile classes to their ASCII symbols
-        cell_repr = {
-            Empty: '  ',
-            Home: 'H ',
-            Hallway: '. ',
-            Room: 'R '
-        }
-
-        # Build top border
-        textmap = '┌' + '─' * (2 * self.size) + '┐' + "\n"
-
-        # For each row, append '│', then each cell symbol, then '│'
-        for y, row in enumerate(self.grid):
-            line = ''
-            for x, cell in enumerate(row):
-                # If player's coordinates match this cell, draw the player symbol
-                if (x, y) == self.player.location:
-                    line += '█ '
-                else:
-                    # Match the cell object to its symbol
-                    for cls, symbol in cell_repr.items():
-                        if isinstance(cell, cls):
-                            line += symbol
-                            break
-            textmap += f'│{line}│\n'
-
-        # Build bottom border
-        textmap += '└' + '─' * (2 * self.size) + '┘' + '\n'
-        return textmap
-
-    def regenerate(self):
-        """
-        Reset the integer grid and regenerate the maze and rooms from scratch.
+        Tile codes of row y between columns start and stop as the player sees
+        them: unexplored cells have 4 added when fog of war is on.
         """
+        codes = self.grid.rowCodes(y, start, stop)
+        if self.explored is None:
+            return codes
+        fog = self.explored.rowBits(y, start, stop).translate(_FOG_OFFSET)
+        # Per-byte sums stay below 8, so adding the rows as big ints never carries
+        total = int.from_bytes(codes, "little") + int.from_bytes(fog, "little")
+        return total.to_bytes(len(codes), "little")
+
+    def printWindow(self, x0: int, y0: int, width: int, height: int) -> str:
+        """
+        ASCII render of just the width x height block of cells whose top-left
+        corner is (x0, y0), using the same symbols and borders as printMap.
+        Reads only those cells, so it works on maps far too large to print
+        whole (e.g. memory-mapped ones).
+        """
+        x1 = min(x0 + width, self.size)
+        y1 = min(y0 + height, self.size)
+        # Player glyphs by row, limited to the window
+        glyphs = {}
+        for (px, py), symbol in self._playerGlyphs():
+            if x0 <= px < x1 and y0 <= py < y1:
+                glyphs.setdefault(py, []).append((px, symbol))
+        border = '─' * (2 * (x1 - x0))
+        lines = ['┌' + border + '┐']
+        for y in range(y0, y1):
+            symbols = [VISIBLE_SYMBOLS[code] for code in self.visibleCodes(y, x0, x1)]
+            for px, symbol in glyphs.get(y, ()):
+                symbols[px - x0] = symbol
+            lines.append('│' + ''.join(symbols) + '│')
+        lines.append('└' + border + '┘')
+        return '\n'.join(lines) + '\n'
+
+    def _invalidateRender(self):
+        """
+        Drop the cached ASCII render, e.g. after the grid has been replaced.
+        """
+        self._renderLines = None
+        self._dirtyRows.clear()
+
+    def regenerate(self, seed: int = None):
+        """
+        Reset the tile grid and regenerate the maze and rooms from scratch.
+        Uses the given seed, or draws a new one so each call yields a new map.
+        A size changed since construction is made odd here, as in __init__,
+        so `size` is always the size that was generated and DungeonMap(size,
+        seed=seed, ...) rebuilds the same map (replays, levels, leaderboard).
+        """
+        if self.size % 2 == 0:
+            self.size -= 1
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+
         # Reset grid to all walls/unvisited
-        self.grid: List[List[int]] = [[0] * self.size for _ in range(self.size)]
+        self.grid = TileGrid(self.size)
         # Reset home position at center
         self.home = (self.size // 2, self.size // 2)
-        self.grid[self.home[0]][self.home[1]] = 1
+        self.grid.setCode(self.home[1], self.home[0], HOME)
 
         # Re-run generation and rebuild room tiles
-        self.generate()
-        self.grid = self.buildRooms()
+        with metrics.timed("generation"):
+            self.generate()
+            self.grid = self.buildRooms()
+        self._invalidateRender()
+        self._distanceField = None
+        # Nothing of the new map has been seen yet
+        if self.fogRadius is not None:
+            self.explored = BitGrid(self.size)
 
     def assignPlayer(self, player):
         """
@@ -245,6 +557,119 @@ class DungeonMap:
         """
         self.player = player
         self.player.location = self.home
+        if self.fogRadius is not None:
+            self.revealAround(*self.home)
+
+    # ─── Fog of War ──────────────────────────────────────────────────────────
+
+    def enableFog(self, radius: int = 5):
+        """
+        Hide every cell the player has not yet been within `radius` tiles of.
+        Starts with nothing explored except the area around the player.
+        """
+        if radius < 0:
+            raise ValueError("Fog radius cannot be negative.")
+        self.fogRadius = radius
+        self.explored = BitGrid(self.size)
+        self._invalidateRender()
+        if self.player is not None and self.player.location is not None:
+            self.revealAround(*self.player.location)
+
+    def disableFog(self):
+        """Show the whole map again."""
+        self.fogRadius = None
+        self.explored = None
+        self._invalidateRender()
+
+    def isExplored(self, x: int, y: int) -> bool:
+        """Whether (x, y) is visible (always True without fog of war)."""
+        return self.explored is None or self.explored.get(x, y)
+
+    def revealAround(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        Mark every cell within the fog radius of (x, y) as explored and
+        return the ones that were not explored before.
+        """
+        disk, _ = _fogOffsets(self.fogRadius)
+        return self._reveal(x, y, disk)
+
+    def revealStep(self, old: Tuple[int, int], new: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Update the explored cells after the player moved from `old` to `new`
+        and return the newly revealed ones. A single step only checks the
+        cells entering the view radius; any other jump re-checks the disk.
+        """
+        disk, entering = _fogOffsets(self.fogRadius)
+        offsets = entering.get((new[0] - old[0], new[1] - old[1]), disk)
+        return self._reveal(new[0], new[1], offsets)
+
+    def _reveal(self, x: int, y: int, offsets) -> List[Tuple[int, int]]:
+        """Explore the in-bounds cells (x + dx, y + dy); return the new ones."""
+        n = self.size
+        mark = self.explored.set
+        dirty = self._dirtyRows if self._renderLines is not None else None
+        revealed = []
+        for dx, dy in offsets:
+            cx, cy = x + dx, y + dy
+            if 0 <= cx < n and 0 <= cy < n and mark(cx, cy):
+                revealed.append((cx, cy))
+                if dirty is not None:
+                    dirty.add(cy)
+        return revealed
+
+    def setTile(self, x: int, y: int, code: int):
+        """
+        Replace the tile at column x, row y with the given tile code.
+        Marks the row dirty so the cached render picks up the change, and
+        keeps an existing distance field up to date.
+        """
+        self.grid.setCode(x, y, code)
+        if self._renderLines is not None:
+            self._dirtyRows.add(y)
+        if self._distanceField is not None:
+            if code == EMPTY:
+                # Removing a tile (hard mode) is repaired incrementally
+                self._distanceField.removeCell(x, y)
+            else:
+                # Opening a tile can shorten paths anywhere: rebuild on next use
+                self._distanceField = None
+
+    def replaceGrid(self, grid: TileGrid):
+        """
+        Swap in a different grid of the same size (e.g. a replay keyframe),
+        dropping the cached render and distance field that described the old one.
+        """
+        if grid.size != self.size:
+            raise ValueError("Replacement grid does not match the map size.")
+        self.grid = grid
+        self._invalidateRender()
+        self._distanceField = None
+
+    def setRooms(self, rooms: List[Tuple[int, int]]):
+        """
+        Record the goal rooms (x, y) in checkpoint order and index them.
+        The tiles themselves must already be Rooms.
+        """
+        self.rooms = list(rooms)
+        self.room = self.rooms[0] if self.rooms else None
+        self.roomIndex = RoomIndex(self.rooms)
+
+    def isRoom(self, x: int, y: int) -> bool:
+        """Whether (x, y) is one of the map's goal rooms (O(1))."""
+        return (x, y) in self.roomIndex
+
+    def nearestRoom(self, x: int, y: int) -> Tuple[int, int]:
+        """The goal room closest to (x, y) in straight-line distance."""
+        return self.roomIndex.nearest(x, y)
+
+    def distanceField(self) -> DistanceField:
+        """
+        Distances from every cell to the nearest Room (shortest path length,
+        the path itself and per-cell lookups). Computed once per map on first use.
+        """
+        if self._distanceField is None:
+            self._distanceField = DistanceField(self)
+        return self._distanceField
 
     def canMove(self, new_location: Tuple[int, int]) -> bool:
         """
@@ -254,5 +679,4 @@ class DungeonMap:
         x, y = new_location
         if not self._inBounds(y, x):
             return False
-        cell = self.grid[y][x]
-        return not isinstance(cell, Empty)
+        return self.grid.code(x, y) != EMPTY
@@ -0,0 +1,109 @@
+import random
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Tuple
+from mapClass import DungeonMap
+from mapStorage import dumpMap, loadsMap
+
+# Settings a prefetched map must match: (size, room_chance,
+# extra_connection_chance, algorithm, use_numpy, room_count, objective)
+MapSettings = Tuple[int, float, float, str, bool, int, str]
+
+
+def generatePacked(seed: int, size: int, room_chance: float, extra_connection_chance: float,
+                   algorithm: str = "dfs", use_numpy: bool = False,
+                   room_count: int = 1, objective: str = "any") -> bytes:
+    """
+    Generate one map and return it in the packed mapStorage format.
+    Runs in a worker process; packed bytes are much cheaper to send back
+    than a pickled DungeonMap.
+    """
+    dungeon_map = DungeonMap(
+        size,
+        room_chance=room_chance,
+        extra_connection_chance=extra_connection_chance,
+        seed=seed,
+        use_numpy=use_numpy,
+        algorithm=algorithm,
+        room_count=room_count,
+        objective=objective
+    )
+    return dumpMap(dungeon_map)
+
+
+def settingsOf(dungeon_map: DungeonMap) -> MapSettings:
+    """The generation settings of an existing map, as used by configure()."""
+    return (dungeon_map.size, dungeon_map.room_chance, dungeon_map.extra_connection_chance,
+            dungeon_map.algorithm, dungeon_map.use_numpy,
+            dungeon_map.room_count, dungeon_map.objective)
+
+
+class MapPrefetcher:
+    """
+    Keeps the next few maps for the current settings generating in a worker
+    process, so "New Map" only has to unpack a finished map and redraw
+    instead of running generation on the Tk main thread.
+
+    Call configure() with the wanted settings (changing them drops every
+    queued map), take() to receive the next map, and shutdown() on exit.
+    Seeds are drawn here, so every handed-out map still records its seed.
+    """
+
+    def __init__(self, depth: int = 2, workers: int = 1, executor: Executor = None):
+        # Number of maps kept queued for the current settings
+        self.depth = depth
+        # Pool that runs generatePacked; a private process pool by default
+        self._ownsExecutor = executor is None
+        self.executor = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+        # Settings of the queued maps, or None until configure() is called
+        self.settings: MapSettings = None
+        # Pending or finished generations, oldest first
+        self._queue: Deque[Future] = deque()
+
+    def configure(self, size: int, room_chance: float, extra_connection_chance: float,
+                  algorithm: str = "dfs", use_numpy: bool = False,
+                  room_count: int = 1, objective: str = "any"):
+        """
+        Set the settings for upcoming maps. If they differ from the current
+        ones, queued maps are discarded (running ones are left to finish and
+        ignored). Then the queue is topped up to `depth` maps.
+        """
+        # DungeonMap rounds even sizes down; do the same so settings compare equal
+        if size % 2 == 0:
+            size -= 1
+        settings = (size, room_chance, extra_connection_chance, algorithm, use_numpy,
+                    room_count, objective)
+        if settings != self.settings:
+            self.invalidate()
+            self.settings = settings
+        self._fill()
+
+    def invalidate(self):
+        """Drop every queued map."""
+        while self._queue:
+            self._queue.popleft().cancel()
+
+    def take(self) -> DungeonMap:
+        """
+        Return the next map for the current settings. Usually it is already
+        finished; otherwise this waits for it, which is never slower than
+        generating it here. A replacement is queued straight away.
+        """
+        if self.settings is None:
+            raise ValueError("MapPrefetcher.configure() must be called before take().")
+        self._fill()
+        data = self._queue.popleft().result()
+        self._fill()
+        return loadsMap(data)
+
+    def _fill(self):
+        """Submit generations until `depth` maps are queued."""
+        while len(self._queue) < self.depth:
+            seed = random.getrandbits(32)
+            self._queue.append(self.executor.submit(generatePacked, seed, *self.settings))
+
+    def shutdown(self):
+        """Cancel queued maps and stop the worker pool (if this object created it)."""
+        self.invalidate()
+        if self._ownsExecutor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,198 @@
+import tkinter as tk
+from typing import Iterable, Tuple
+
+
+class LabelRenderer:
+    """
+    Original map display: the whole ASCII map (DungeonMap.printMap) shown
+    in a single Tk Label. Kept as the default and as a fallback renderer.
+    Maps larger than viewSize, and unbounded ones (size None, see
+    chunkWorld.ChunkWorld), only show a viewSize x viewSize window around
+    the player (printWindow).
+    """
+
+    def __init__(self, parent, map, viewSize: int = 101):
+        # Reference to the dungeon map model being drawn
+        self.map = map
+        # Largest map shown in full; bigger maps get a window around the player
+        self.viewSize = viewSize
+
+        # Label that holds the ASCII representation of the map
+        self.widget = tk.Label(
+            parent,
+            text=self._text(),
+            font="TkFixedFont"
+        )
+        # Let this label expand to occupy its parent frame fully
+        self.widget.pack(expand=True)
+
+    def _text(self) -> str:
+        """ASCII text for the whole map, or for the window around the player."""
+        size = self.map.size
+        if size is not None and size <= self.viewSize:
+            return self.map.printMap()
+        x, y = self.map.player.location
+        x0 = x - self.viewSize // 2
+        y0 = y - self.viewSize // 2
+        if size is not None:
+            limit = size - self.viewSize
+            x0 = min(max(x0, 0), limit)
+            y0 = min(max(y0, 0), limit)
+        return self.map.printWindow(x0, y0, self.viewSize, self.viewSize)
+
+    def redraw(self):
+        """Re-render the full map, e.g. after the map was regenerated."""
+        self.widget.config(text=self._text())
+
+    def updateCells(self, cells: Iterable[Tuple[int, int]]):
+        """
+        Refresh after a move. The label can only be replaced as a whole,
+        but printMap reuses its cached rows so this stays cheap.
+        """
+        self.widget.config(text=self._text())
+
+    def destroy(self):
+        """Remove the widget when switching renderers."""
+        self.widget.destroy()
+
+
+class CanvasRenderer:
+    """
+    Map display built from one Canvas rectangle per visible tile.
+    Only a viewport of at most viewSize x viewSize tiles around the player is
+    drawn, so large maps do not need to fit on screen. A move recolours just
+    the cells that changed; the viewport scrolls (full redraw of the visible
+    tiles) only when the player gets close to its edge. Unbounded maps
+    (size None) have no edges to clamp the viewport to.
+    """
+
+    # Fill colour for each tile code, indexed by EMPTY/HOME/HALLWAY/ROOM
+    TILE_COLORS = ("#202020", "#3a7bd5", "#d8d8d8", "#e0a030")
+    # Fill colour used for the player's tile
+    PLAYER_COLOR = "#d03030"
+    # Fill colour for tiles holding other players (multiplayer)
+    OTHER_COLOR = "#30a050"
+    # Fill colour for cells hidden by fog of war
+    FOG_COLOR = "#000000"
+
+    def __init__(self, parent, map, tileSize: int = 14, viewSize: int = 41):
+        # Reference to the dungeon map model being drawn
+        self.map = map
+        # Pixel width/height of one tile
+        self.tileSize = tileSize
+        # Maximum number of tiles shown along each axis
+        self.viewSize = viewSize
+
+        # Number of tiles actually shown (never larger than the map)
+        self.view = 0
+        # Map coordinates of the top-left visible tile
+        self.origin = (0, 0)
+        # Canvas item ids, row-major over the viewport
+        self.items = []
+        # Cells occupied by other players, refreshed before each draw
+        self._others = set()
+
+        self.widget = tk.Canvas(parent, highlightthickness=0, bg=self.TILE_COLORS[0])
+        self.widget.pack(expand=True)
+        self.redraw()
+
+    def _viewFor(self) -> int:
+        """Tiles shown along each axis for the current map."""
+        if self.map.size is None:
+            return self.viewSize
+        return min(self.viewSize, self.map.size)
+
+    def _buildItems(self):
+        """Create one rectangle per viewport tile and size the canvas to fit."""
+        self.widget.delete("all")
+        self.view = self._viewFor()
+        px = self.view * self.tileSize
+        self.widget.config(width=px, height=px)
+
+        ts = self.tileSize
+        self.items = [
+            self.widget.create_rectangle(
+                vx * ts, vy * ts, (vx + 1) * ts, (vy + 1) * ts,
+                width=0
+            )
+            for vy in range(self.view)
+            for vx in range(self.view)
+        ]
+
+    def _centerOn(self, x: int, y: int):
+        """Place the viewport so (x, y) is centred, clamped to the map edges."""
+        ox = x - self.view // 2
+        oy = y - self.view // 2
+        if self.map.size is not None:
+            limit = self.map.size - self.view
+            ox = min(max(ox, 0), limit)
+            oy = min(max(oy, 0), limit)
+        self.origin = (ox, oy)
+
+    def _needsScroll(self, x: int, y: int) -> bool:
+        """True if (x, y) is within the scroll margin of a scrollable edge."""
+        ox, oy = self.origin
+        margin = self.view // 4
+        if self.map.size is None:
+            return (x - ox < margin or ox + self.view - 1 - x < margin
+                    or y - oy < margin or oy + self.view - 1 - y < margin)
+        limit = self.map.size - self.view
+        return (
+            (x - ox < margin and ox > 0)
+            or (ox + self.view - 1 - x < margin and ox < limit)
+            or (y - oy < margin and oy > 0)
+            or (oy + self.view - 1 - y < margin and oy < limit)
+        )
+
+    def _colorAt(self, x: int, y: int) -> str:
+        """Fill colour for map cell (x, y), taking the player and fog into account."""
+        if (x, y) == self.map.player.location:
+            return self.PLAYER_COLOR
+        if (x, y) in self._others:
+            return self.OTHER_COLOR
+        if not self.map.isExplored(x, y):
+            return self.FOG_COLOR
+        return self.TILE_COLORS[self.map.grid.code(x, y)]
+
+    def redraw(self):
+        """Recolour every visible tile, rebuilding items if the map size changed."""
+        if self.view != self._viewFor():
+            self._buildItems()
+        self._centerOn(*self.map.player.location)
+        self._others = set(self.map.others.values())
+
+        ox, oy = self.origin
+        itemconfig = self.widget.itemconfig
+        i = 0
+        for y in range(oy, oy + self.view):
+            for x in range(ox, ox + self.view):
+                itemconfig(self.items[i], fill=self._colorAt(x, y))
+                i += 1
+
+    def updateCells(self, cells: Iterable[Tuple[int, int]]):
+        """
+        Recolour only the given map cells (the player's old and new positions
+        and any cells just revealed from the fog). Scrolls the viewport
+        instead if the player nears its edge.
+        """
+        if self._needsScroll(*self.map.player.location):
+            self.redraw()
+            return
+
+        self._others = set(self.map.others.values())
+        ox, oy = self.origin
+        for x, y in cells:
+            vx, vy = x - ox, y - oy
+            if 0 <= vx < self.view and 0 <= vy < self.view:
+                self.widget.itemconfig(self.items[vy * self.view + vx], fill=self._colorAt(x, y))
+
+    def destroy(self):
+        """Remove the widget when switching renderers."""
+        self.widget.destroy()
+
+
+# Renderer classes selectable from game.py and the settings window
+RENDERERS = {
+    "label": LabelRenderer,
+    "canvas": CanvasRenderer,
+}
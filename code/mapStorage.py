@@ -0,0 +1,129 @@
+import mmap
+import struct
+from mapClass import DungeonMap, OBJECTIVES, np
+from gridClass import TileGrid, PackedGrid, packCells, unpackCells
+
+# ─── File Format ────────────────────────────────────────────────────────────
+# A saved map is a fixed little-endian header followed by the tile codes
+# packed 2 bits per cell (4 cells per byte, first cell in the low bits):
+#   magic "DGMP", format version, flags, algorithm, objective, size,
+#   home x/y, first room x/y, seed, room_chance, extra_connection_chance
+# Version 2 follows the cells with the room list: a uint32 count and an
+# (x, y) uint32 pair per room in checkpoint order. Version 1 files have a
+# zero objective byte and only the room in the header; both still load.
+MAGIC = b"DGMP"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBBIIIIIQdd")
+ROOM_COUNT = struct.Struct("<I")
+ROOM_ENTRY = struct.Struct("<II")
+
+# Algorithm byte values; index into this tuple (0 = "dfs" for older files)
+ALGORITHM_CODES = ("dfs", "kruskal", "eller", "binary_tree", "sidewinder")
+
+# Header flag bits
+FLAG_NUMPY = 1  # map was post-processed with the NumPy path (see DungeonMap.use_numpy)
+
+
+def packRooms(rooms) -> bytes:
+    """
+    Serialize a room list (count + x/y pairs) as stored after the cells.
+    """
+    return ROOM_COUNT.pack(len(rooms)) + b"".join(ROOM_ENTRY.pack(x, y) for x, y in rooms)
+
+
+def dumpMap(dungeon_map: DungeonMap) -> bytes:
+    """
+    Serialize a map (header + packed tiles + room list) to bytes.
+    """
+    room = dungeon_map.room or (0, 0)
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        FLAG_NUMPY if dungeon_map.use_numpy else 0,
+        ALGORITHM_CODES.index(dungeon_map.algorithm),
+        OBJECTIVES.index(dungeon_map.objective),
+        dungeon_map.size,
+        dungeon_map.home[0], dungeon_map.home[1],
+        room[0], room[1],
+        dungeon_map.seed,
+        dungeon_map.room_chance,
+        dungeon_map.extra_connection_chance
+    )
+    return header + packCells(dungeon_map.grid.cells) + packRooms(dungeon_map.rooms)
+
+
+def loadsMap(data, lazy: bool = False) -> DungeonMap:
+    """
+    Rebuild a DungeonMap from bytes (or any buffer, e.g. an mmap)
+    produced by dumpMap, without re-running generation.
+    With lazy=True the map reads its tiles straight from `data` through a
+    PackedGrid instead of expanding them; `data` must then stay open and,
+    for hard mode, writable.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a dungeon map file.")
+    (magic, version, flags, algorithm, objective, size, home_x, home_y, room_x, room_y,
+     seed, room_chance, extra_chance) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a dungeon map file.")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported map format version {version}.")
+
+    count = size * size
+    if (len(data) - HEADER.size) * 4 < count:
+        raise ValueError("Map file is truncated.")
+
+    # Room list: stored after the cells since version 2, header-only before
+    rooms = [(room_x, room_y)]
+    if version >= 2:
+        pos = HEADER.size + (count + 3) // 4
+        if len(data) < pos + ROOM_COUNT.size:
+            raise ValueError("Map file is truncated.")
+        (room_total,) = ROOM_COUNT.unpack_from(data, pos)
+        pos += ROOM_COUNT.size
+        if len(data) < pos + room_total * ROOM_ENTRY.size:
+            raise ValueError("Map file is truncated.")
+        rooms = [ROOM_ENTRY.unpack_from(data, pos + i * ROOM_ENTRY.size) for i in range(room_total)]
+
+    if lazy:
+        grid = PackedGrid(size, data, HEADER.size)
+    else:
+        packed = bytes(data[HEADER.size:HEADER.size + (count + 3) // 4])
+        grid = TileGrid(size, unpackCells(packed, count))
+
+    dungeon_map = DungeonMap(
+        size,
+        room_chance=room_chance,
+        extra_connection_chance=extra_chance,
+        seed=seed,
+        grid=grid,
+        use_numpy=bool(flags & FLAG_NUMPY) and np is not None,
+        algorithm=ALGORITHM_CODES[algorithm],
+        room_count=max(1, len(rooms)),
+        objective=OBJECTIVES[objective]
+    )
+    dungeon_map.home = (home_x, home_y)
+    dungeon_map.setRooms(rooms)
+    return dungeon_map
+
+
+def saveMap(dungeon_map: DungeonMap, path: str):
+    """
+    Write a map to `path` in the packed binary format.
+    """
+    with open(path, "wb") as f:
+        f.write(dumpMap(dungeon_map))
+
+
+def loadMap(path: str, lazy: bool = False) -> DungeonMap:
+    """
+    Load a map written by saveMap (or mapStreamer.streamMap). The file is
+    memory-mapped. By default the packed tiles are expanded straight from the
+    mapping into memory. With lazy=True the mapping is kept open as the map's
+    PackedGrid, so maps far larger than RAM can be played; it is mapped
+    copy-on-write, so hard-mode changes never reach the file.
+    """
+    with open(path, "rb") as f:
+        if lazy:
+            return loadsMap(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY), lazy=True)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loadsMap(mapped)
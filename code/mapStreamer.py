@@ -0,0 +1,236 @@
+import mmap
+import random
+from typing import Iterator, List, Set
+from roomClass import EMPTY, HOME, HALLWAY, ROOM
+from gridClass import PackedGrid, packCells
+from mazeAlgorithms import ellerRows
+from mapStorage import HEADER, MAGIC, VERSION, ALGORITHM_CODES, packRooms
+from mapClass import reconnectCarvedCells
+
+# Translation table that turns room candidates (3) into walls (0)
+_CLEAR_CANDIDATES = bytes(EMPTY if code == ROOM else code for code in range(256))
+
+
+def _carvedRows(n: int, rng: random.Random) -> Iterator[bytearray]:
+    """
+    Yield the grid rows of an Eller maze one at a time (codes 0/1/2).
+    Node rows come straight from ellerRows; the row below a node row only
+    holds that row's downward openings.
+    """
+    home = n // 2
+    start = home % 2
+    coords = range(start, n, 2)
+    width = len(coords)
+    eller = ellerRows(width, width, rng)
+    down = None
+
+    for y in range(n):
+        row = bytearray(n)
+        if y % 2 == start:
+            # Node row: every node is corridor, plus the opened east walls
+            right, down = next(eller)
+            row[start::2] = bytes([HALLWAY]) * width
+            for j, opened in enumerate(right):
+                if opened:
+                    row[coords[j] + 1] = HALLWAY
+            if y == home:
+                row[home] = HOME
+        elif down is not None:
+            # Wall row: only the walls opened downwards from the row above
+            for j, opened in enumerate(down):
+                if opened:
+                    row[coords[j]] = HALLWAY
+            down = None
+        yield row
+
+
+def _flaggedRows(rows: Iterator[bytearray], n: int, rng: random.Random,
+                 room_chance: float) -> Iterator[bytearray]:
+    """
+    Streaming version of the dead-end/room marking in DungeonMap.generate:
+    looks at a three-row window and flags dead-ends as room candidates (3).
+    """
+    empty = bytearray(n)
+    prev, cur = empty, next(rows)
+    for nxt in rows:
+        yield _flagRow(prev, cur, nxt, n, rng, room_chance)
+        prev, cur = cur, nxt
+    yield _flagRow(prev, cur, empty, n, rng, room_chance)
+
+
+def _flagRow(prev: bytearray, cur: bytearray, nxt: bytearray, n: int,
+             rng: random.Random, room_chance: float) -> bytearray:
+    """Flag the dead-ends of `cur`, counting passages in the unflagged rows."""
+    out = bytearray(cur)
+    j = cur.find(HALLWAY)
+    while j != -1:
+        # Count adjacent passages or home to see if this cell is a dead-end
+        count = (prev[j] in (HOME, HALLWAY)) + (nxt[j] in (HOME, HALLWAY))
+        if j > 0:
+            count += cur[j - 1] in (HOME, HALLWAY)
+        if j < n - 1:
+            count += cur[j + 1] in (HOME, HALLWAY)
+        if count == 1 and rng.random() < room_chance:
+            out[j] = ROOM
+        j = cur.find(HALLWAY, j + 1)
+    return out
+
+
+def _connectedRows(rows: Iterator[bytearray], n: int, rng: random.Random,
+                   chance: float, carved: List[int]) -> Iterator[bytearray]:
+    """
+    Streaming version of DungeonMap._addExtraConnections. Row i is scanned
+    against the finished row above and the not yet scanned row below, which
+    is exactly what the in-memory scan sees. The flat index of every carved
+    cell is appended to `carved` before its row is yielded.
+    """
+    north = next(rows)
+    yield north  # boundary row is never carved
+    cur = next(rows)
+    for y, south in enumerate(rows, 1):
+        for j in range(1, n - 1):
+            if cur[j] != EMPTY:
+                continue
+            if north[j] and south[j]:
+                # Vertical alignment: open if left & right are walls
+                if cur[j - 1] == EMPTY and cur[j + 1] == EMPTY and rng.random() < chance:
+                    cur[j] = HALLWAY
+                    carved.append(y * n + j)
+                continue
+            if cur[j - 1] and cur[j + 1]:
+                # Horizontal alignment: open if up & down are walls
+                if north[j] == EMPTY and south[j] == EMPTY and rng.random() < chance:
+                    cur[j] = HALLWAY
+                    carved.append(y * n + j)
+        yield cur
+        north, cur = cur, south
+    yield cur  # boundary row is never carved
+
+
+def _danglingCells(above: bytearray, row: bytearray, below: bytearray, y: int, n: int,
+                   carved: Set[int], dangling: List[int], near: Set[int]):
+    """
+    Look at the cells carved in row `y` (the rows around it are final) and
+    keep only those whose open neighbours are all room candidates or other
+    carved cells: they are the only ones that clearing the candidates can
+    cut off. Those go to `dangling`, the candidates next to them to `near`.
+    Keeping just these, rather than every carved cell, keeps memory small.
+    """
+    for k in sorted(k for k in carved if k // n == y):
+        j = k % n
+        touching = []
+        attached = False
+        for code, v in ((above[j], k - n), (below[j], k + n),
+                        (row[j - 1], k - 1), (row[j + 1], k + 1)):
+            if code == ROOM:
+                touching.append(v)
+            elif code != EMPTY and v not in carved:
+                attached = True
+                break
+        if not attached:
+            dangling.append(k)
+            near.update(touching)
+
+
+def streamMap(
+    path: str,
+    size: int,
+    room_chance: float = 0.4,
+    extra_connection_chance: float = 0.05,
+    seed: int = None
+):
+    """
+    Generate an Eller maze row by row and write it straight into a
+    memory-mapped map file (mapStorage format), keeping only a few rows in
+    memory at any time. Open the result with mapStorage.loadMap(path, lazy=True).
+    The Room is picked by reservoir sampling over the candidates as they
+    stream past, and patched into the file at the end, together with any
+    extra connection that clearing the other candidates cut off (see
+    mapClass.reconnectCarvedCells). The same seed always
+    produces the same file, but not the same map as
+    DungeonMap(algorithm="eller"), whose random draws come in another order.
+    """
+    # Validate inputs (same rules as DungeonMap)
+    if size < 5:
+        raise ValueError("Size must be at least 5 to create a dungeon map.")
+    if not (0.0 <= room_chance <= 1.0):
+        raise ValueError("Room chance must be between 0 and 1.")
+    if not (0.0 <= extra_connection_chance <= 1.0):
+        raise ValueError("Extra connection chance must be between 0 and 1.")
+    if size % 2 == 0:
+        size -= 1
+
+    n = size
+    seed = seed if seed is not None else random.getrandbits(32)
+    rng = random.Random(seed)
+    packed_size = (n * n + 3) // 4
+    # Header, packed cells, and a room list holding the single Room
+    total = HEADER.size + packed_size + len(packRooms([(0, 0)]))
+
+    with open(path, "w+b") as f:
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as out:
+            carved: List[int] = []
+            rows = _connectedRows(
+                _flaggedRows(_carvedRows(n, rng), n, rng, room_chance),
+                n, rng, extra_connection_chance, carved
+            )
+            # Carved cells of the last three rows, and the carved cells (with
+            # their candidate neighbours) that may need reconnecting
+            recent: Set[int] = set()
+            dangling: List[int] = []
+            near: Set[int] = set()
+            above = middle = bytearray(n)
+
+            pos = HEADER.size
+            pending = bytearray()
+            candidates = 0
+            room = None
+            for y, row in enumerate(rows):
+                # Reservoir-sample the Room among the candidates of this row
+                k = row.find(ROOM)
+                while k != -1:
+                    candidates += 1
+                    if rng.randrange(candidates) == 0:
+                        room = (k, y)
+                    k = row.find(ROOM, k + 1)
+
+                # Every candidate is written as a wall (the pipeline still
+                # reads `row`, so convert a copy); pack whole groups of 4 cells
+                pending += row.translate(_CLEAR_CANDIDATES)
+                usable = len(pending) & ~3
+                packed = packCells(pending[:usable])
+                out[pos:pos + len(packed)] = packed
+                pos += len(packed)
+                del pending[:usable]
+
+                # Row y is carved, so row y - 1 and its neighbours are final
+                recent.update(carved)
+                carved.clear()
+                if y > 0:
+                    _danglingCells(above, middle, row, y - 1, n, recent, dangling, near)
+                    recent.difference_update([k for k in recent if k // n < y - 1])
+                above, middle = middle, row
+
+            if pending:
+                packed = packCells(pending)
+                out[pos:pos + len(packed)] = packed
+
+            if room is None:
+                raise ValueError("No dead-end was flagged as a room; increase room_chance.")
+            grid = PackedGrid(n, out, HEADER.size)
+            grid.setCode(room[0], room[1], ROOM)
+            if dangling:
+                near.discard(room[1] * n + room[0])
+                reconnectCarvedCells(grid, dangling, near)
+            out[HEADER.size + packed_size:total] = packRooms([room])
+
+            out[:HEADER.size] = HEADER.pack(
+                MAGIC, VERSION, 0,
+                ALGORITHM_CODES.index("eller"),
+                0,  # objective "any"
+                n, n // 2, n // 2,
+                room[0], room[1],
+                seed, room_chance, extra_connection_chance
+            )
+            out.flush()
@@ -0,0 +1,283 @@
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+from roomClass import EMPTY, HALLWAY
+
+# ─── Maze Carving Algorithms ────────────────────────────────────────────────
+# Every algorithm carves a perfect maze into a flat, row-major bytearray of
+# tile codes (cell (row, col) at row * n + col) that is all walls except the
+# home cell. Maze "nodes" are the cells whose row and column have the same
+# parity as home; the walls between two neighbouring nodes get carved.
+# Signature: carve(cells, n, home, rng) -> None
+CarveFunction = Callable[[bytearray, int, Tuple[int, int], random.Random], None]
+
+
+def _lattice(n: int, home: Tuple[int, int]) -> range:
+    """Row/column coordinates of maze nodes (same parity as home)."""
+    return range(home[0] % 2, n, 2)
+
+
+def _openNodes(cells: bytearray, n: int, home: Tuple[int, int]):
+    """Mark every node except home as corridor (used by non-DFS algorithms)."""
+    coords = _lattice(n, home)
+    for r in coords:
+        for c in coords:
+            if cells[r * n + c] == EMPTY:
+                cells[r * n + c] = HALLWAY
+
+
+# Candidate moves for carveDfs by 4-bit mask of unvisited neighbours, in
+# the order down, up, right, left (bit 0 .. bit 3): the indices of the open
+# directions, their count and that count's bit length (see carveDfs).
+_DFS_CHOICES = tuple(
+    (options, len(options), len(options).bit_length())
+    for options in (tuple(d for d in range(4) if mask >> d & 1) for mask in range(16))
+)
+
+
+def carveDfs(cells: bytearray, n: int, home: Tuple[int, int], rng: random.Random):
+    """
+    Recursive backtracker (depth-first search) starting from home.
+    Long winding corridors with few branches; the original game algorithm.
+
+    Runs on a flat copy of the grid padded with two non-Empty sentinel
+    cells on every side, so neighbours are plain index offsets and need no
+    bounds checks. The random draws are exactly those of rng.choice over
+    the neighbours in the original order, so seeds give the same mazes.
+    """
+    # Padded working copy: width n + 4, sentinels everywhere but the grid
+    width = n + 4
+    grid = bytearray(b"\x01") * (width * width)
+    for r in range(n):
+        row = (r + 2) * width + 2
+        grid[row:row + n] = cells[r * n:(r + 1) * n]
+
+    # Two steps down, up, right and left (generation rows are x, columns y)
+    offsets = (2 * width, -2 * width, 2, -2)
+    d0, d1, d2, d3 = offsets
+    choices = _DFS_CHOICES
+    # rng.choice(seq) draws getrandbits(len(seq).bit_length()) until the
+    # value is below len(seq) (Random._randbelow); doing the same inline
+    # keeps the draws identical without a list and two calls per step
+    getrandbits = rng.getrandbits
+
+    # Current cell and the path back to home, as flat indices into the
+    # padded grid
+    k = (home[0] + 2) * width + home[1] + 2
+    stack: List[int] = []
+    push = stack.append
+    pop = stack.pop
+    while True:
+        # Unvisited (Empty) neighbours as a bit mask; sentinels are never Empty
+        mask = ((not grid[k + d0]) | (not grid[k + d1]) << 1
+                | (not grid[k + d2]) << 2 | (not grid[k + d3]) << 3)
+        if mask:
+            options, count, bits = choices[mask]
+            r = getrandbits(bits)
+            while r >= count:
+                r = getrandbits(bits)
+            step = offsets[options[r]]
+            # Carve the wall between the two cells and the neighbour itself
+            grid[k + (step >> 1)] = HALLWAY
+            push(k)
+            k += step
+            grid[k] = HALLWAY
+        elif stack:
+            # No unvisited neighbours: backtrack
+            k = pop()
+        else:
+            break
+
+    # Copy the carved grid back without its padding
+    for r in range(n):
+        row = (r + 2) * width + 2
+        cells[r * n:(r + 1) * n] = grid[row:row + n]
+
+
+def carveKruskal(cells: bytearray, n: int, home: Tuple[int, int], rng: random.Random):
+    """
+    Randomized Kruskal: visit all walls in random order and open a wall
+    whenever it joins two still-separate regions (union-find).
+    """
+    coords = _lattice(n, home)
+    _openNodes(cells, n, home)
+    width = len(coords)
+
+    # Every wall between two horizontally or vertically adjacent nodes,
+    # stored as (node id, wall cell index, node id)
+    walls: List[Tuple[int, int, int]] = []
+    for i, r in enumerate(coords):
+        for j, c in enumerate(coords):
+            node = i * width + j
+            k = r * n + c
+            if j + 1 < width:
+                walls.append((node, k + 1, node + 1))
+            if i + 1 < width:
+                walls.append((node, k + n, node + width))
+    rng.shuffle(walls)
+
+    # Union-find over node ids, with path halving
+    parent = list(range(width * width))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for a, wall, b in walls:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[ra] = rb
+            cells[wall] = HALLWAY
+
+
+def ellerRows(width: int, height: int, rng: random.Random) -> Iterator[Tuple[List[bool], List[bool]]]:
+    """
+    Eller's algorithm, one node row at a time, keeping only O(width) state.
+    Yields (right, down) per node row: right[c] opens the wall between nodes
+    c and c + 1, down[c] opens the wall below node c. The last row never
+    opens downwards.
+    """
+    # Set id of every column in the current row and the members of each set
+    sets = list(range(width))
+    members: Dict[int, List[int]] = {c: [c] for c in range(width)}
+    next_id = width
+
+    for row in range(height):
+        last = row == height - 1
+
+        # Randomly join adjacent cells from different sets (all of them on the last row)
+        right = [False] * (width - 1)
+        for c in range(width - 1):
+            a, b = sets[c], sets[c + 1]
+            if a != b and (last or rng.random() < 0.5):
+                right[c] = True
+                # Merge the smaller set into the larger one
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for col in members[b]:
+                    sets[col] = a
+                members[a].extend(members.pop(b))
+
+        down = [False] * width
+        if last:
+            yield right, down
+            return
+
+        # Every set must continue downwards through at least one cell
+        for cols in members.values():
+            chosen = [col for col in cols if rng.random() < 0.5]
+            if not chosen:
+                chosen = [rng.choice(cols)]
+            for col in chosen:
+                down[col] = True
+
+        yield right, down
+
+        # Cells without a downward opening start new sets in the next row
+        members = {}
+        for c in range(width):
+            if not down[c]:
+                sets[c] = next_id
+                next_id += 1
+            members.setdefault(sets[c], []).append(c)
+
+
+def carveEller(cells: bytearray, n: int, home: Tuple[int, int], rng: random.Random):
+    """
+    Eller's algorithm: builds the maze row by row from ellerRows, so the
+    generator itself only needs memory proportional to the map width.
+    """
+    coords = _lattice(n, home)
+    _openNodes(cells, n, home)
+    width = len(coords)
+
+    for i, (right, down) in enumerate(ellerRows(width, width, rng)):
+        r = coords[i]
+        base = r * n
+        for j, opened in enumerate(right):
+            if opened:
+                cells[base + coords[j] + 1] = HALLWAY
+        for j, opened in enumerate(down):
+            if opened:
+                cells[base + n + coords[j]] = HALLWAY
+
+
+def carveBinaryTree(cells: bytearray, n: int, home: Tuple[int, int], rng: random.Random):
+    """
+    Binary tree: every node opens the wall to its north or its west.
+    Very fast but strongly biased (open top row and left column).
+    """
+    coords = _lattice(n, home)
+    _openNodes(cells, n, home)
+    first = coords[0]
+
+    for r in coords:
+        for c in coords:
+            k = r * n + c
+            options = []
+            if r != first:
+                options.append(k - n)
+            if c != first:
+                options.append(k - 1)
+            if options:
+                cells[rng.choice(options)] = HALLWAY
+
+
+def carveSidewinder(cells: bytearray, n: int, home: Tuple[int, int], rng: random.Random):
+    """
+    Sidewinder: carve eastward runs along each row and close every run by
+    opening north from one random cell of it. Row by row, like Eller's.
+    """
+    coords = _lattice(n, home)
+    _openNodes(cells, n, home)
+    first, last = coords[0], coords[-1]
+
+    for r in coords:
+        run: List[int] = []
+        for c in coords:
+            k = r * n + c
+            run.append(k)
+            close_run = c == last or (r != first and rng.random() < 0.5)
+            if close_run:
+                # The top row is one long corridor; other runs connect north
+                if r != first:
+                    cells[rng.choice(run) - n] = HALLWAY
+                run = []
+            else:
+                cells[k + 1] = HALLWAY
+
+
+# Algorithms selectable by name from DungeonMap and the settings window
+ALGORITHMS: Dict[str, CarveFunction] = {
+    "dfs": carveDfs,
+    "kruskal": carveKruskal,
+    "eller": carveEller,
+    "binary_tree": carveBinaryTree,
+    "sidewinder": carveSidewinder,
+}
+
+
+def benchmarkAlgorithms(size: int = 501, repeats: int = 3) -> Dict[str, float]:
+    """
+    Time every carving algorithm on an empty size x size grid and return the
+    best wall time (seconds) per algorithm.
+    """
+    home = (size // 2, size // 2)
+    results = {}
+    for name, carve in ALGORITHMS.items():
+        best = float("inf")
+        for seed in range(repeats):
+            cells = bytearray(size * size)
+            cells[home[0] * size + home[1]] = 1
+            start = time.perf_counter()
+            carve(cells, size, home, random.Random(seed))
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+if __name__ == "__main__":
+    for name, seconds in benchmarkAlgorithms().items():
+        print(f"{name:12} {seconds:.3f}s")
@@ -0,0 +1,120 @@
+"""
+Optional instrumentation for the game.
+
+Code reports through the module-level `metrics` object:
+
+    metrics.count("moves")                   # bump a counter
+    with metrics.timed("render"):            # add wall time to a timer
+        renderer.redraw()
+    metrics.event("settings", map_size=31)   # one-off structured event
+
+Counters and timer totals are always kept (a dict update per call). Events
+only leave the process when a sink is installed with setSink(); the default
+NullSink drops them without building anything, so instrumentation costs next
+to nothing when nobody is listening.
+"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class NullSink:
+    """Default sink: discards every event."""
+
+    # Metrics skips building event records entirely when this is False
+    enabled = False
+
+    def emit(self, record: Dict):
+        pass
+
+    def close(self):
+        pass
+
+
+class RingBufferSink(NullSink):
+    """Keeps the most recent `capacity` events in memory (e.g. for a debug view)."""
+
+    enabled = True
+
+    def __init__(self, capacity: int = 10000):
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: Dict):
+        self.records.append(record)
+
+    def events(self) -> List[Dict]:
+        """The buffered events, oldest first."""
+        return list(self.records)
+
+
+class JsonLinesSink(NullSink):
+    """Appends every event as one JSON object per line to a file."""
+
+    enabled = True
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def emit(self, record: Dict):
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class Metrics:
+    """
+    Counters (moves, blocked_moves, ...), accumulated timings in seconds
+    (render, generation, ...) and an event sink.
+    """
+
+    def __init__(self, sink: NullSink = None):
+        self.sink = sink if sink is not None else NullSink()
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+
+    def count(self, name: str, amount: int = 1):
+        """Add `amount` to counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Measure the wrapped block and add its duration to timer `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            self.count(name)
+            if self.sink.enabled:
+                self.sink.emit({"event": name, "t": time.time(), "seconds": seconds})
+
+    def event(self, name: str, **fields):
+        """Send a structured event to the sink (ignored by the NullSink)."""
+        if self.sink.enabled:
+            record = {"event": name, "t": time.time()}
+            record.update(fields)
+            self.sink.emit(record)
+
+    def snapshot(self) -> Dict:
+        """Current counters and timings as a JSON-ready dict."""
+        return {"counters": dict(self.counters), "timings": dict(self.timings)}
+
+    def reset(self):
+        """Zero every counter and timing."""
+        self.counters.clear()
+        self.timings.clear()
+
+
+# Shared instance used throughout the game
+metrics = Metrics()
+
+
+def setSink(sink: NullSink) -> NullSink:
+    """Install a new event sink and return the previous one (not closed)."""
+    previous = metrics.sink
+    metrics.sink = sink if sink is not None else NullSink()
+    return previous
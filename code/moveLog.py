@@ -0,0 +1,185 @@
+import struct
+import sys
+import time
+from array import array
+from typing import Callable, Iterator
+from mapStorage import ALGORITHM_CODES
+from mapClass import OBJECTIVES
+
+# Direction for each 2-bit move code, and the reverse lookup
+DIRECTIONS = ("up", "down", "left", "right")
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+# ─── File Format ────────────────────────────────────────────────────────────
+# A saved log is a fixed little-endian header followed by the move codes
+# packed 2 bits each (first move in the low bits) and one uint32 delta in
+# milliseconds per move:
+#   magic "DGRP", format version, algorithm, flags, room count, objective,
+#   size, move count, room_chance, extra_connection_chance, seed
+# Versions 1 and 2 have no objective byte (HEADER_V2) and load as "any";
+# version 1 logs also have a zero room count byte, meaning a single room.
+MAGIC = b"DGRP"
+VERSION = 3
+HEADER = struct.Struct("<4sBBBBBIIddQ")
+HEADER_V2 = struct.Struct("<4sBBBBIIddQ")
+
+# Header flag bits
+FLAG_HARD_MODE = 1
+FLAG_NUMPY = 2
+
+
+class MoveLog:
+    """
+    Compact record of one run: the map's seed and settings, every move
+    attempt as a 2-bit direction code (4 per byte) and the time since the
+    previous move in milliseconds. That is enough to regenerate the map and
+    re-apply the run exactly (see replayClass.ReplayEngine); a million moves
+    take about 4.25 MB. Only fixed-size maps can be logged: a ChunkWorld
+    (size None) cannot be regenerated from a header.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        room_chance: float,
+        extra_connection_chance: float,
+        seed: int,
+        algorithm: str = "dfs",
+        use_numpy: bool = False,
+        hard_mode: bool = False,
+        room_count: int = 1,
+        objective: str = "any",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if size is None:
+            raise ValueError("Move logs need a fixed-size map.")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objective must be one of {', '.join(OBJECTIVES)}.")
+        # Settings needed to regenerate the exact same map
+        self.size = size
+        self.room_chance = room_chance
+        self.extra_connection_chance = extra_connection_chance
+        self.seed = seed
+        self.algorithm = algorithm
+        self.use_numpy = use_numpy
+        self.room_count = room_count
+        self.objective = objective
+        # Whether walking wiped tiles during this run
+        self.hard_mode = hard_mode
+
+        # Move codes packed 2 bits per move, and the number of moves stored
+        self.moves = bytearray()
+        self.count = 0
+        # Milliseconds since the previous move (or the start of the run)
+        self.deltas = array('I')
+
+        # Clock returning seconds; the run starts when the log is created
+        self.clock = clock
+        self._last = clock()
+
+    @classmethod
+    def forSession(cls, session, clock: Callable[[], float] = time.monotonic) -> "MoveLog":
+        """Start an empty log for the current map and player of a GameSession."""
+        dungeon_map = session.map
+        return cls(
+            dungeon_map.size,
+            dungeon_map.room_chance,
+            dungeon_map.extra_connection_chance,
+            dungeon_map.seed,
+            algorithm=dungeon_map.algorithm,
+            use_numpy=dungeon_map.use_numpy,
+            hard_mode=session.player.hardMode,
+            room_count=dungeon_map.room_count,
+            objective=dungeon_map.objective,
+            clock=clock
+        )
+
+    def record(self, direction: str):
+        """Append one move attempt, timestamped with the log's clock."""
+        code = DIRECTION_CODES.get(direction)
+        if code is None:
+            raise ValueError(f"Unknown direction: {direction}.")
+        shift = (self.count & 3) << 1
+        if shift == 0:
+            self.moves.append(code)
+        else:
+            self.moves[-1] |= code << shift
+        self.count += 1
+
+        now = self.clock()
+        self.deltas.append(max(0, round((now - self._last) * 1000)))
+        self._last = now
+
+    def directionAt(self, index: int) -> str:
+        """Direction of move number `index` (0-based)."""
+        if not 0 <= index < self.count:
+            raise IndexError("Move index out of range.")
+        return DIRECTIONS[(self.moves[index >> 2] >> ((index & 3) << 1)) & 3]
+
+    def directions(self, start: int = 0, stop: int = None) -> Iterator[str]:
+        """Yield the directions of moves start..stop-1."""
+        stop = self.count if stop is None else min(stop, self.count)
+        moves = self.moves
+        for index in range(start, stop):
+            yield DIRECTIONS[(moves[index >> 2] >> ((index & 3) << 1)) & 3]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def toBytes(self) -> bytes:
+        """Serialize the log (header + packed moves + deltas)."""
+        flags = (FLAG_HARD_MODE if self.hard_mode else 0) | (FLAG_NUMPY if self.use_numpy else 0)
+        if self.room_count > 255:
+            raise ValueError("Move logs support at most 255 rooms.")
+        header = HEADER.pack(
+            MAGIC, VERSION,
+            ALGORITHM_CODES.index(self.algorithm), flags, self.room_count,
+            OBJECTIVES.index(self.objective), self.size, self.count,
+            self.room_chance, self.extra_connection_chance,
+            self.seed
+        )
+        # The file stores deltas little-endian
+        deltas = array('I', self.deltas)
+        if sys.byteorder != "little":
+            deltas.byteswap()
+        return header + bytes(self.moves) + deltas.tobytes()
+
+    @classmethod
+    def fromBytes(cls, data: bytes) -> "MoveLog":
+        """Rebuild a log written by toBytes."""
+        if len(data) < HEADER_V2.size or data[:4] != MAGIC:
+            raise ValueError("Not a move log.")
+        version = data[4]
+        if version == VERSION:
+            header = HEADER
+            if len(data) < header.size:
+                raise ValueError("Move log is truncated.")
+            (_, _, algorithm, flags, room_count, objective, size, count,
+             room_chance, extra_chance, seed) = header.unpack_from(data)
+        elif version in (1, 2):
+            header = HEADER_V2
+            (_, _, algorithm, flags, room_count, size, count,
+             room_chance, extra_chance, seed) = header.unpack_from(data)
+            objective = 0
+        else:
+            raise ValueError(f"Unsupported move log version {version}.")
+
+        packed_end = header.size + (count + 3) // 4
+        if len(data) < packed_end + 4 * count:
+            raise ValueError("Move log is truncated.")
+
+        log = cls(
+            size, room_chance, extra_chance, seed,
+            algorithm=ALGORITHM_CODES[algorithm],
+            use_numpy=bool(flags & FLAG_NUMPY),
+            hard_mode=bool(flags & FLAG_HARD_MODE),
+            room_count=max(1, room_count),
+            objective=OBJECTIVES[objective]
+        )
+        log.moves = bytearray(data[header.size:packed_end])
+        log.count = count
+        log.deltas = array('I')
+        log.deltas.frombytes(bytes(data[packed_end:packed_end + 4 * count]))
+        if sys.byteorder != "little":
+            log.deltas.byteswap()
+        return log
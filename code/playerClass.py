@@ -1,11 +1,12 @@
-from roomClass import Empty
+from roomClass import EMPTY
+from metrics import metrics
 
 
 class PlayerClass:
     """
-    Represents the player within the dungeon map. Handles movement, tracking
-    of whether the player has moved (to start the timer), and enforces hard
-    mode behavior by clearing previous positions.
+    Represents the player within the dungeon map. Handles movement, tracks
+    whether the player has moved (GameSession uses this to start the timer),
+    and enforces hard mode behavior by clearing previous positions.
     """
 
     def __init__(self, map):
@@ -19,30 +20,19 @@ class PlayerClass:
         self.hasMoved = False
         # If True, the tile the player leaves becomes an Empty tile
         self.hardMode = False
-        # Debug print of initial location
-        print(self.location)
 
-    def move(self, window, direction: str):
+    def move(self, direction: str) -> bool:
         """
         Attempt to move the player in one of four cardinal directions:
-        'up', 'down', 'left', or 'right'. If the game is completed, no move
-        is allowed. On the first move, starts the game timer. If hardMode is
-        enabled, the previous tile becomes Empty once the player moves.
+        'up', 'down', 'left', or 'right'. If hardMode is enabled, the previous
+        tile becomes Empty once the player moves. Returns True if the player
+        changed tiles. Game rules such as completion and starting the timer
+        live in GameSession, so this works without any window.
         """
-        # If the dungeon is already completed, do not allow more movement
-        if window.completed:
-            print("Game completed. No further moves allowed.")
-            return
-
-        # Start the timer on the first move
-        if not self.hasMoved:
-            self.hasMoved = True
-            window.timer.start_timer()
-
         # Ensure the player has a valid starting location
         if self.location is None:
-            print("Player has no location assigned.")
-            return
+            metrics.event("move_without_location")
+            return False
 
         # Determine the new coordinates based on the requested direction
         x, y = self.location
@@ -55,22 +45,19 @@ class PlayerClass:
         elif direction == "right":
             new_location = (x + 1, y)
         else:
-            # If the direction string is not valid, inform the user
-            print("Invalid direction. Use 'up', 'down', 'left', or 'right'.")
-            return
+            # If the direction string is not valid, report it and ignore the move
+            metrics.event("invalid_direction", direction=direction)
+            return False
 
         # Check if the new location is within bounds and not an Empty tile
         if self.map.canMove(new_location):
             # If hard mode is active, convert the tile being left into Empty
             if self.hardMode:
                 old_x, old_y = x, y
-                self.map.grid[old_y][old_x] = Empty([old_x, old_y])
+                self.map.setTile(old_x, old_y, EMPTY)
             # Update the player's location
             self.location = new_location
-            print(f"Moved to {self.location}")
-        else:
-            # Movement is invalid (either out of bounds or into an Empty tile)
-            print("Move out of bounds.")
+            return True
 
-        # After movement (or failed movement), update the map display
-        window.updateMap()
+        # Movement is invalid (either out of bounds or into an Empty tile)
+        return False
@@ -0,0 +1,116 @@
+from bisect import bisect_right
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from mapClass import DungeonMap
+from gridClass import TileGrid, packCells, unpackCells
+from playerClass import PlayerClass
+from moveLog import MoveLog
+
+
+class Keyframe(NamedTuple):
+    """Replay state after `index` moves."""
+    index: int
+    location: Tuple[int, int]
+    elapsed_ms: int
+    # Packed grid snapshot; only needed in hard mode, where walking changes the map
+    grid: Optional[bytes]
+
+
+class ReplayEngine:
+    """
+    Rebuilds any frame of a recorded run. The map is regenerated from the
+    log's seed and settings, and moves are re-applied with the normal
+    PlayerClass rules, so hard-mode wiping replays exactly.
+
+    Every `keyframeInterval` moves the state is saved as a Keyframe (player
+    location, elapsed time and, in hard mode, a 2-bit packed grid). Seeking
+    restores the closest keyframe at or before the target and re-applies only
+    the moves after it, so after the first pass over a run any seek costs
+    O(keyframeInterval) moves instead of O(all moves).
+    """
+
+    def __init__(self, log: MoveLog, keyframeInterval: int = 4096):
+        if keyframeInterval < 1:
+            raise ValueError("Keyframe interval must be at least 1.")
+        # The recorded run being replayed
+        self.log = log
+        # Moves between saved keyframes
+        self.keyframeInterval = keyframeInterval
+
+        # Map regenerated from the recorded seed and settings
+        self.map = DungeonMap(
+            log.size,
+            room_chance=log.room_chance,
+            extra_connection_chance=log.extra_connection_chance,
+            seed=log.seed,
+            use_numpy=log.use_numpy,
+            algorithm=log.algorithm,
+            room_count=log.room_count,
+            objective=log.objective
+        )
+        # Player that re-applies the recorded moves
+        self.player = PlayerClass(self.map)
+        self.player.hardMode = log.hard_mode
+
+        # Number of recorded moves applied so far, and their total delay
+        self.index = 0
+        self.elapsed_ms = 0
+        # Saved states, sorted by index; keyframe 0 is the start of the run
+        self.keyframes: List[Keyframe] = [self._snapshot()]
+        # Their move indices, kept separately for bisecting
+        self._keyframeIndices: List[int] = [0]
+
+    def _snapshot(self) -> Keyframe:
+        """Capture the current state as a keyframe."""
+        grid = packCells(self.map.grid.cells) if self.log.hard_mode else None
+        return Keyframe(self.index, self.player.location, self.elapsed_ms, grid)
+
+    def _restore(self, keyframe: Keyframe):
+        """Return to the state saved in `keyframe`."""
+        if keyframe.grid is not None:
+            count = self.map.size * self.map.size
+            self.map.replaceGrid(TileGrid(self.map.size, unpackCells(keyframe.grid, count)))
+        self.player.location = keyframe.location
+        self.index = keyframe.index
+        self.elapsed_ms = keyframe.elapsed_ms
+
+    def _advance(self, stop: int):
+        """Apply moves self.index..stop-1, saving keyframes on the way."""
+        interval = self.keyframeInterval
+        deltas = self.log.deltas
+        move = self.player.move
+        for direction in self.log.directions(self.index, stop):
+            move(direction)
+            self.elapsed_ms += deltas[self.index]
+            self.index += 1
+            if self.index % interval == 0 and self.index > self.keyframes[-1].index:
+                self.keyframes.append(self._snapshot())
+                self._keyframeIndices.append(self.index)
+
+    def seek(self, index: int) -> DungeonMap:
+        """
+        Put the replay in the state after `index` moves (clamped to the run)
+        and return the map; the player's location is map.player.location.
+        """
+        index = max(0, min(index, len(self.log)))
+        # Closest saved state at or before the target
+        keyframe = self.keyframes[bisect_right(self._keyframeIndices, index) - 1]
+        if index < self.index or keyframe.index > self.index:
+            self._restore(keyframe)
+        self._advance(index)
+        return self.map
+
+    def fastForward(self, moves: int = 1) -> DungeonMap:
+        """Advance the replay by `moves` moves (negative values rewind)."""
+        return self.seek(self.index + moves)
+
+    def frames(self, start: int = 0, stop: int = None, step: int = 1) -> Iterator[Tuple[int, Tuple[int, int]]]:
+        """
+        Play the run from `start` to `stop` and yield (move index, player
+        location) every `step` moves, e.g. to drive a fast-forward display.
+        """
+        stop = len(self.log) if stop is None else min(stop, len(self.log))
+        self.seek(start)
+        yield self.index, self.player.location
+        while self.index < stop:
+            self.seek(min(self.index + step, stop))
+            yield self.index, self.player.location
@@ -47,3 +47,30 @@ class Room(tile):
     """
     def __init__(self, position: tuple):
         super().__init__(name="Room", type="Room", position=position)
+
+
+# ─── Tile Codes ──────────────────────────────────────────────────────────────
+# The map stores one byte per cell instead of one tile object per cell.
+# These codes are shared by map generation, the compact grid and rendering.
+EMPTY = 0
+HOME = 1
+HALLWAY = 2
+ROOM = 3
+
+# Flyweight tiles: one shared, position-less instance per tile type.
+# TileGrid hands these out on access, so `grid[y][x].type` keeps working
+# without allocating an object per cell.
+TILE_FOR_CODE = (
+    Empty(None),
+    Home(None),
+    Hallway(None),
+    Room(None),
+)
+
+# Reverse lookup used when a tile object is assigned back into the grid
+CODE_FOR_TYPE = {
+    "Empty": EMPTY,
+    "Home": HOME,
+    "Hallway": HALLWAY,
+    "Room": ROOM,
+}
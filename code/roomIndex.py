@@ -0,0 +1,91 @@
+from itertools import count
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+class RoomIndex:
+    """
+    Set of room cells (x, y) with a bucket grid on top for spatial queries.
+    Membership tests are O(1). nearest() searches buckets in rings around
+    the query point and stops as soon as no unsearched bucket can hold a
+    closer room, so it only looks at the rooms near the answer.
+    """
+
+    def __init__(self, rooms: Iterable[Tuple[int, int]] = (), bucketSize: int = 16):
+        if bucketSize < 1:
+            raise ValueError("Bucket size must be at least 1.")
+        # Width/height in cells of one bucket
+        self.bucketSize = bucketSize
+        # Every room in the index
+        self._rooms: Set[Tuple[int, int]] = set()
+        # Rooms grouped by bucket (x // bucketSize, y // bucketSize)
+        self._buckets: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        for x, y in rooms:
+            self.add(x, y)
+
+    def _bucketOf(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.bucketSize, y // self.bucketSize)
+
+    def add(self, x: int, y: int):
+        """Add the room at (x, y)."""
+        if (x, y) in self._rooms:
+            return
+        self._rooms.add((x, y))
+        self._buckets.setdefault(self._bucketOf(x, y), set()).add((x, y))
+
+    def remove(self, x: int, y: int) -> bool:
+        """Remove the room at (x, y); returns False if it was not indexed."""
+        if (x, y) not in self._rooms:
+            return False
+        self._rooms.remove((x, y))
+        key = self._bucketOf(x, y)
+        bucket = self._buckets[key]
+        bucket.remove((x, y))
+        if not bucket:
+            del self._buckets[key]
+        return True
+
+    def __contains__(self, location: Tuple[int, int]) -> bool:
+        return location in self._rooms
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self._rooms)
+
+    def nearest(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        The room closest to (x, y) in straight-line distance (ties broken by
+        position), or None if the index is empty.
+        """
+        if not self._rooms:
+            return None
+        size = self.bucketSize
+        bx, by = self._bucketOf(x, y)
+
+        best = None
+        best_key = None
+        # The index is not empty, so some ring finds a room and ends the search
+        for ring in count():
+            for key in self._ring(bx, by, ring):
+                for rx, ry in self._buckets.get(key, ()):
+                    candidate = ((rx - x) ** 2 + (ry - y) ** 2, rx, ry)
+                    if best_key is None or candidate < best_key:
+                        best_key, best = candidate, (rx, ry)
+            # Rooms in later rings are more than ring * size cells away
+            if best_key is not None and best_key[0] <= (ring * size) ** 2:
+                break
+        return best
+
+    @staticmethod
+    def _ring(bx: int, by: int, ring: int) -> Iterator[Tuple[int, int]]:
+        """Bucket keys at Chebyshev distance `ring` from (bx, by)."""
+        if ring == 0:
+            yield (bx, by)
+            return
+        for kx in range(bx - ring, bx + ring + 1):
+            yield (kx, by - ring)
+            yield (kx, by + ring)
+        for ky in range(by - ring + 1, by + ring):
+            yield (bx - ring, ky)
+            yield (bx + ring, ky)
@@ -0,0 +1,260 @@
+from typing import Iterable, Optional, Tuple
+from playerClass import PlayerClass
+from roomIndex import RoomIndex
+from moveLog import MoveLog, DIRECTION_CODES
+from connectivity import ConnectivityTracker
+from metrics import metrics
+
+
+class SessionObserver:
+    """
+    Base class for objects that want to follow a GameSession (e.g. GameWindow).
+    Every hook is a no-op here, so observers only override what they need.
+    """
+
+    def onStart(self, session):
+        """Called once, just before the first move of a run is applied."""
+
+    def onMove(self, session, old_location, new_location):
+        """Called after every move attempt; locations are equal if it was blocked."""
+
+    def onRoom(self, session, location):
+        """Called when the player reaches a goal room that counts for the objective."""
+
+    def onComplete(self, session):
+        """Called when the map's objective is met (e.g. the Room was reached)."""
+
+    def onReset(self, session):
+        """Called after the map was regenerated and the run restarted."""
+
+    def onStuck(self, session):
+        """Called when hard mode has cut the player off from the goal room(s)."""
+
+
+class RoomProgress:
+    """
+    A player's progress towards a map's objective: the goal rooms still to
+    be reached and, on "ordered" maps, the index of the next checkpoint in
+    map.rooms. Shared by GameSession and the race server, so both apply
+    the same rules.
+    """
+
+    def __init__(self, dungeon_map):
+        self.map = dungeon_map
+        # Goal rooms still to be reached (O(1) membership)
+        self.remaining = RoomIndex(dungeon_map.rooms)
+        # Rooms that have counted so far; on "ordered" maps also the index
+        # of the next checkpoint
+        self.nextCheckpoint = 0
+
+    def reach(self, location: Tuple[int, int]) -> bool:
+        """
+        Apply the map's objective to reaching the goal room at `location`:
+          - "any":     the first room finishes the run
+          - "all":     every room must be visited, in any order
+          - "ordered": rooms only count when visited in map.rooms order
+        Returns True if the room counted.
+        """
+        if (self.map.objective == "ordered"
+                and location != self.map.rooms[self.nextCheckpoint]):
+            return False
+        if not self.remaining.remove(*location):
+            return False
+        self.nextCheckpoint += 1
+        return True
+
+    def done(self) -> bool:
+        """Whether the objective is met."""
+        if self.map.objective == "any":
+            return self.nextCheckpoint > 0
+        return not self.remaining
+
+
+class GameSession:
+    """
+    Headless game engine. Owns the dungeon map, the player, the completion
+    flag, a tick counter (one tick per move attempt) and the MoveLog of the
+    current run. Contains no Tkinter
+    code: user interfaces, timers and bots subscribe as observers, so the
+    same rules run unchanged in tests, benchmarks and on display-less boxes.
+    """
+
+    # Whether reset() and changes to map settings take effect locally
+    # (False for sessionServer.RemoteSession, whose server owns the map)
+    ownsMap = True
+
+    def __init__(self, map, player: PlayerClass = None):
+        # Reference to the DungeonMap instance being played
+        self.map = map
+        # The player; created (and placed at home) if not supplied
+        self.player = player if player is not None else PlayerClass(map)
+        # Flag indicating whether the player has reached the Room (game over)
+        self.completed = False
+        # Number of move attempts processed in the current run
+        self.ticks = 0
+        # Registered SessionObserver-like objects
+        self.observers = []
+        # Compact record of the current run (seed, moves, timings) for replays;
+        # None on maps without a fixed size (ChunkWorld), which cannot be replayed
+        self.log = self._newLog()
+        # Cells revealed by the latest move when the map has fog of war on
+        self.revealed = []
+        # Goal rooms reached and still to be reached (see RoomProgress)
+        self.progress = RoomProgress(self.map)
+        # Set once hard mode has made the objective impossible; like
+        # `completed` it ends the run. The tracker is created on the first
+        # hard-mode move.
+        self.stuck = False
+        self.connectivity: Optional[ConnectivityTracker] = None
+
+    @property
+    def remaining(self) -> RoomIndex:
+        """Goal rooms still to be reached."""
+        return self.progress.remaining
+
+    def _newLog(self) -> Optional[MoveLog]:
+        """Empty MoveLog for the current run, or None if the map cannot be logged."""
+        if self.map.size is None:
+            return None
+        return MoveLog.forSession(self)
+
+    def addObserver(self, observer: SessionObserver):
+        """Subscribe an observer to session events."""
+        self.observers.append(observer)
+
+    def removeObserver(self, observer: SessionObserver):
+        """Unsubscribe a previously added observer."""
+        self.observers.remove(observer)
+
+    def move(self, direction: str) -> bool:
+        """
+        Apply one move ('up', 'down', 'left' or 'right') and notify observers.
+        Returns True if the player actually changed tiles. No moves are
+        accepted once the run is completed or stuck.
+        """
+        # If the dungeon is already completed (or lost), do not allow more movement
+        if self.completed or self.stuck:
+            return False
+
+        # The first move of a run starts the clock for any observers
+        player = self.player
+        if not player.hasMoved:
+            player.hasMoved = True
+            for observer in self.observers:
+                observer.onStart(self)
+
+        old_location = player.location
+        # Record every valid attempt, blocked ones too, so replays match exactly
+        if self.log is not None and direction in DIRECTION_CODES:
+            self.log.record(direction)
+        moved = player.move(direction)
+        self.ticks += 1
+        # Fog of war: explore the cells that came into view (observers read this)
+        if moved and self.map.fogRadius is not None:
+            self.revealed = self.map.revealStep(old_location, player.location)
+        else:
+            self.revealed = []
+
+        # Instrumentation: counters always, a per-move event only if a sink listens
+        metrics.count("moves")
+        if not moved:
+            metrics.count("blocked_moves")
+        if metrics.sink.enabled:
+            metrics.event("move", direction=direction, old=old_location,
+                          new=player.location, tick=self.ticks)
+
+        for observer in self.observers:
+            observer.onMove(self, old_location, player.location)
+
+        # Reaching a goal room may meet the objective (O(1) set lookup)
+        if moved and player.location in self.remaining:
+            self._reachRoom(player.location)
+        # Hard mode wiped the tile left behind: see if a goal got cut off
+        if moved and player.hardMode and not self.completed and self.map.size is not None:
+            self._checkReachable(old_location)
+        return moved
+
+    def _checkReachable(self, removed: Tuple[int, int]):
+        """
+        Update hard-mode reachability after `removed` became Empty and end
+        the run if the objective can no longer be met. Most moves cost a
+        few cell checks; see ConnectivityTracker for the bound.
+        """
+        with metrics.timed("connectivity"):
+            if self.connectivity is None:
+                self.connectivity = ConnectivityTracker(self.map)
+            tracker = self.connectivity
+            cut_off = tracker.removeCell(*removed, self.player.location)
+            # Walking over a goal room out of turn wipes the room itself
+            if not cut_off and removed not in self.remaining:
+                return
+            if tracker.canFinish(self.remaining, self.map.objective):
+                return
+        self.stuck = True
+        for observer in self.observers:
+            observer.onStuck(self)
+
+    def _reachRoom(self, location: Tuple[int, int]):
+        """
+        Apply the map's objective (see RoomProgress.reach) to reaching the
+        goal room at `location` and notify observers.
+        """
+        if not self.progress.reach(location):
+            return
+        for observer in self.observers:
+            observer.onRoom(self, location)
+
+        if self.progress.done():
+            self.completed = True
+            for observer in self.observers:
+                observer.onComplete(self)
+
+    def nextRoom(self) -> Optional[Tuple[int, int]]:
+        """
+        The goal room to head for: the next checkpoint on "ordered" maps,
+        otherwise the remaining room nearest to the player.
+        """
+        if self.completed:
+            return None
+        if self.map.objective == "ordered":
+            return self.map.rooms[self.progress.nextCheckpoint]
+        return self.remaining.nearest(*self.player.location)
+
+    def roomsReached(self) -> int:
+        """Number of goal rooms that have counted towards the objective."""
+        return self.progress.nextCheckpoint
+
+    def run(self, directions: Iterable[str]) -> int:
+        """
+        Apply a sequence of moves, stopping early if the run completes.
+        Returns the number of moves that changed the player's tile.
+        """
+        moved = 0
+        for direction in directions:
+            if self.completed or self.stuck:
+                break
+            moved += self.move(direction)
+        return moved
+
+    def reset(self, new_map=None):
+        """
+        Start a new run: play `new_map` if one is given (e.g. a pre-generated
+        map from MapPrefetcher), otherwise regenerate the current map with its
+        current settings. The player is put back at home.
+        """
+        if new_map is not None:
+            self.map = new_map
+            self.player.map = new_map
+        else:
+            self.map.regenerate()
+        self.map.assignPlayer(self.player)
+        self.player.hasMoved = False
+        self.completed = False
+        self.ticks = 0
+        self.log = self._newLog()
+        self.progress = RoomProgress(self.map)
+        self.stuck = False
+        self.connectivity = None
+
+        for observer in self.observers:
+            observer.onReset(self)
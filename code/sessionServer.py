@@ -0,0 +1,562 @@
+"""
+Multiplayer races over local sockets.
+
+A SessionServer hosts one DungeonMap. Any number of players connect,
+start at home and race to meet the map's objective (any room, every
+room, or every room in order); the server is authoritative and
+applies moves once per tick. RemoteSession is the client side. It offers
+the GameSession interface, so the Tk GameWindow can be used as a client
+unchanged (see game.py --serve / --connect).
+
+Protocol (all integers little-endian):
+  client -> server  one byte per move attempt: 0 up, 1 down, 2 left, 3 right
+  server -> client  framed messages: type (u8), payload length (u32), payload
+    WELCOME  your id (u16), player count (u16) + (id u16, x u16, y u16) each,
+             finished count (u16) + ids (u16), then the map (mapStorage bytes)
+    TICK     tick (u32), moved count (u16) + (id u16, x u16, y u16) each,
+             left count (u16) + ids (u16), finished count (u16) + ids (u16)
+A TICK only lists players whose position changed (or who joined) since the
+previous tick, and one encoded TICK is shared by every connection.
+"""
+import argparse
+import asyncio
+import queue
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from mapClass import DungeonMap
+from mapStorage import dumpMap, loadsMap
+from moveLog import DIRECTION_CODES
+from playerClass import PlayerClass
+from sessionClass import RoomProgress
+from metrics import metrics
+
+# ─── Protocol ───────────────────────────────────────────────────────────────
+FRAME = struct.Struct("<BI")
+MSG_WELCOME = 1
+MSG_TICK = 2
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_POSITION = struct.Struct("<HHH")
+# (dx, dy) for each move byte
+_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+def _packIds(ids: List[int]) -> bytes:
+    return _U16.pack(len(ids)) + b"".join(_U16.pack(i) for i in ids)
+
+
+def _packPositions(positions: List[Tuple[int, int, int]]) -> bytes:
+    return _U16.pack(len(positions)) + b"".join(_POSITION.pack(*p) for p in positions)
+
+
+def _unpackIds(data: bytes, pos: int) -> Tuple[List[int], int]:
+    (count,) = _U16.unpack_from(data, pos)
+    pos += _U16.size
+    ids = [_U16.unpack_from(data, pos + 2 * i)[0] for i in range(count)]
+    return ids, pos + 2 * count
+
+
+def _unpackPositions(data: bytes, pos: int) -> Tuple[List[Tuple[int, int, int]], int]:
+    (count,) = _U16.unpack_from(data, pos)
+    pos += _U16.size
+    positions = [_POSITION.unpack_from(data, pos + _POSITION.size * i) for i in range(count)]
+    return positions, pos + _POSITION.size * count
+
+
+def _frame(kind: int, payload: bytes) -> bytes:
+    return FRAME.pack(kind, len(payload)) + payload
+
+
+def parseAddress(address: str) -> Tuple[str, Optional[int]]:
+    """
+    Split "host:port" into (host, port), or "unix:/path" into (path, None)
+    for a Unix domain socket.
+    """
+    if address.startswith("unix:"):
+        return address[5:], None
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+# ─── Server ─────────────────────────────────────────────────────────────────
+
+class _Client:
+    """Server-side state of one connected player."""
+
+    __slots__ = ("id", "writer", "location", "pending", "progress", "finished")
+
+    def __init__(self, client_id: int, writer, location: Tuple[int, int], dungeon_map: DungeonMap):
+        self.id = client_id
+        self.writer = writer
+        self.location = location
+        # Move codes received since the last tick, oldest first (at most
+        # SessionServer.MAX_QUEUED_MOVES; later bytes are ignored)
+        self.pending: Deque[int] = deque()
+        # Goal rooms reached so far, by the same rules as GameSession
+        self.progress = RoomProgress(dungeon_map)
+        self.finished = False
+
+
+class SessionServer:
+    """
+    Hosts one map for many players. Each connection only fills that
+    player's move queue; a single tick loop applies all queued moves,
+    then broadcasts one TICK with the position deltas. Applying moves only
+    visits the players who queued some, the TICK only holds the players
+    who moved, and it is encoded once for all clients. A slow client is
+    dropped instead of buffering without limit.
+    """
+
+    # Moves a player may queue between two ticks; moves sent once the queue
+    # is full are ignored, so the queued ones still play in order
+    MAX_QUEUED_MOVES = 8
+    # Bytes a client may leave unread before it is disconnected
+    MAX_BUFFERED = 1 << 20
+
+    def __init__(self, dungeon_map: DungeonMap, tick_rate: float = 20.0):
+        if dungeon_map.size > 0xFFFF:
+            raise ValueError("Maps larger than 65535 cells per side cannot be served.")
+        # The shared map; players only read it (no hard mode online)
+        self.map = dungeon_map
+        # Ticks per second
+        self.tick_rate = tick_rate
+        # Connected players by id
+        self.clients: Dict[int, _Client] = {}
+        # Ids in the order players met the objective
+        self.finishOrder: List[int] = []
+        # Number of ticks processed
+        self.ticks = 0
+
+        # Changes collected between ticks; _active holds the clients with
+        # queued moves, so a tick never walks idle players
+        self._active: Dict[int, _Client] = {}
+        self._joined: List[_Client] = []
+        self._left: List[int] = []
+        self._nextId = 1
+        self._server = None
+        self._tickTask = None
+        # Running connection handlers, awaited on stop()
+        self._handlers = set()
+
+    # ─── Connections ──────────────────────────────────────────────────────────
+
+    async def start(self, host: str = "127.0.0.1", port: Optional[int] = 0):
+        """
+        Start listening (TCP, or a Unix socket if port is None and host is a
+        path) and start the tick loop. Returns the bound address.
+        """
+        if port is None:
+            self._server = await asyncio.start_unix_server(self._handle, path=host)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        self._tickTask = asyncio.get_running_loop().create_task(self._tickLoop())
+        return self._server.sockets[0].getsockname()
+
+    async def stop(self):
+        """Stop the tick loop, close every connection and the listener."""
+        if self._tickTask is not None:
+            self._tickTask.cancel()
+        if self._server is not None:
+            self._server.close()
+        for client in list(self.clients.values()):
+            client.writer.close()
+        # Closed connections end their handlers; let them finish cleanly
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=1.0)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def _newId(self) -> int:
+        while self._nextId in self.clients or self._nextId == 0:
+            self._nextId = (self._nextId + 1) & 0xFFFF
+        client_id = self._nextId
+        self._nextId = (self._nextId + 1) & 0xFFFF
+        return client_id
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one connection: welcome it, then queue its moves until it leaves."""
+        self._handlers.add(asyncio.current_task())
+        client = _Client(self._newId(), writer, self.map.home, self.map)
+        self.clients[client.id] = client
+        self._joined.append(client)
+        writer.write(self._welcome(client))
+        metrics.count("server_joins")
+        try:
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+                if max(data) > 3:
+                    break  # not a move byte: protocol error, drop the client
+                free = self.MAX_QUEUED_MOVES - len(client.pending)
+                if not client.finished and free > 0:
+                    client.pending.extend(data[:free])
+                    self._active[client.id] = client
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(client)
+            self._handlers.discard(asyncio.current_task())
+
+    def _drop(self, client: _Client):
+        """Forget a client and announce its departure on the next tick."""
+        self._active.pop(client.id, None)
+        if self.clients.pop(client.id, None) is not None:
+            self._left.append(client.id)
+            client.writer.close()
+
+    def _welcome(self, client: _Client) -> bytes:
+        """WELCOME message: the client's id, every position and the map."""
+        positions = [(c.id, *c.location) for c in self.clients.values()]
+        payload = (
+            _U16.pack(client.id)
+            + _packPositions(positions)
+            + _packIds(self.finishOrder)
+            + dumpMap(self.map)
+        )
+        return _frame(MSG_WELCOME, payload)
+
+    # ─── Ticks ────────────────────────────────────────────────────────────────
+
+    async def _tickLoop(self):
+        """Run tick() at a fixed rate, catching up instead of drifting."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            self.tick()
+
+    def tick(self) -> Optional[bytes]:
+        """
+        Apply every queued move and broadcast the changes. A player
+        finishes once the map's objective is met (see RoomProgress). Returns
+        the TICK message that was sent, or None if nothing changed.
+        """
+        canMove = self.map.canMove
+        moved = []
+        finished = []
+        active, self._active = self._active, {}
+        for client in active.values():
+            x, y = client.location
+            start = (x, y)
+            while client.pending and not client.finished:
+                dx, dy = _STEPS[client.pending.popleft()]
+                if canMove((x + dx, y + dy)):
+                    x, y = x + dx, y + dy
+                    progress = client.progress
+                    if (x, y) in progress.remaining and progress.reach((x, y)) and progress.done():
+                        client.finished = True
+                        finished.append(client.id)
+            client.pending.clear()
+            if (x, y) != start:
+                client.location = (x, y)
+                moved.append(client)
+
+        self.ticks += 1
+        # Joined players are announced at their (home) position
+        moved_ids = {c.id for c in moved}
+        for client in self._joined:
+            if client.id in self.clients and client.id not in moved_ids:
+                moved.append(client)
+        if not (moved or self._left or finished):
+            self._joined.clear()
+            return None
+
+        self.finishOrder.extend(finished)
+        message = _frame(MSG_TICK, (
+            _U32.pack(self.ticks)
+            + _packPositions([(c.id, *c.location) for c in moved])
+            + _packIds(self._left)
+            + _packIds(finished)
+        ))
+        self._joined.clear()
+        self._left.clear()
+        self._broadcast(message)
+        return message
+
+    def _broadcast(self, message: bytes):
+        """Queue one shared message on every connection; drop clients that fall behind."""
+        for client in list(self.clients.values()):
+            transport = client.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > self.MAX_BUFFERED:
+                self._drop(client)
+                continue
+            client.writer.write(message)
+
+
+async def serve(dungeon_map: DungeonMap, address: str = "127.0.0.1:8765", tick_rate: float = 20.0):
+    """Host `dungeon_map` at `address` until cancelled (e.g. Ctrl+C)."""
+    server = SessionServer(dungeon_map, tick_rate)
+    host, port = parseAddress(address)
+    bound = await server.start(host, port)
+    print(f"Serving a {dungeon_map.size}x{dungeon_map.size} map (seed {dungeon_map.seed}) on {bound}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+# ─── Client ─────────────────────────────────────────────────────────────────
+
+def _recvExact(sock: socket.socket, count: int) -> Optional[bytes]:
+    """Read exactly `count` bytes, or None if the connection closed."""
+    chunks = bytearray()
+    while len(chunks) < count:
+        chunk = sock.recv(count - len(chunks))
+        if not chunk:
+            return None
+        chunks += chunk
+    return bytes(chunks)
+
+
+def _recvFrame(sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+    header = _recvExact(sock, FRAME.size)
+    if header is None:
+        return None
+    kind, length = FRAME.unpack(header)
+    payload = _recvExact(sock, length)
+    if payload is None:
+        return None
+    return kind, payload
+
+
+class RemoteSession:
+    """
+    Client for a SessionServer with the same interface as GameSession
+    (map, player, completed, observers, move, reset), so GameWindow can
+    drive it. Moves are sent straight away; positions come back in the
+    server's TICK messages. A background thread reads the socket, and
+    pump() applies what arrived and notifies observers. Call pump() from
+    the UI thread (game.py polls it with after()).
+    """
+
+    # The server owns the map: no new maps or settings changes from here
+    ownsMap = False
+
+    def __init__(self, address: str = "127.0.0.1:8765"):
+        host, port = parseAddress(address)
+        if port is None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(host)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        frame = _recvFrame(self.sock)
+        if frame is None or frame[0] != MSG_WELCOME:
+            raise ConnectionError("Server did not send a welcome message.")
+        payload = frame[1]
+        (self.id,) = _U16.unpack_from(payload, 0)
+        positions, pos = _unpackPositions(payload, _U16.size)
+        finished, pos = _unpackIds(payload, pos)
+
+        # The served map, and this client's player on it
+        self.map = loadsMap(payload[pos:])
+        self.player = PlayerClass(self.map)
+        self.map.others = {}
+        for client_id, x, y in positions:
+            if client_id == self.id:
+                self.player.location = (x, y)
+            else:
+                self.map.others[client_id] = (x, y)
+        # Ids of finished players, in finishing order
+        self.finishOrder = list(finished)
+
+        # GameSession-compatible state; races have no hard mode, so never stuck
+        self.completed = False
+        self.stuck = False
+        self.ticks = 0
+        self.observers = []
+        self.revealed = []
+        # Finishing position (1 = winner) once this player met the objective
+        self.rank = None
+
+        # Messages received by the reader thread, applied by pump()
+        self._inbox = queue.Queue()
+        self._reader = threading.Thread(target=self._readLoop, daemon=True)
+        self._reader.start()
+
+    def _readLoop(self):
+        """Background thread: queue every framed message until the socket closes."""
+        try:
+            while True:
+                frame = _recvFrame(self.sock)
+                if frame is None:
+                    break
+                self._inbox.put(frame)
+        except OSError:
+            pass
+        self._inbox.put(None)
+
+    def addObserver(self, observer):
+        self.observers.append(observer)
+
+    def removeObserver(self, observer):
+        self.observers.remove(observer)
+
+    def move(self, direction: str) -> bool:
+        """
+        Send a move to the server. Returns True if it was sent; the player
+        only moves once the server's next TICK arrives.
+        """
+        code = DIRECTION_CODES.get(direction)
+        if self.completed or code is None:
+            return False
+        if not self.player.hasMoved:
+            self.player.hasMoved = True
+            for observer in self.observers:
+                observer.onStart(self)
+        try:
+            self.sock.sendall(bytes((code,)))
+        except OSError:
+            return False
+        return True
+
+    def pump(self) -> bool:
+        """
+        Apply all messages received so far and notify observers.
+        Returns False once the connection has closed.
+        """
+        while True:
+            try:
+                frame = self._inbox.get_nowait()
+            except queue.Empty:
+                return True
+            if frame is None:
+                return False
+            kind, payload = frame
+            if kind == MSG_TICK:
+                self._applyTick(payload)
+
+    def _applyTick(self, payload: bytes):
+        (self.ticks,) = _U32.unpack_from(payload, 0)
+        moved, pos = _unpackPositions(payload, _U32.size)
+        left, pos = _unpackIds(payload, pos)
+        finished, pos = _unpackIds(payload, pos)
+        others = self.map.others
+
+        for client_id, x, y in moved:
+            if client_id == self.id:
+                old = self.player.location
+                self.player.location = (x, y)
+                # Fog of war (if enabled locally) follows this player only
+                if self.map.fogRadius is not None:
+                    self.revealed = self.map.revealStep(old, (x, y))
+            else:
+                old = others.get(client_id, (x, y))
+                others[client_id] = (x, y)
+            for observer in self.observers:
+                observer.onMove(self, old, (x, y))
+            self.revealed = []
+
+        for client_id in left:
+            old = others.pop(client_id, None)
+            if old is not None:
+                for observer in self.observers:
+                    observer.onMove(self, old, old)
+
+        for client_id in finished:
+            self.finishOrder.append(client_id)
+            if client_id == self.id:
+                self.rank = len(self.finishOrder)
+                self.completed = True
+                for observer in self.observers:
+                    observer.onComplete(self)
+
+    def reset(self, new_map=None):
+        """The server owns the map, so a client cannot start a new one."""
+
+    def roomsReached(self) -> int:
+        return 1 if self.completed else 0
+
+    def close(self):
+        """Disconnect from the server."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# ─── Load Test ──────────────────────────────────────────────────────────────
+
+async def loadTest(clients: int = 300, seconds: float = 5.0, size: int = 101,
+                   moves_per_second: float = 10.0, tick_rate: float = 20.0) -> Dict[str, float]:
+    """
+    Run a server and `clients` scripted asyncio clients in this process,
+    each sending random moves at `moves_per_second`. Returns the tick
+    count, the average and worst tick time and bytes received per client.
+    """
+    server = SessionServer(DungeonMap(size, 1.0, 0.1, seed=1), tick_rate)
+    host, port = await server.start("127.0.0.1", 0)
+    tick_times = []
+    original_tick = server.tick
+
+    def timedTick():
+        start = time.perf_counter()
+        result = original_tick()
+        tick_times.append(time.perf_counter() - start)
+        return result
+    server.tick = timedTick
+
+    received = [0] * clients
+
+    async def bot(index: int):
+        reader, writer = await asyncio.open_connection(host, port)
+        rng = random.Random(index)
+        loop = asyncio.get_running_loop()
+        end = loop.time() + seconds
+
+        async def drain():
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                received[index] += len(data)
+
+        drainer = loop.create_task(drain())
+        while loop.time() < end:
+            writer.write(bytes((rng.randrange(4),)))
+            await asyncio.sleep(1.0 / moves_per_second)
+        writer.close()
+        drainer.cancel()
+
+    await asyncio.gather(*(bot(i) for i in range(clients)))
+    await server.stop()
+    return {
+        "ticks": len(tick_times),
+        "avg_tick_ms": 1000 * sum(tick_times) / max(1, len(tick_times)),
+        "max_tick_ms": 1000 * max(tick_times, default=0.0),
+        "bytes_per_client": sum(received) / clients,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Host a multiplayer dungeon race.")
+    parser.add_argument("--address", default="127.0.0.1:8765", help="host:port or unix:/path")
+    parser.add_argument("--size", type=int, default=31)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--tick-rate", type=float, default=20.0)
+    parser.add_argument("--load-test", type=int, metavar="CLIENTS",
+                        help="run a local load test with this many clients instead")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        print(asyncio.run(loadTest(args.load_test, tick_rate=args.tick_rate)))
+        return
+    dungeon_map = DungeonMap(args.size, 1.0, 0.1, seed=args.seed)
+    try:
+        asyncio.run(serve(dungeon_map, args.address, args.tick_rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
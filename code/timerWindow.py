@@ -1,71 +1,132 @@
+import time
 import tkinter as tk
+from typing import Callable, List
 
 
 class TimerApp:
     """
-    A simple timer display using Tkinter. Tracks elapsed time in seconds,
-    converting to MM:SS format, and updates every second when running.
+    A simple timer display using Tkinter. Elapsed time is measured with a
+    monotonic clock rather than by counting ticks, so the display never
+    drifts and shows tenths of a second (MM:SS.t).
+    The timer owns at most one pending `after` callback: it only exists
+    while the timer is running and is cancelled on stop/pause/reset, so an
+    idle timer costs no CPU at all.
     """
 
-    def __init__(self, root):
+    # Milliseconds between display refreshes while running
+    REFRESH_MS = 100
+
+    def __init__(self, root, clock: Callable[[], float] = time.monotonic):
         # Reference to the parent Tk or Toplevel window for the timer
         self.root = root
         self.root.title("Game Timer")
+        # Clock returning seconds; only differences between readings are used
+        self.clock = clock
 
-        # Internal counter of elapsed seconds
-        self.seconds = 0
+        # Seconds accumulated over previous running periods (before a pause)
+        self._accumulated = 0.0
+        # Clock reading when the current running period started
+        self._startedAt = 0.0
+        # Id of the single pending refresh callback, or None when idle
+        self._afterId = None
+        # Elapsed times recorded by split(), in seconds
+        self.splits: List[float] = []
         # Flag indicating whether the timer is actively counting
         self.timer_running = False
 
-        # Label widget that displays the time in "MM:SS" format
+        # Label widget that displays the time in "MM:SS.t" format
         self.timer_label = tk.Label(
             root,
-            text="00:00",
+            text=self.format(0.0),
             font=("Helvetica", 48)
         )
         self.timer_label.pack(pady=20)
 
-        # Immediately update the timer label (shows "00:00" initially)
-        self.update_timer()
+        # Label listing the split times (empty until split() is called)
+        self.splits_label = tk.Label(root, text="", font="TkFixedFont")
+        self.splits_label.pack()
+
+    @staticmethod
+    def format(seconds: float) -> str:
+        """Format a number of seconds as MM:SS.t."""
+        tenths = int(seconds * 10)
+        minutes, tenths = divmod(tenths, 600)
+        return f"{minutes:02}:{tenths // 10:02}.{tenths % 10}"
+
+    def elapsed(self) -> float:
+        """Seconds counted so far, including the current running period."""
+        if self.timer_running:
+            return self._accumulated + self.clock() - self._startedAt
+        return self._accumulated
+
+    @property
+    def seconds(self) -> int:
+        """Whole seconds counted so far (kept for older callers)."""
+        return int(self.elapsed())
 
     def start_timer(self):
         """
-        Begin counting time if the timer is not already running.
-        Sets the flag and triggers update_timer() to start the loop.
+        Begin (or resume) counting time if the timer is not already running,
+        and schedule the display refresh.
         """
         if not self.timer_running:
+            self._startedAt = self.clock()
             self.timer_running = True
-            self.update_timer()
+            self._schedule()
 
     def stop_timer(self):
         """
-        Pause the timer by clearing the running flag.
-        The next scheduled update_timer call will see this flag is False
-        and will not increment further.
+        Stop counting and freeze the display at the exact elapsed time.
+        The pending refresh is cancelled, so nothing runs while stopped.
         """
+        if self.timer_running:
+            self._accumulated += self.clock() - self._startedAt
+            self.timer_running = False
+        self._cancel()
+        self.update_timer()
+
+    # Pausing is stopping; resuming continues from the accumulated time
+    pause = stop_timer
+    resume = start_timer
+
+    def reset(self):
+        """Stop the timer, clear the elapsed time and splits, and show 00:00.0."""
+        self._cancel()
         self.timer_running = False
+        self._accumulated = 0.0
+        self.splits.clear()
+        self.splits_label.config(text="")
+        self.update_timer()
+
+    def split(self) -> float:
+        """Record and return the current elapsed time as a split."""
+        value = self.elapsed()
+        self.splits.append(value)
+        self.splits_label.config(
+            text="\n".join(f"{i}. {self.format(s)}" for i, s in enumerate(self.splits, 1))
+        )
+        return value
 
     def update_timer(self):
-        """
-        If the timer is running, increment the seconds counter by one,
-        compute minutes/seconds, format as MM:SS, and update the label.
-        Then schedule another call to update_timer() after 1000ms (1 second).
-        If the timer is not running, simply ensure the current display remains.
-        """
+        """Show the current elapsed time on the label."""
+        self.timer_label.config(text=self.format(self.elapsed()))
+
+    # ─── Refresh Loop ────────────────────────────────────────────────────────
+
+    def _schedule(self):
+        """Queue the next refresh; there is never more than one pending."""
+        self._cancel()
+        self._afterId = self.root.after(self.REFRESH_MS, self._tick)
+
+    def _cancel(self):
+        """Cancel the pending refresh, if any."""
+        if self._afterId is not None:
+            self.root.after_cancel(self._afterId)
+            self._afterId = None
+
+    def _tick(self):
+        """Refresh callback: redraw and reschedule while still running."""
+        self._afterId = None
+        self.update_timer()
         if self.timer_running:
-            # Increment the internal seconds counter
-            self.seconds += 1
-
-            # Convert total seconds into minutes and seconds
-            minutes = self.seconds // 60
-            seconds = self.seconds % 60
-            # Format as two-digit MM:SS
-            time_str = f"{minutes:02}:{seconds:02}"
-            # Update the label to show the new time
-            self.timer_label.config(text=time_str)
-
-            # Schedule this method to be called again after 1 second
-            self.root.after(1000, self.update_timer)
-        else:
-            # If timer is not running, still schedule update to keep display synced
-            self.root.after(1000, self.update_timer)
+            self._schedule()
@@ -1,3 +1,6 @@
+import argparse
+import asyncio
+import os
 import tkinter as tk
 import sys
 # Ensure the application folder is in the Python path for imports
@@ -9,12 +12,85 @@ from playerClass import PlayerClass as Player # type: ignore
 from timerWindow import TimerApp # type: ignore
 from gameSettingsWindow import SettingsApp # type: ignore
 from gameWindowClass import GameWindow  # type: ignore
+from sessionClass import GameSession  # type: ignore
+from mapPrefetcher import MapPrefetcher  # type: ignore
+from dungeonStack import DungeonStack  # type: ignore
+from chunkWorld import ChunkWorld  # type: ignore
+from metrics import JsonLinesSink, setSink  # type: ignore
+from sessionServer import RemoteSession, serve  # type: ignore
+from leaderboard import Leaderboard  # type: ignore
 
 
-def main():
+def main(argv=None):
+    # ─── Command Line ────────────────────────────────────────────────────────
+    # No options: local single-player game.
+    # --serve ADDRESS:   host a multiplayer race (no window) at host:port or unix:/path
+    # --connect ADDRESS: join a race hosted with --serve
+    # --descend:         descending levels; each goal leads down to a new map
+    # --endless:         endless chunked world with no goal
+    parser = argparse.ArgumentParser(description="Dungeon game")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", metavar="ADDRESS", help="host a multiplayer race")
+    mode.add_argument("--connect", metavar="ADDRESS", help="join a multiplayer race")
+    mode.add_argument("--descend", action="store_true",
+                      help="descending levels: reaching the goal loads the next level")
+    mode.add_argument("--endless", action="store_true",
+                      help="endless world generated chunk by chunk around the player")
+    args = parser.parse_args(argv)
+
     # ─── Default Settings ────────────────────────────────────────────────────
     # [map_size, room_chance, extra_connection_chance]
     default_settings = [31, 1.0, 0.1]
+    # Maze carving algorithm: "dfs", "kruskal", "eller", "binary_tree" or "sidewinder"
+    default_algorithm = "dfs"
+    # Goal rooms and objective: "any" (reach one), "all" (visit every room)
+    # or "ordered" (visit them as checkpoints in order)
+    default_room_count = 1
+    default_objective = "any"
+    # Map renderer: "label" (ASCII text) or "canvas" (tile canvas with a scrolling viewport)
+    default_renderer = "label"
+    # Number of upcoming maps generated in the background (0 disables prefetching;
+    # never used in multiplayer, where the server owns the map)
+    prefetch_depth = 0 if args.connect or args.endless else 2
+    # Descending mode: levels kept as live maps (older ones are packed or dropped)
+    level_budget = 3
+    # Ticks per second when hosting a multiplayer race
+    server_tick_rate = 20.0
+    # JSON-lines file that receives move/render/settings events (None = off)
+    metrics_log = None
+    # SQLite file that completed runs are saved to (None = no leaderboard)
+    leaderboard_db = os.path.join(os.path.expanduser("~"), ".dungeon_leaderboard.sqlite3")
+
+    # ─── Metrics ─────────────────────────────────────────────────────────────
+    # Counters are always kept; events are only written when a file is set.
+    if metrics_log is not None:
+        setSink(JsonLinesSink(metrics_log))
+
+    # ─── Multiplayer Server ──────────────────────────────────────────────────
+    # Hosting runs headless: the server owns one map and many remote players.
+    if args.serve:
+        hosted_map = Map(
+            size=default_settings[0],
+            room_chance=default_settings[1],
+            extra_connection_chance=default_settings[2],
+            algorithm=default_algorithm
+        )
+        try:
+            asyncio.run(serve(hosted_map, args.serve, server_tick_rate))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # ─── Start Map Prefetcher ────────────────────────────────────────────────
+    # Worker process that pre-generates the next maps so "New Map" is instant.
+    # Started before any Tk window exists so the worker does not inherit one.
+    # In descending mode the level stack queues maps itself and only borrows
+    # the worker.
+    prefetcher = None
+    if prefetch_depth > 0:
+        prefetcher = MapPrefetcher(depth=0 if args.descend else prefetch_depth)
+        prefetcher.configure(*default_settings, algorithm=default_algorithm,
+                             room_count=default_room_count, objective=default_objective)
 
     # ─── Initialize Root Window ──────────────────────────────────────────────
     # This is the main game window.
@@ -24,31 +100,90 @@ def main():
     # We use a separate Toplevel window for displaying the timer.
     timer_window = tk.Toplevel(root)
 
-    # ─── Create Dungeon Map ──────────────────────────────────────────────────
-    # Instantiate the map using default settings:
-    #   size = 31, room_chance = 1.0, extra_connection_chance = 0.1
-    dungeon_map = Map(
-        size=default_settings[0],
-        room_chance=default_settings[1],
-        extra_connection_chance=default_settings[2]
-    )
+    stack = None
+    if args.connect:
+        # ─── Join Multiplayer Race ───────────────────────────────────────────
+        # The remote session downloads the server's map and acts like a
+        # GameSession for the window.
+        session = RemoteSession(args.connect)
+    else:
+        # ─── Create Dungeon Map ──────────────────────────────────────────────
+        # Instantiate the map using default settings:
+        #   size = 31, room_chance = 1.0, extra_connection_chance = 0.1
+        # Descending mode plays level 0 of a stack with the same settings.
+        # Endless mode plays a chunked world that never ends.
+        if args.endless:
+            dungeon_map = ChunkWorld(
+                room_chance=default_settings[1],
+                extra_connection_chance=default_settings[2],
+                algorithm=default_algorithm
+            )
+        elif args.descend:
+            stack = DungeonStack(
+                (*default_settings, default_algorithm, False, default_room_count, default_objective),
+                budget=level_budget,
+                executor=prefetcher.executor if prefetcher else None
+            )
+            dungeon_map = stack.current()
+        else:
+            dungeon_map = Map(
+                size=default_settings[0],
+                room_chance=default_settings[1],
+                extra_connection_chance=default_settings[2],
+                algorithm=default_algorithm,
+                room_count=default_room_count,
+                objective=default_objective
+            )
 
-    # ─── Create Player ────────────────────────────────────────────────────────
-    # The PlayerClass constructor will assign the player to the map's home tile.
-    player = Player(dungeon_map)
+        # ─── Create Player ───────────────────────────────────────────────────
+        # The PlayerClass constructor will assign the player to the map's home tile.
+        player = Player(dungeon_map)
+
+        # ─── Create Game Session ─────────────────────────────────────────────
+        # The headless engine that applies moves and tracks completion.
+        session = GameSession(dungeon_map, player)
 
     # ─── Create Timer App ─────────────────────────────────────────────────────
     # TimerApp manages game timing; it takes the timer_window as its parent.
     timer_app = TimerApp(timer_window)
 
+    # ─── Open Leaderboard ────────────────────────────────────────────────────
+    # Completed local runs are saved in the background; races and endless
+    # worlds have nothing comparable to record.
+    leaderboard = None
+    if leaderboard_db is not None and not (args.connect or args.endless or args.descend):
+        leaderboard = Leaderboard(leaderboard_db)
+
     # ─── Create Game Window ──────────────────────────────────────────────────
-    # Combine the dungeon_map, root window, and timer_app into our main game UI.
-    game_window = GameWindow(dungeon_map, root, timer_app)
+    # Combine the session, root window, and timer_app into our main game UI.
+    game_window = GameWindow(session, root, timer_app, renderer=default_renderer,
+                             prefetcher=prefetcher, stack=stack, leaderboard=leaderboard)
+
+    # ─── Poll Multiplayer Updates ────────────────────────────────────────────
+    # Apply the server's ticks on the Tk thread, once per frame.
+    if args.connect:
+        def poll():
+            if session.pump():
+                root.after(GameWindow.FRAME_MS, poll)
+            else:
+                game_window.tileInfo.config(text="Disconnected from server.")
+        poll()
 
     # ─── Start Tkinter Main Loop ──────────────────────────────────────────────
     # This call blocks and keeps the GUI responsive until the user closes the window.
     root.mainloop()
 
+    # Make sure the prefetch worker is gone even if the loop ended another way
+    if prefetcher is not None:
+        prefetcher.shutdown()
+    # Write out runs still queued for the leaderboard
+    if leaderboard is not None:
+        leaderboard.close()
+    # Flush the metrics file, if any
+    setSink(None).close()
+    if args.connect:
+        session.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules live in code/ and import each other by bare name, as in game.py
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
@@ -0,0 +1,56 @@
+import random
+from botHarness import parSteps
+from distanceField import DistanceField
+from gridClass import PackedGrid
+from mapStorage import loadMap
+from mapStreamer import streamMap
+from playerClass import PlayerClass
+from sessionClass import GameSession
+
+
+def _lazyMap(tmp_path, seed=3):
+    path = str(tmp_path / "streamed.map")
+    streamMap(path, 41, seed=seed)
+    return loadMap(path, lazy=True)
+
+
+def test_hard_mode_on_packed_grid(tmp_path):
+    dungeon_map = _lazyMap(tmp_path)
+    assert isinstance(dungeon_map.grid, PackedGrid)
+    player = PlayerClass(dungeon_map)
+    player.hardMode = True
+    session = GameSession(dungeon_map, player)
+
+    rng = random.Random(0)
+    moved = 0
+    for _ in range(500):
+        if session.completed or session.stuck:
+            break
+        old_location = player.location
+        if session.move(rng.choice(["up", "down", "left", "right"])):
+            moved += 1
+            # The tile left behind is wiped in the packed buffer itself
+            assert dungeon_map.grid.code(*old_location) == 0
+    assert moved > 0
+    assert session.connectivity is not None
+    # The tracker's own copy of the tiles follows the wipes
+    tracker = session.connectivity
+    assert tracker.isReachable(*player.location)
+
+
+def test_distance_field_on_packed_grid(tmp_path):
+    dungeon_map = _lazyMap(tmp_path)
+    field = dungeon_map.distanceField()
+    assert field.pathLength() > 0
+    assert parSteps(dungeon_map) == field.pathLength()
+
+    # Repairs after hard-mode wipes match a field built from scratch
+    player = PlayerClass(dungeon_map)
+    player.hardMode = True
+    session = GameSession(dungeon_map, player)
+    rng = random.Random(1)
+    for _ in range(200):
+        if session.completed or session.stuck:
+            break
+        session.move(rng.choice(["up", "down", "left", "right"]))
+    assert list(field.dist) == list(DistanceField(dungeon_map).dist)
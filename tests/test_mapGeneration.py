@@ -0,0 +1,42 @@
+from collections import deque
+import pytest
+from gridClass import flatCells
+from mapClass import DungeonMap
+from mapStorage import loadMap
+from mapStreamer import streamMap
+from mazeAlgorithms import ALGORITHMS
+from roomClass import EMPTY
+
+
+def _unreachable(dungeon_map):
+    """Open cells that cannot be walked to from home."""
+    n = dungeon_map.size
+    cells = flatCells(dungeon_map.grid)
+    seen = {dungeon_map.home}
+    queue = deque(seen)
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (0 <= nx < n and 0 <= ny < n and (nx, ny) not in seen
+                    and cells[ny * n + nx] != EMPTY):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return [(k % n, k // n) for k in range(n * n)
+            if cells[k] != EMPTY and (k % n, k // n) not in seen]
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_every_open_cell_is_reachable(algorithm):
+    for seed in range(10):
+        for size in (15, 31):
+            dungeon_map = DungeonMap(size, room_chance=0.4, extra_connection_chance=0.3,
+                                     seed=seed, algorithm=algorithm)
+            assert _unreachable(dungeon_map) == [], (algorithm, size, seed)
+
+
+@pytest.mark.parametrize("size", [15, 31, 41])
+def test_every_streamed_cell_is_reachable(tmp_path, size):
+    path = str(tmp_path / "streamed.map")
+    for seed in range(40):
+        streamMap(path, size, extra_connection_chance=0.3, seed=seed)
+        assert _unreachable(loadMap(path)) == [], (size, seed)
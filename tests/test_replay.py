@@ -0,0 +1,66 @@
+import random
+import pytest
+from chunkWorld import ChunkWorld
+from mapClass import DungeonMap
+from moveLog import HEADER, HEADER_V2, MAGIC, MoveLog
+from playerClass import PlayerClass
+from replayClass import ReplayEngine
+from sessionClass import GameSession
+
+
+def test_replay_even_size_run():
+    dungeon_map = DungeonMap(21, seed=5)
+    # As the settings window does: change the size, then regenerate
+    dungeon_map.size = 30
+    dungeon_map.regenerate(seed=11)
+    assert dungeon_map.size == 29
+
+    player = PlayerClass(dungeon_map)
+    player.hardMode = True
+    session = GameSession(dungeon_map, player)
+    rng = random.Random(2)
+    for _ in range(300):
+        if session.completed or session.stuck:
+            break
+        session.move(rng.choice(["up", "down", "left", "right"]))
+
+    log = MoveLog.fromBytes(session.log.toBytes())
+    replay = ReplayEngine(log)
+    replayed = replay.seek(len(log))
+    assert replayed.size == dungeon_map.size
+    assert replayed.grid.cells == dungeon_map.grid.cells
+    assert replay.player.location == player.location
+
+
+def test_replay_keeps_objective():
+    dungeon_map = DungeonMap(31, seed=4, room_count=3, objective="all")
+    session = GameSession(dungeon_map)
+    for direction in ["up", "left", "down", "right"] * 5:
+        session.move(direction)
+
+    log = MoveLog.fromBytes(session.log.toBytes())
+    assert log.objective == "all"
+    replayed = ReplayEngine(log).seek(len(log))
+    assert replayed.objective == "all"
+    assert replayed.rooms == dungeon_map.rooms
+
+
+def test_version_2_log_loads_as_any():
+    log = MoveLog(21, 0.4, 0.05, 9, room_count=2)
+    log.record("up")
+    data = log.toBytes()
+    # Version 2 header: the same fields without the objective byte
+    old = HEADER_V2.pack(MAGIC, 2, 0, 0, 2, 21, 1, 0.4, 0.05, 9) + data[HEADER.size:]
+    loaded = MoveLog.fromBytes(old)
+    assert (loaded.objective, loaded.room_count, loaded.seed) == ("any", 2, 9)
+    assert list(loaded.directions()) == ["up"]
+
+
+def test_chunk_world_session_is_not_logged():
+    session = GameSession(ChunkWorld(seed=1))
+    assert session.log is None
+    session.run(["right", "down", "left", "up"])
+    session.reset()
+    assert session.log is None
+    with pytest.raises(ValueError):
+        MoveLog.forSession(session)
@@ -0,0 +1,75 @@
+import asyncio
+from distanceField import DistanceField
+from mapClass import DungeonMap
+from moveLog import DIRECTION_CODES
+from sessionServer import SessionServer, _Client
+
+
+class _Transport:
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+class _Writer:
+    """Stands in for an asyncio StreamWriter; keeps what was written."""
+
+    def __init__(self):
+        self.transport = _Transport()
+        self.sent = []
+
+    def write(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        pass
+
+
+def _join(server):
+    client = _Client(server._newId(), _Writer(), server.map.home, server.map)
+    server.clients[client.id] = client
+    return client
+
+
+def _walkTo(server, client, target):
+    """Queue and tick the shortest route from the client's location to `target`."""
+    field = DistanceField(server.map, [target])
+    while client.location != target and not client.finished:
+        direction = field.nextStep(*client.location)
+        client.pending.append(DIRECTION_CODES[direction])
+        server._active[client.id] = client
+        server.tick()
+
+
+def test_all_rooms_race_needs_every_room():
+    server = SessionServer(DungeonMap(31, seed=8, room_count=3, objective="all"))
+    client = _join(server)
+    rooms = list(server.map.rooms)
+    assert len(rooms) == 3
+
+    _walkTo(server, client, rooms[0])
+    assert not client.finished and server.finishOrder == []
+    for room in rooms[1:]:
+        _walkTo(server, client, room)
+    assert client.finished
+    assert server.finishOrder == [client.id]
+
+
+def test_full_queue_ignores_new_moves():
+    server = SessionServer(DungeonMap(21, seed=2))
+
+    async def send(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        task = asyncio.get_running_loop().create_task(server._handle(reader, _Writer()))
+        await asyncio.sleep(0)
+        client = next(iter(server.clients.values()))
+        queued = list(client.pending)
+        task.cancel()
+        return queued
+
+    moves = bytes([0, 1, 2, 3] * 3)
+    queued = asyncio.run(send(moves))
+    assert queued == list(moves[:SessionServer.MAX_QUEUED_MOVES])